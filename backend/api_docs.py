@@ -1,8 +1,11 @@
 from flask_restx import Api, Resource, fields, Namespace
-from flask import request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from services.auth_service import AuthService
+from services.pagination import InvalidPageRequest, parse_offset_args, parse_page_args
+from services.projection import InvalidFieldsRequest, parse_fields
 from models.user import User
+from routes.responses import retry_after_headers
 
 # Create API documentation
 api = Api(
@@ -24,6 +27,8 @@ api = Api(
 # Create namespaces
 auth_ns = Namespace('auth', description='Authentication operations')
 exercise_ns = Namespace('exercises', description='Exercise operations')
+plan_ns = Namespace('plans', description='Workout plan operations')
+admin_ns = Namespace('admin', description='Administrative operations (X-Admin-Token header)')
 
 # Define models for Swagger documentation
 user_registration_model = api.model('UserRegistration', {
@@ -64,6 +69,12 @@ error_model = api.model('Error', {
     'details': fields.Raw(description='Error details (optional)')
 })
 
+retry_error_model = api.model('RetryError', {
+    'error': fields.String(description='Error message'),
+    'message': fields.String(description='Explanation'),
+    'retry_after': fields.Integer(description='Seconds to wait before retrying (also sent as a Retry-After header)')
+})
+
 success_model = api.model('Success', {
     'message': fields.String(description='Success message'),
     'user': fields.Nested(user_response_model, description='User information')
@@ -74,11 +85,24 @@ token_refresh_model = api.model('TokenRefresh', {
     'access_token': fields.String(description='New JWT access token')
 })
 
+logout_request_model = api.model('LogoutRequest', {
+    'refresh_token': fields.String(description='Refresh token to revoke along with the presented token (optional)')
+})
+
+logout_response_model = api.model('LogoutResponse', {
+    'message': fields.String(description='Success message'),
+    'revoked': fields.Integer(description='Number of tokens revoked')
+})
+
 health_model = api.model('Health', {
     'status': fields.String(description='API status'),
     'message': fields.String(description='Status message')
 })
 
+metrics_model = api.model('Metrics', {
+    'metrics': fields.Raw(description='Metric name -> current value (counters, gauges, histograms with buckets)')
+})
+
 # Exercise models
 exercise_model = api.model('Exercise', {
     'id': fields.String(description='Exercise ID'),
@@ -94,7 +118,9 @@ exercises_grouped_model = api.model('ExercisesGrouped', {
     'message': fields.String(description='Response message'),
     'exercises': fields.Raw(description='Exercises grouped by muscle groups'),
     'total_muscle_groups': fields.Integer(description='Total number of muscle groups'),
-    'total_exercises': fields.Integer(description='Total number of exercises')
+    'total_exercises': fields.Integer(description='Total number of exercises'),
+    'limit': fields.Integer(description='Page size (paginated requests only)'),
+    'next_cursor': fields.String(description='Cursor for the next page, null on the last page (paginated requests only)')
 })
 
 muscle_groups_model = api.model('MuscleGroups', {
@@ -107,12 +133,126 @@ exercises_by_muscle_model = api.model('ExercisesByMuscle', {
     'message': fields.String(description='Response message'),
     'muscle_group': fields.String(description='Requested muscle group'),
     'exercises': fields.List(fields.Nested(exercise_model), description='Exercises for the muscle group'),
-    'count': fields.Integer(description='Number of exercises')
+    'count': fields.Integer(description='Number of exercises'),
+    'limit': fields.Integer(description='Page size (paginated requests only)'),
+    'next_cursor': fields.String(description='Cursor for the next page, null on the last page (paginated requests only)')
+})
+
+exercise_search_model = api.model('ExerciseSearch', {
+    'message': fields.String(description='Response message'),
+    'query': fields.String(description='Search query'),
+    'exercises': fields.List(fields.Nested(exercise_model), description='Matching exercises, best match first'),
+    'count': fields.Integer(description='Number of exercises in this page'),
+    'total': fields.Integer(description='Total number of matching exercises'),
+    'limit': fields.Integer(description='Page size'),
+    'offset': fields.Integer(description='Number of results skipped'),
+    'next_offset': fields.Integer(description='Offset of the next page, null on the last page')
+})
+
+exercise_filter_model = api.model('ExerciseFilter', {
+    'message': fields.String(description='Response message'),
+    'filters': fields.Raw(description='Normalised filters that were applied (primary, secondary, equipment, mode)'),
+    'exercises': fields.List(fields.Nested(exercise_model), description='Matching exercises, ordered by id'),
+    'count': fields.Integer(description='Number of exercises in this page'),
+    'total': fields.Integer(description='Total number of matching exercises'),
+    'limit': fields.Integer(description='Page size (paginated requests only)'),
+    'next_cursor': fields.String(description='Cursor for the next page, null on the last page (paginated requests only)')
+})
+
+exercise_facets_model = api.model('ExerciseFacets', {
+    'message': fields.String(description='Response message'),
+    'total': fields.Integer(description='Number of exercises counted'),
+    'facets': fields.Raw(description='primary_muscles / secondary_muscles / equipment -> value -> count'),
+    'filters': fields.Raw(description='Normalised filters that were applied (only when filtering)')
+})
+
+similar_exercise_model = api.inherit('SimilarExercise', exercise_model, {
+    'similarity': fields.Float(description='Cosine similarity to the requested exercise (0-1)')
+})
+
+similar_exercises_model = api.model('SimilarExercises', {
+    'message': fields.String(description='Response message'),
+    'exercise_id': fields.String(description='Exercise the results are similar to'),
+    'exercises': fields.List(fields.Nested(similar_exercise_model), description='Similar exercises, most similar first'),
+    'count': fields.Integer(description='Number of exercises in this page'),
+    'limit': fields.Integer(description='Page size'),
+    'offset': fields.Integer(description='Number of results skipped'),
+    'next_offset': fields.Integer(description='Offset of the next page, null on the last page')
+})
+
+exercise_batch_request_model = api.model('ExerciseBatchRequest', {
+    'ids': fields.List(fields.String, required=True, description='Exercise ids, in the order they should be returned'),
+    'fields': fields.List(fields.String, description='Exercise fields to return (id is always included)')
+})
+
+exercise_batch_model = api.model('ExerciseBatch', {
+    'message': fields.String(description='Response message'),
+    'exercises': fields.List(fields.Nested(exercise_model), description='Found exercises, in the requested order'),
+    'count': fields.Integer(description='Number of exercises found'),
+    'missing': fields.List(fields.String, description='Requested ids that do not exist')
+})
+
+plan_request_model = api.model('PlanRequest', {
+    'target_muscles': fields.List(fields.String, required=True, description='Muscles the plan should train', example=['chest', 'lats', 'quadriceps']),
+    'equipment': fields.List(fields.String, description='Available equipment; any equipment when omitted', example=['dumbbell', 'cable']),
+    'sessions_per_week': fields.Integer(description='Sessions per week (1-7)', example=3, default=3),
+    'session_minutes': fields.Integer(description='Time budget per session in minutes (15-180)', example=60, default=60)
+})
+
+plan_exercise_model = api.model('PlanExercise', {
+    'id': fields.String(description='Exercise ID'),
+    'name': fields.String(description='Exercise name'),
+    'equipment': fields.String(description='Required equipment'),
+    'primary_muscles': fields.List(fields.String, description='Primary muscles worked'),
+    'secondary_muscles': fields.List(fields.String, description='Secondary muscles worked'),
+    'sets': fields.Integer(description='Number of sets'),
+    'minutes': fields.Integer(description='Time budgeted for the exercise')
+})
+
+plan_session_model = api.model('PlanSession', {
+    'day': fields.Integer(description='Day of the week (1-7)'),
+    'minutes': fields.Integer(description='Planned session length'),
+    'muscles': fields.List(fields.String, description='Muscles trained as primary'),
+    'exercises': fields.List(fields.Nested(plan_exercise_model), description='Exercises in order')
+})
+
+plan_model = api.model('Plan', {
+    'target_muscles': fields.List(fields.String, description='Normalised target muscles'),
+    'equipment': fields.List(fields.String, description='Available equipment'),
+    'sessions_per_week': fields.Integer(description='Sessions per week'),
+    'session_minutes': fields.Integer(description='Time budget per session'),
+    'sessions': fields.List(fields.Nested(plan_session_model), description='Sessions of the week'),
+    'coverage': fields.Raw(description='Weekly coverage per target muscle (primary hits, secondary count half)')
+})
+
+plan_response_model = api.model('PlanResponse', {
+    'message': fields.String(description='Response message'),
+    'plan': fields.Nested(plan_model, description='Generated plan')
+})
+
+bulk_users_request_model = api.model('BulkUsersRequest', {
+    'users': fields.List(fields.Nested(user_registration_model), required=True, description='Users to register')
+})
+
+bulk_user_result_model = api.model('BulkUserResult', {
+    'index': fields.Integer(description='Position in the request'),
+    'email': fields.String(description='Email of the row'),
+    'status': fields.String(description='Outcome', enum=['created', 'exists', 'duplicate', 'invalid']),
+    'id': fields.String(description='New user ID (created only)'),
+    'details': fields.Raw(description='Validation errors (invalid only)')
+})
+
+bulk_users_response_model = api.model('BulkUsersResponse', {
+    'message': fields.String(description='Response message'),
+    'summary': fields.Raw(description='Number of rows per outcome'),
+    'results': fields.List(fields.Nested(bulk_user_result_model), description='Outcome per row, in request order')
 })
 
 # Add namespaces to API
 api.add_namespace(auth_ns, path='/api/auth')
 api.add_namespace(exercise_ns, path='/api/exercises')
+api.add_namespace(plan_ns, path='/api/plans')
+api.add_namespace(admin_ns, path='/api/admin')
 
 @auth_ns.route('/register')
 class UserRegistration(Resource):
@@ -120,6 +260,7 @@ class UserRegistration(Resource):
     @auth_ns.response(201, 'User registered successfully', auth_response_model)
     @auth_ns.response(400, 'Validation error or invalid JSON', error_model)
     @auth_ns.response(409, 'User already exists', error_model)
+    @auth_ns.response(503, 'Password hashing saturated, retry later', retry_error_model)
     @auth_ns.response(500, 'Internal server error', error_model)
     def post(self):
         """
@@ -148,7 +289,7 @@ class UserRegistration(Resource):
                 return {'error': 'No data provided'}, 400
             
             response_data, status_code = AuthService.register_user(data)
-            return response_data, status_code
+            return response_data, status_code, retry_after_headers(response_data)
             
         except Exception as e:
             return {'error': 'Internal server error'}, 500
@@ -159,6 +300,8 @@ class UserLogin(Resource):
     @auth_ns.response(200, 'Login successful', auth_response_model)
     @auth_ns.response(400, 'Validation error or invalid JSON', error_model)
     @auth_ns.response(401, 'Invalid credentials', error_model)
+    @auth_ns.response(429, 'Too many login attempts, retry later', retry_error_model)
+    @auth_ns.response(503, 'Password hashing saturated, retry later', retry_error_model)
     @auth_ns.response(500, 'Internal server error', error_model)
     def post(self):
         """
@@ -182,8 +325,8 @@ class UserLogin(Resource):
             if not data:
                 return {'error': 'No data provided'}, 400
             
-            response_data, status_code = AuthService.login_user(data)
-            return response_data, status_code
+            response_data, status_code = AuthService.login_user(data, client_ip=request.remote_addr)
+            return response_data, status_code, retry_after_headers(response_data)
             
         except Exception as e:
             return {'error': 'Internal server error'}, 500
@@ -202,6 +345,10 @@ class UserProfile(Resource):
         This endpoint returns the profile information of the currently authenticated user.
         Requires a valid JWT access token in the Authorization header.
         
+        Profiles are served from a per-worker cache (refreshed when the token's `uv`
+        claim is newer than the cached copy); deactivated accounts get 401 within
+        `USER_CACHE_TTL` seconds.
+        
         **Headers:**
         - Authorization: Bearer <access_token>
         
@@ -210,15 +357,7 @@ class UserProfile(Resource):
         """
         try:
             current_user_id = get_jwt_identity()
-            user = AuthService.get_user_by_id(current_user_id)
-            
-            if not user:
-                return {'error': 'User not found'}, 404
-            
-            return {
-                'message': 'Profile retrieved successfully',
-                'user': user.to_dict()
-            }, 200
+            return AuthService.get_profile(current_user_id, get_jwt().get('uv'))
             
         except Exception as e:
             return {'error': 'Internal server error'}, 500
@@ -227,7 +366,8 @@ class UserProfile(Resource):
 class TokenRefresh(Resource):
     @auth_ns.doc(security='Bearer Auth')
     @auth_ns.response(200, 'Token refreshed successfully', token_refresh_model)
-    @auth_ns.response(401, 'Invalid refresh token', error_model)
+    @auth_ns.response(401, 'Invalid refresh token or account deactivated', error_model)
+    @auth_ns.response(404, 'User not found', error_model)
     @auth_ns.response(500, 'Internal server error', error_model)
     def post(self):
         """
@@ -243,14 +383,38 @@ class TokenRefresh(Resource):
         - New JWT access token (valid for 1 hour)
         """
         try:
-            from flask_jwt_extended import create_access_token
             current_user_id = get_jwt_identity()
-            new_access_token = create_access_token(identity=current_user_id)
+            return AuthService.refresh_access_token(current_user_id)
             
-            return {
-                'message': 'Token refreshed successfully',
-                'access_token': new_access_token
-            }, 200
+        except Exception as e:
+            return {'error': 'Internal server error'}, 500
+
+@auth_ns.route('/logout')
+class UserLogout(Resource):
+    @auth_ns.doc(security='Bearer Auth')
+    @auth_ns.expect(logout_request_model)
+    @auth_ns.response(200, 'Logged out successfully', logout_response_model)
+    @auth_ns.response(400, 'Invalid refresh token', error_model)
+    @auth_ns.response(401, 'Unauthorized or token already revoked', error_model)
+    @auth_ns.response(500, 'Internal server error', error_model)
+    def post(self):
+        """
+        Log out
+        
+        Revokes the access or refresh token in the Authorization header and, when
+        `refresh_token` is given, that refresh token too. Revoked tokens are rejected
+        by every endpoint: at once in the worker that handled the logout, and within
+        `REVOCATION_SYNC_INTERVAL` seconds in the others.
+        
+        **Headers:**
+        - Authorization: Bearer <access_token or refresh_token>
+        
+        **Returns:**
+        - Number of tokens revoked
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            return AuthService.logout(get_jwt(), data.get('refresh_token'))
             
         except Exception as e:
             return {'error': 'Internal server error'}, 500
@@ -274,10 +438,42 @@ class HealthCheck(Resource):
             'message': 'Workout API is running'
         }, 200
 
+# Metrics endpoint
+@api.route('/metrics')
+class Metrics(Resource):
+    @api.doc(security=None, params={'X-Admin-Token': {'in': 'header', 'description': 'ADMIN_API_TOKEN', 'required': True}})
+    @api.response(200, 'Current metrics', metrics_model)
+    @api.response(403, 'Missing or invalid admin token, or admin API disabled', error_model)
+    def get(self):
+        """
+        Process metrics
+        
+        Counters, gauges and latency histograms recorded by this worker
+        process, such as password hashing queue depth, queue wait and
+        hash/verify times. Each worker process reports its own values.
+        Operational data, so it needs the admin token.
+        
+        **Headers:**
+        - X-Admin-Token: <ADMIN_API_TOKEN>
+        
+        **Returns:**
+        - Metric name -> current value
+        """
+        from routes.admin_routes import admin_token_error
+        from services.metrics import metrics
+        error = admin_token_error()
+        if error is not None:
+            return error
+        return {'metrics': metrics.snapshot()}, 200
+
 # Exercise endpoints
 @exercise_ns.route('/grouped')
 class ExercisesGrouped(Resource):
     @exercise_ns.doc(security='Bearer Auth')
+    @exercise_ns.param('limit', 'Page size; omit for the whole catalog', type=int)
+    @exercise_ns.param('cursor', 'next_cursor from the previous page')
+    @exercise_ns.param('stream', 'Set to true to stream the whole catalog incrementally', type=bool)
+    @exercise_ns.param('fields', 'Comma-separated exercise fields to return, e.g. id,name,primary_muscles')
     @exercise_ns.response(200, 'Exercises retrieved successfully', exercises_grouped_model)
     @exercise_ns.response(401, 'Unauthorized', error_model)
     @exercise_ns.response(500, 'Internal server error', error_model)
@@ -292,14 +488,24 @@ class ExercisesGrouped(Resource):
         **Headers:**
         - Authorization: Bearer <access_token>
         
+        **Query Parameters (optional):**
+        - limit: Page size (keyset pagination on exercise id)
+        - cursor: `next_cursor` from the previous page
+        
         **Returns:**
         - Dictionary with muscle groups as keys and lists of exercises as values
         - Total count of muscle groups and exercises
         """
         try:
             from services.exercise_service import ExerciseService
-            response_data, status_code = ExerciseService.get_exercises_grouped_by_primary_muscles()
+            limit, after_id = parse_page_args(request.args, current_app.config.get('EXERCISE_PAGE_MAX_LIMIT', 500))
+            fields = parse_fields(request.args.get('fields'))
+            response_data, status_code = ExerciseService.get_exercises_grouped_by_primary_muscles(limit, after_id, fields)
             return response_data, status_code
+        except InvalidPageRequest as e:
+            return {'error': 'Invalid pagination parameters', 'message': str(e)}, 400
+        except InvalidFieldsRequest as e:
+            return {'error': 'Invalid fields parameter', 'message': str(e)}, 400
         except Exception as e:
             return {'error': 'Internal server error'}, 500
 
@@ -333,6 +539,9 @@ class MuscleGroups(Resource):
 @exercise_ns.route('/muscle-group/<muscle_group>')
 class ExercisesByMuscleGroup(Resource):
     @exercise_ns.doc(security='Bearer Auth')
+    @exercise_ns.param('limit', 'Page size; omit for every matching exercise', type=int)
+    @exercise_ns.param('cursor', 'next_cursor from the previous page')
+    @exercise_ns.param('fields', 'Comma-separated exercise fields to return, e.g. id,name,primary_muscles')
     @exercise_ns.response(200, 'Exercises retrieved successfully', exercises_by_muscle_model)
     @exercise_ns.response(401, 'Unauthorized', error_model)
     @exercise_ns.response(500, 'Internal server error', error_model)
@@ -349,13 +558,327 @@ class ExercisesByMuscleGroup(Resource):
         **Parameters:**
         - muscle_group: The muscle group to filter by (e.g., 'chest', 'legs')
         
+        **Query Parameters (optional):**
+        - limit: Page size (keyset pagination on exercise id)
+        - cursor: `next_cursor` from the previous page
+        
         **Returns:**
         - List of exercises for the specified muscle group
         - Count of exercises found
         """
         try:
             from services.exercise_service import ExerciseService
-            response_data, status_code = ExerciseService.get_exercises_by_muscle_group(muscle_group)
+            limit, after_id = parse_page_args(request.args, current_app.config.get('EXERCISE_PAGE_MAX_LIMIT', 500))
+            fields = parse_fields(request.args.get('fields'))
+            response_data, status_code = ExerciseService.get_exercises_by_muscle_group(muscle_group, limit, after_id, fields)
+            return response_data, status_code
+        except InvalidPageRequest as e:
+            return {'error': 'Invalid pagination parameters', 'message': str(e)}, 400
+        except InvalidFieldsRequest as e:
+            return {'error': 'Invalid fields parameter', 'message': str(e)}, 400
+        except Exception as e:
+            return {'error': 'Internal server error'}, 500 
+
+@exercise_ns.route('/search')
+class ExerciseSearch(Resource):
+    @exercise_ns.doc(security='Bearer Auth')
+    @exercise_ns.param('q', 'Search text', required=True)
+    @exercise_ns.param('limit', 'Page size (default 20)', type=int)
+    @exercise_ns.param('offset', 'Number of ranked results to skip', type=int)
+    @exercise_ns.param('fields', 'Comma-separated exercise fields to return, e.g. id,name,primary_muscles')
+    @exercise_ns.response(200, 'Search completed successfully', exercise_search_model)
+    @exercise_ns.response(400, 'Missing query or invalid pagination parameters', error_model)
+    @exercise_ns.response(401, 'Unauthorized', error_model)
+    @exercise_ns.response(503, 'Exercise catalog disabled (EXERCISE_CATALOG_ENABLED=false)', error_model)
+    @exercise_ns.response(500, 'Internal server error', error_model)
+    def get(self):
+        """
+        Search exercises
+        
+        Ranked, typo-tolerant search over exercise name, equipment and instructions.
+        The last word of the query is treated as a prefix, so the endpoint can back
+        autocomplete.
+        
+        **Headers:**
+        - Authorization: Bearer <access_token>
+        
+        **Query Parameters:**
+        - q: Search text (required)
+        - limit: Page size (default 20)
+        - offset: Number of ranked results to skip
+        
+        **Returns:**
+        - Ranked list of exercises
+        - Total match count and next offset
+        """
+        try:
+            from services.exercise_service import ExerciseService
+            limit, offset = parse_offset_args(request.args, 20, current_app.config.get('EXERCISE_PAGE_MAX_LIMIT', 500))
+            fields = parse_fields(request.args.get('fields'))
+            response_data, status_code = ExerciseService.search_exercises(request.args.get('q', ''), limit, offset, fields)
+            return response_data, status_code
+        except InvalidPageRequest as e:
+            return {'error': 'Invalid pagination parameters', 'message': str(e)}, 400
+        except InvalidFieldsRequest as e:
+            return {'error': 'Invalid fields parameter', 'message': str(e)}, 400
+        except Exception as e:
+            return {'error': 'Internal server error'}, 500
+
+@exercise_ns.route('/filter')
+class ExerciseFilter(Resource):
+    @exercise_ns.doc(security='Bearer Auth')
+    @exercise_ns.param('primary', 'Comma-separated primary muscles, e.g. chest,triceps')
+    @exercise_ns.param('secondary', 'Comma-separated secondary muscles, e.g. shoulders')
+    @exercise_ns.param('equipment', 'Comma-separated accepted equipment types, e.g. dumbbell,cable')
+    @exercise_ns.param('mode', 'all (default): every listed muscle; any: at least one', enum=['all', 'any'])
+    @exercise_ns.param('limit', 'Page size; omit to get every matching exercise', type=int)
+    @exercise_ns.param('cursor', 'next_cursor from the previous page')
+    @exercise_ns.param('fields', 'Comma-separated exercise fields to return, e.g. id,name,primary_muscles')
+    @exercise_ns.response(200, 'Exercises filtered successfully', exercise_filter_model)
+    @exercise_ns.response(400, 'No criteria, invalid mode or invalid pagination parameters', error_model)
+    @exercise_ns.response(401, 'Unauthorized', error_model)
+    @exercise_ns.response(503, 'Exercise catalog disabled (EXERCISE_CATALOG_ENABLED=false)', error_model)
+    @exercise_ns.response(500, 'Internal server error', error_model)
+    def get(self):
+        """
+        Filter exercises by muscles and equipment
+        
+        Combine any number of primary muscles, secondary muscles and equipment types.
+        Muscles are combined with AND (`mode=all`) or OR (`mode=any`); equipment types
+        are alternatives.
+        
+        **Headers:**
+        - Authorization: Bearer <access_token>
+        """
+        try:
+            from services.exercise_service import ExerciseService
+            limit, after_id = parse_page_args(request.args, current_app.config.get('EXERCISE_PAGE_MAX_LIMIT', 500))
+            fields = parse_fields(request.args.get('fields'))
+            response_data, status_code = ExerciseService.filter_exercises(
+                request.args.get('primary'), request.args.get('secondary'),
+                request.args.get('equipment'), request.args.get('mode', 'all'),
+                limit, after_id, fields
+            )
+            return response_data, status_code
+        except InvalidPageRequest as e:
+            return {'error': 'Invalid pagination parameters', 'message': str(e)}, 400
+        except InvalidFieldsRequest as e:
+            return {'error': 'Invalid fields parameter', 'message': str(e)}, 400
+        except Exception as e:
+            return {'error': 'Internal server error'}, 500
+
+@exercise_ns.route('/facets')
+class ExerciseFacets(Resource):
+    @exercise_ns.doc(security='Bearer Auth')
+    @exercise_ns.param('primary', 'Comma-separated primary muscles, e.g. chest,triceps')
+    @exercise_ns.param('secondary', 'Comma-separated secondary muscles, e.g. shoulders')
+    @exercise_ns.param('equipment', 'Comma-separated accepted equipment types, e.g. dumbbell,cable')
+    @exercise_ns.param('mode', 'all (default): every listed muscle; any: at least one', enum=['all', 'any'])
+    @exercise_ns.response(200, 'Exercise facets retrieved successfully', exercise_facets_model)
+    @exercise_ns.response(400, 'Invalid mode', error_model)
+    @exercise_ns.response(401, 'Unauthorized', error_model)
+    @exercise_ns.response(503, 'Exercise catalog disabled (EXERCISE_CATALOG_ENABLED=false)', error_model)
+    @exercise_ns.response(500, 'Internal server error', error_model)
+    def get(self):
+        """
+        Get exercise counts per muscle and equipment
+        
+        Counts exercises per primary muscle, secondary muscle and equipment type, for
+        the whole catalog or within the exercises matching the same filters as `/filter`.
+        
+        **Headers:**
+        - Authorization: Bearer <access_token>
+        """
+        try:
+            from services.exercise_service import ExerciseService
+            response_data, status_code = ExerciseService.get_exercise_facets(
+                request.args.get('primary'), request.args.get('secondary'),
+                request.args.get('equipment'), request.args.get('mode', 'all')
+            )
+            return response_data, status_code
+        except Exception as e:
+            return {'error': 'Internal server error'}, 500
+
+@exercise_ns.route('/<string:exercise_id>/similar')
+class SimilarExercises(Resource):
+    @exercise_ns.doc(security='Bearer Auth')
+    @exercise_ns.param('equipment', 'Comma-separated equipment types to restrict results to, e.g. dumbbell,cable')
+    @exercise_ns.param('limit', 'Page size (default 10)', type=int)
+    @exercise_ns.param('offset', 'Number of ranked results to skip', type=int)
+    @exercise_ns.param('fields', 'Comma-separated exercise fields to return, e.g. id,name,primary_muscles')
+    @exercise_ns.response(200, 'Similar exercises retrieved successfully', similar_exercises_model)
+    @exercise_ns.response(400, 'Invalid pagination or fields parameters', error_model)
+    @exercise_ns.response(401, 'Unauthorized', error_model)
+    @exercise_ns.response(404, 'Exercise not found', error_model)
+    @exercise_ns.response(503, 'Exercise catalog disabled (EXERCISE_CATALOG_ENABLED=false)', error_model)
+    @exercise_ns.response(500, 'Internal server error', error_model)
+    def get(self, exercise_id):
+        """
+        Get substitutes for an exercise
+        
+        Ranks exercises by cosine similarity of primary muscles, secondary muscles
+        and equipment. Use `equipment` to only get substitutes for the equipment
+        that is free.
+        
+        **Headers:**
+        - Authorization: Bearer <access_token>
+        """
+        try:
+            from services.exercise_service import ExerciseService
+            limit, offset = parse_offset_args(request.args, 10, current_app.config.get('EXERCISE_PAGE_MAX_LIMIT', 500))
+            fields = parse_fields(request.args.get('fields'))
+            response_data, status_code = ExerciseService.get_similar_exercises(
+                exercise_id, limit, offset, request.args.get('equipment'), fields
+            )
+            return response_data, status_code
+        except InvalidPageRequest as e:
+            return {'error': 'Invalid pagination parameters', 'message': str(e)}, 400
+        except InvalidFieldsRequest as e:
+            return {'error': 'Invalid fields parameter', 'message': str(e)}, 400
+        except Exception as e:
+            return {'error': 'Internal server error'}, 500
+
+@exercise_ns.route('/batch')
+class ExerciseBatch(Resource):
+    @exercise_ns.doc(security='Bearer Auth')
+    @exercise_ns.param('ids', 'Comma-separated exercise ids', required=True)
+    @exercise_ns.param('fields', 'Comma-separated exercise fields to return, e.g. id,name,primary_muscles')
+    @exercise_ns.response(200, 'Exercises retrieved successfully', exercise_batch_model)
+    @exercise_ns.response(400, 'Missing, too many or invalid ids', error_model)
+    @exercise_ns.response(401, 'Unauthorized', error_model)
+    @exercise_ns.response(500, 'Internal server error', error_model)
+    def get(self):
+        """
+        Get many exercises by id
+        
+        Returns the exercises in the requested order; unknown ids are listed in `missing`.
+        
+        **Headers:**
+        - Authorization: Bearer <access_token>
+        
+        **Query Parameters:**
+        - ids: Comma-separated exercise ids
+        - fields: Comma-separated exercise fields to return (optional)
+        """
+        try:
+            from services.exercise_service import ExerciseService
+            exercise_ids = [exercise_id for exercise_id in request.args.get('ids', '').split(',') if exercise_id]
+            fields = parse_fields(request.args.get('fields'))
+            response_data, status_code = ExerciseService.get_exercises_by_ids(exercise_ids, fields)
             return response_data, status_code
+        except InvalidFieldsRequest as e:
+            return {'error': 'Invalid fields parameter', 'message': str(e)}, 400
         except Exception as e:
-            return {'error': 'Internal server error'}, 500 
\ No newline at end of file
+            return {'error': 'Internal server error'}, 500
+    
+    @exercise_ns.doc(security='Bearer Auth')
+    @exercise_ns.expect(exercise_batch_request_model)
+    @exercise_ns.response(200, 'Exercises retrieved successfully', exercise_batch_model)
+    @exercise_ns.response(400, 'Missing, too many or invalid ids', error_model)
+    @exercise_ns.response(401, 'Unauthorized', error_model)
+    @exercise_ns.response(500, 'Internal server error', error_model)
+    def post(self):
+        """
+        Get many exercises by id (JSON body)
+        
+        Same as the GET form, for id lists too long for a query string.
+        
+        **Headers:**
+        - Authorization: Bearer <access_token>
+        """
+        try:
+            from services.exercise_service import ExerciseService
+            data = request.get_json() or {}
+            raw_fields = data.get('fields')
+            if isinstance(raw_fields, list):
+                raw_fields = ','.join(str(field) for field in raw_fields)
+            elif raw_fields is not None and not isinstance(raw_fields, str):
+                raise InvalidFieldsRequest('fields must be a list or a comma-separated string')
+            fields = parse_fields(raw_fields)
+            response_data, status_code = ExerciseService.get_exercises_by_ids(data.get('ids'), fields)
+            return response_data, status_code
+        except InvalidFieldsRequest as e:
+            return {'error': 'Invalid fields parameter', 'message': str(e)}, 400
+        except Exception as e:
+            return {'error': 'Internal server error'}, 500
+
+@plan_ns.route('/generate')
+class PlanGeneration(Resource):
+    @plan_ns.doc(security='Bearer Auth')
+    @plan_ns.expect(plan_request_model)
+    @plan_ns.response(200, 'Plan generated successfully', plan_response_model)
+    @plan_ns.response(400, 'Validation error, unknown muscle or invalid JSON', error_model)
+    @plan_ns.response(401, 'Unauthorized', error_model)
+    @plan_ns.response(503, 'Exercise catalog disabled (EXERCISE_CATALOG_ENABLED=false)', error_model)
+    @plan_ns.response(500, 'Internal server error', error_model)
+    def post(self):
+        """
+        Generate a weekly workout plan
+        
+        Picks exercises from the catalog for coverage of the target muscles, recovery
+        spacing between sessions (48 hours per muscle) and fit with the available
+        equipment. Bodyweight exercises are always considered available.
+        
+        **Headers:**
+        - Authorization: Bearer <access_token>
+        
+        **Returns:**
+        - Sessions with their day, muscles and exercises
+        - Weekly coverage per target muscle
+        """
+        try:
+            from services.plan_service import PlanService
+            data = request.get_json()
+            
+            if not data:
+                return {'error': 'No data provided'}, 400
+            
+            response_data, status_code = PlanService.generate_plan(data)
+            return response_data, status_code
+            
+        except Exception as e:
+            return {'error': 'Internal server error'}, 500
+
+@admin_ns.route('/users/bulk')
+class BulkUserRegistration(Resource):
+    @admin_ns.doc(security=None, params={'X-Admin-Token': {'in': 'header', 'description': 'ADMIN_API_TOKEN', 'required': True}})
+    @admin_ns.expect(bulk_users_request_model)
+    @admin_ns.response(200, 'Batch processed', bulk_users_response_model)
+    @admin_ns.response(400, 'Missing, empty or oversized users list, or invalid JSON', error_model)
+    @admin_ns.response(403, 'Missing or invalid admin token, or admin API disabled', error_model)
+    @admin_ns.response(500, 'Internal server error', error_model)
+    @admin_ns.response(503, 'Password hashing saturated, retry later', retry_error_model)
+    def post(self):
+        """
+        Register users in bulk
+        
+        Validates the whole batch, skips emails that are already registered (ignoring
+        case), hashes the remaining passwords on the shared password executor and
+        inserts all new users with a single statement. Every row gets an outcome: created (with its id), exists,
+        duplicate (repeated in the batch) or invalid (with validation details).
+        
+        **Headers:**
+        - X-Admin-Token: <ADMIN_API_TOKEN>
+        
+        **Returns:**
+        - Outcome counts and per-row results
+        """
+        try:
+            from routes.admin_routes import admin_token_error
+            from services.user_provisioning import UserProvisioningService
+            error = admin_token_error()
+            if error is not None:
+                return error
+            
+            data = request.get_json()
+            
+            if not data or not isinstance(data, dict):
+                return {'error': 'No data provided'}, 400
+            
+            response_data, status_code = UserProvisioningService.bulk_register(
+                data.get('users'), max_batch=current_app.config['USER_PROVISION_MAX_BATCH']
+            )
+            return response_data, status_code, retry_after_headers(response_data)
+            
+        except Exception as e:
+            return {'error': 'Internal server error'}, 500
@@ -1,13 +1,21 @@
 import os
 from flask import Flask, jsonify
-from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_migrate import Migrate
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import config
 from models.user import db
 from routes.auth_routes import auth_bp
 from routes.exercise_routes import exercise_bp
+from routes.plan_routes import plan_bp
+from routes.admin_routes import admin_bp
 from api_docs import api
+from commands.catalog import catalog_cli
+from commands.plans import plans_cli
+from commands.users import users_cli
+from json_provider import FastJSONProvider, json_default
+from services.token_cache import CachingJWTManager
+from services.token_revocation import RevocationList
 
 def create_app(config_name='default'):
     """Application factory pattern for Flask app."""
@@ -17,19 +25,34 @@ def create_app(config_name='default'):
     # Load configuration
     app.config.from_object(config[config_name])
     
+    # Behind reverse proxies, take the client address from X-Forwarded-For
+    if app.config.get('PROXY_FIX_X_FOR', 0) > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+    
+    # JSON encoding: orjson when installed and enabled, ISO 8601 dates either way
+    app.json = FastJSONProvider(app)
+    app.config.setdefault('RESTX_JSON', {'default': json_default})
+    
     # Initialize extensions
     db.init_app(app)
-    jwt = JWTManager(app)
+    jwt = CachingJWTManager(app)
     migrate = Migrate(app, db)
     CORS(app)
     
     # Register blueprints
     app.register_blueprint(auth_bp)
     app.register_blueprint(exercise_bp)
+    app.register_blueprint(plan_bp)
+    app.register_blueprint(admin_bp)
     
     # Initialize API documentation
     api.init_app(app)
     
+    # Register CLI commands
+    app.cli.add_command(catalog_cli)
+    app.cli.add_command(plans_cli)
+    app.cli.add_command(users_cli)
+    
     # JWT error handlers
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
@@ -45,6 +68,17 @@ def create_app(config_name='default'):
             'message': 'Please provide a valid token'
         }), 401
     
+    @jwt.revoked_token_loader
+    def revoked_token_callback(jwt_header, jwt_payload):
+        return jsonify({
+            'error': 'Token has been revoked',
+            'message': 'Please login again'
+        }), 401
+    
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        return RevocationList.is_revoked(jwt_payload.get('jti'))
+    
     @jwt.unauthorized_loader
     def missing_token_callback(error):
         return jsonify({
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ORM and Core row paths for exercise reads.
+
+Compares, against the exercises table of the configured database (read-only):
+- loading the whole catalog (what ExerciseCatalog does on a version change)
+- paging through get_exercises_grouped_by_primary_muscles on the database path
+
+The ORM variant hydrates Exercise instances and copies them with to_dict(),
+which is how these reads worked before services/exercise_rows.py.
+
+Usage:
+    python benchmarks/bench_exercise_rows.py [--config default] [--repeat 5] [--limit 500]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from app import create_app
+from models.exercise import Exercise
+from models.user import db
+from services.exercise_rows import exercises_table, fetch_exercise_dicts, select_exercises
+from services.exercise_service import ExerciseService
+from services.pagination import decode_cursor, encode_cursor
+
+def load_catalog_orm():
+    return [exercise.to_dict() for exercise in Exercise.query.all()]
+
+def load_catalog_rows():
+    return fetch_exercise_dicts(select_exercises())
+
+def fetch_page_orm(criteria, limit, after_id, fields=None):
+    """ExerciseService._fetch_page as it was before the row path."""
+    query = Exercise.query.filter(*criteria)
+    if after_id is not None:
+        query = query.filter(Exercise.id > after_id)
+    exercises = query.order_by(Exercise.id).limit(limit + 1).all()
+    has_more = len(exercises) > limit
+    exercises = exercises[:limit]
+    next_cursor = encode_cursor(exercises[-1].id) if has_more else None
+    return [exercise.to_dict(fields) for exercise in exercises], next_cursor
+
+def page_grouped(limit):
+    """Page through the whole grouped catalog; returns the number of exercises seen."""
+    seen, after_id = 0, None
+    while True:
+        response_data, _ = ExerciseService.get_exercises_grouped_by_primary_muscles(limit, after_id)
+        seen += response_data['total_exercises']
+        if not response_data['next_cursor']:
+            return seen
+        after_id = decode_cursor(response_data['next_cursor'])
+
+def measure(func, repeat):
+    """Best wall time over ``repeat`` runs, and peak traced memory of one run."""
+    timings = []
+    for _ in range(repeat):
+        db.session.remove()
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    
+    db.session.remove()
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+def report(name, rows, orm, core):
+    (orm_time, orm_peak), (core_time, core_peak) = orm, core
+    print(f"\n📊 {name} ({rows} exercises)")
+    print(f"   {'path':<6} {'best time':>10} {'per row':>10} {'peak memory':>12}")
+    for label, elapsed, peak in (('orm', orm_time, orm_peak), ('rows', core_time, core_peak)):
+        print(f"   {label:<6} {elapsed * 1000:>8.1f}ms {elapsed / max(rows, 1) * 1e6:>8.1f}us {peak / 1024 / 1024:>10.1f}MB")
+    print(f"   speedup x{orm_time / core_time:.2f}, memory x{orm_peak / max(core_peak, 1):.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default='default', help='Configuration name (see config.py)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement')
+    parser.add_argument('--limit', type=int, default=500, help='Page size for the grouped endpoint')
+    args = parser.parse_args()
+    
+    load_dotenv()
+    app = create_app(args.config)
+    app.config['EXERCISE_CATALOG_ENABLED'] = False
+    app.config['EXERCISE_PAGE_MAX_LIMIT'] = max(args.limit, app.config.get('EXERCISE_PAGE_MAX_LIMIT', 500))
+    
+    with app.app_context():
+        rows = db.session.query(db.func.count()).select_from(exercises_table).scalar()
+        if not rows:
+            print("❌ The exercises table is empty; import a catalog first (flask catalog import)")
+            return 1
+        
+        report('Catalog load', rows,
+               measure(load_catalog_orm, args.repeat),
+               measure(load_catalog_rows, args.repeat))
+        
+        with mock.patch.object(ExerciseService, '_fetch_page', staticmethod(fetch_page_orm)):
+            orm = measure(lambda: page_grouped(args.limit), args.repeat)
+        core = measure(lambda: page_grouped(args.limit), args.repeat)
+        report(f'get_exercises_grouped_by_primary_muscles, limit={args.limit}', rows, orm, core)
+    
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
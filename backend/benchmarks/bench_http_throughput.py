@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Measure request throughput and latency of a running server.
+
+Opens ``--concurrency`` keep-alive connections and sends GET requests for
+``--duration`` seconds, cycling through the given paths. Use it to compare
+serving setups on the same machine, e.g. ``python run.py`` against
+``gunicorn -c gunicorn.conf.py``. The client runs in this process and
+competes with the server for CPU when both are on one host, so compare
+figures from the same host and settings only.
+
+Usage:
+    python benchmarks/bench_http_throughput.py [--url http://127.0.0.1:5000]
+        [--path /health /api/exercises/search?q=press] [--concurrency 16]
+        [--duration 10] [--token ACCESS_TOKEN]
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def client(host, port, paths, headers, deadline, timings, errors):
+    """Send requests on one connection until ``deadline``, reconnecting after failures."""
+    connection = None
+    position = 0
+    while time.perf_counter() < deadline:
+        path = paths[position % len(paths)]
+        position += 1
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection(host, port, timeout=30)
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+            else:
+                timings.append(time.perf_counter() - started)
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            if connection is not None:
+                connection.close()
+            connection = None
+    if connection is not None:
+        connection.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='Server base URL')
+    parser.add_argument('--path', nargs='+', default=['/health'],
+                        help='Paths requested in turn by every connection')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent connections')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds to run')
+    parser.add_argument('--token', default=os.environ.get('BENCH_ACCESS_TOKEN'),
+                        help='Bearer token for authenticated paths')
+    args = parser.parse_args()
+
+    target = urlsplit(args.url)
+    headers = {'Authorization': f'Bearer {args.token}'} if args.token else {}
+    timings, errors = [], []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=client, args=(target.hostname, target.port or 80, args.path, headers,
+                                              deadline, timings, errors))
+        for _ in range(args.concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"📊 {args.url} {' '.join(args.path)}: {args.concurrency} connections, {elapsed:.1f}s, {os.cpu_count()} CPUs")
+    if not timings:
+        print(f"   no successful requests ({len(errors)} errors)")
+        return 1
+    print(f"   {len(timings) / elapsed:>8.0f} requests/s   p50 {statistics.median(timings) * 1000:.1f}ms"
+          f"   p99 {percentile(timings, 0.99) * 1000:.1f}ms   errors {len(errors)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON encoding of /api/exercises/grouped.
+
+Requests the full grouped catalog through the Flask test client, served from
+the in-process catalog snapshot with the response cache disabled, so that
+the measured time is dominated by encoding. Compares Flask's default JSON
+provider with FastJSONProvider on the stdlib encoder and on orjson (when it
+is installed). Reads the exercises table of the configured database.
+
+Usage:
+    python benchmarks/bench_json_provider.py [--config production] [--repeat 10]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import create_access_token
+from app import create_app
+from json_provider import FastJSONProvider, orjson
+from services.exercise_catalog import ExerciseCatalog
+
+def make_app(config_name, provider, fast_json_enabled=True):
+    app = create_app(config_name)
+    app.config.update(
+        EXERCISE_CATALOG_ENABLED=True,
+        EXERCISE_RESPONSE_CACHE_ENABLED=False,
+        FAST_JSON_ENABLED=fast_json_enabled
+    )
+    app.json = provider(app)
+    return app
+
+def measure(app, repeat):
+    """Median and best request time, plus body size, for the grouped endpoint."""
+    with app.app_context():
+        headers = {'Authorization': f"Bearer {create_access_token(identity='benchmark')}"}
+        ExerciseCatalog.get()
+    
+    client = app.test_client()
+    response = client.get('/api/exercises/grouped', headers=headers)
+    if response.status_code != 200:
+        raise RuntimeError(f'Unexpected status {response.status_code}: {response.get_data(as_text=True)[:200]}')
+    
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get('/api/exercises/grouped', headers=headers)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), min(timings), len(response.get_data())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default='production', help='Configuration name (see config.py)')
+    parser.add_argument('--repeat', type=int, default=10, help='Requests per provider')
+    args = parser.parse_args()
+    
+    load_dotenv()
+    variants = [
+        ('flask default', DefaultJSONProvider, True),
+        ('fast (stdlib)', FastJSONProvider, False),
+    ]
+    if orjson is not None:
+        variants.append(('fast (orjson)', FastJSONProvider, True))
+    else:
+        print("ℹ️  orjson is not installed; skipping the orjson variant")
+    
+    print(f"📊 GET /api/exercises/grouped, {args.repeat} requests per provider")
+    print(f"   {'provider':<15} {'median':>10} {'best':>10} {'body':>10}")
+    baseline = None
+    for name, provider, fast_json_enabled in variants:
+        ExerciseCatalog.clear()
+        median, best, size = measure(make_app(args.config, provider, fast_json_enabled), args.repeat)
+        baseline = baseline or median
+        print(f"   {name:<15} {median * 1000:>8.1f}ms {best * 1000:>8.1f}ms {size / 1024:>8.0f}KB"
+              f"  x{baseline / median:.2f}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
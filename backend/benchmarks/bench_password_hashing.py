@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark password hashing cost settings on this machine.
+
+Times hash and verify for a range of bcrypt rounds and, when argon2-cffi is
+installed, argon2id time/memory costs. Each operation is timed on its own, so
+the figures are per-login CPU cost on one core; under concurrent logins the
+password executor's queue wait comes on top. Use the verify p99 to choose
+BCRYPT_ROUNDS / ARGON2_* against the login latency you can afford.
+
+Usage:
+    python benchmarks/bench_password_hashing.py [--rounds 10 11 12 13] [--repeat 20]
+        [--argon2 3:65536 2:19456]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.password_hasher import PasswordHasher, argon2
+
+PASSWORD = 'correct horse battery staple'
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def measure(hasher, repeat):
+    """Median and p99 seconds for hash and for verify with ``hasher``."""
+    hash_timings, verify_timings = [], []
+    stored = hasher.hash(PASSWORD)
+    for _ in range(repeat):
+        started = time.perf_counter()
+        hasher.hash(PASSWORD)
+        hash_timings.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        if not hasher.verify(PASSWORD, stored):
+            raise RuntimeError('Verification failed')
+        verify_timings.append(time.perf_counter() - started)
+    return (statistics.median(hash_timings), percentile(hash_timings, 0.99),
+            statistics.median(verify_timings), percentile(verify_timings, 0.99))
+
+def parse_argon2(value):
+    try:
+        time_cost, memory_cost = (int(part) for part in value.split(':'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected TIME_COST:MEMORY_KIB, got '{value}'")
+    return time_cost, memory_cost
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, nargs='+', default=[10, 11, 12, 13], help='bcrypt rounds to measure')
+    parser.add_argument('--argon2', type=parse_argon2, nargs='*', default=[(2, 19456), (3, 65536)],
+                        metavar='TIME:MEMORY_KIB', help='argon2id settings to measure')
+    parser.add_argument('--parallelism', type=int, default=4, help='argon2id lanes')
+    parser.add_argument('--repeat', type=int, default=20, help='Operations per setting')
+    args = parser.parse_args()
+
+    variants = [(f'bcrypt rounds={rounds}', PasswordHasher('bcrypt', bcrypt_rounds=rounds)) for rounds in args.rounds]
+    if argon2 is not None:
+        variants += [
+            (f'argon2id t={time_cost} m={memory_cost}',
+             PasswordHasher('argon2', argon2_time_cost=time_cost, argon2_memory_cost=memory_cost,
+                            argon2_parallelism=args.parallelism))
+            for time_cost, memory_cost in args.argon2
+        ]
+    elif args.argon2:
+        print("ℹ️  argon2-cffi is not installed; skipping the argon2 settings")
+
+    print(f"📊 Password hashing, {args.repeat} operations per setting, {os.cpu_count()} CPUs")
+    print(f"   {'setting':<28} {'hash p50':>10} {'hash p99':>10} {'verify p50':>11} {'verify p99':>11}")
+    for name, hasher in variants:
+        hash_median, hash_p99, verify_median, verify_p99 = measure(hasher, args.repeat)
+        print(f"   {name:<28} {hash_median * 1000:>8.1f}ms {hash_p99 * 1000:>8.1f}ms"
+              f" {verify_median * 1000:>9.1f}ms {verify_p99 * 1000:>9.1f}ms")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import time
+import click
+from flask.cli import AppGroup
+from services.catalog_import import CatalogImportError, IMPORT_FORMATS, detect_format, import_catalog
+
+catalog_cli = AppGroup('catalog', help='Manage the exercises catalog.')
+
+@catalog_cli.command('import')
+@click.argument('source', type=click.File('r', encoding='utf-8', lazy=False))
+@click.option('--format', 'import_format', type=click.Choice(sorted(set(IMPORT_FORMATS.values()))),
+              help='Input format (detected from the file extension by default).')
+@click.option('--delete-missing', is_flag=True,
+              help='Delete exercises that are not in the file (full refresh).')
+@click.option('--strict', is_flag=True, help='Abort without changes if any row is invalid.')
+@click.option('--dry-run', is_flag=True, help='Validate and stage the file, then roll back.')
+def import_command(source, import_format, delete_missing, strict, dry_run):
+    """
+    Bulk-load exercises from SOURCE (a JSON array, NDJSON or CSV file; - for stdin).
+    
+    Rows are validated one at a time, streamed into a staging table with COPY
+    and upserted in one transaction that also bumps the catalog version.
+    """
+    try:
+        if import_format is None:
+            if source.name == '<stdin>':
+                raise CatalogImportError('Pass --format when reading from stdin')
+            import_format = detect_format(source.name)
+        
+        started = time.perf_counter()
+        result = import_catalog(source, import_format, delete_missing=delete_missing,
+                                strict=strict, dry_run=dry_run)
+        elapsed = time.perf_counter() - started
+        
+    except CatalogImportError as e:
+        raise click.ClickException(str(e))
+    
+    for error in result.errors:
+        click.echo(f"⚠️  {error}", err=True)
+    if result.invalid > len(result.errors):
+        click.echo(f"⚠️  ... and {result.invalid - len(result.errors)} more invalid row(s)", err=True)
+    
+    click.echo(
+        f"{'🧪 Dry run' if dry_run else '✅ Imported'}: {result.rows} row(s) read, "
+        f"{result.invalid} invalid, {result.inserted} inserted, {result.updated} updated, "
+        f"{result.deleted} deleted in {elapsed:.2f}s"
+    )
+    if result.version is not None:
+        click.echo(f"📦 Catalog version is now {result.version}")
@@ -0,0 +1,67 @@
+import json
+import time
+import click
+from flask.cli import AppGroup
+from services.exercise_catalog import catalog_disabled_error
+from services.plan_service import PlanService
+
+plans_cli = AppGroup('plans', help='Generate workout plans offline.')
+
+# Invalid requests echoed before the rest are summarised
+MAX_REPORTED_ERRORS = 20
+
+@plans_cli.command('regenerate')
+@click.argument('source', type=click.File('r', encoding='utf-8', lazy=False))
+@click.option('--output', type=click.File('w', encoding='utf-8'), default='-',
+              help='Write the generated plans to this JSON file (default: stdout).')
+@click.option('--workers', type=int, help='Plan generation processes (default: CPU count).')
+def regenerate_command(source, output, workers):
+    """
+    Generate plans in bulk from SOURCE (a JSON array or NDJSON file; - for stdin).
+
+    Each record has the /api/plans/generate fields plus an optional user_id,
+    which is copied to its result. Plans are built in a process pool from the
+    current catalog snapshot, e.g. to refresh every user's plan overnight after
+    a catalog import.
+    """
+    if catalog_disabled_error() is not None:
+        raise click.ClickException('Plans are built from the exercise catalog snapshot; set EXERCISE_CATALOG_ENABLED=true')
+
+    text = source.read()
+    try:
+        stripped = text.lstrip()
+        if stripped.startswith('['):
+            records = json.loads(text)
+        else:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    except ValueError as e:
+        raise click.ClickException(f'Invalid JSON: {e}')
+    if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+        raise click.ClickException('SOURCE must contain JSON objects')
+
+    user_ids = [record.pop('user_id', None) for record in records]
+
+    started = time.perf_counter()
+    results = PlanService.generate_plans_bulk(records, workers=workers)
+    elapsed = time.perf_counter() - started
+
+    for position, (user_id, result) in enumerate(zip(user_ids, results)):
+        result['index'] = position
+        if user_id is not None:
+            result['user_id'] = user_id
+
+    failed = [result for result in results if 'plan' not in result]
+    for result in failed[:MAX_REPORTED_ERRORS]:
+        details = result.get('details') or result.get('message')
+        click.echo(f"⚠️  Row {result['index']}: {result['error']}: {json.dumps(details)}", err=True)
+    if len(failed) > MAX_REPORTED_ERRORS:
+        click.echo(f"⚠️  ... and {len(failed) - MAX_REPORTED_ERRORS} more failed row(s)", err=True)
+
+    json.dump(results, output, indent=2)
+    output.write('\n')
+
+    click.echo(
+        f"✅ Generated {len(results) - len(failed)} of {len(results)} plan(s) in {elapsed:.2f}s; "
+        f"{len(failed)} failed",
+        err=True
+    )
@@ -0,0 +1,56 @@
+"""
+Gunicorn settings for the Workout API.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden from the environment (see env.example) or on
+the command line. The app is preloaded and warmed in the master before
+workers are forked (see ``wsgi.warm_up``).
+
+Signals sent to the master:
+    HUP   re-read this file, start new workers and gracefully stop the old
+          ones. With ``GUNICORN_PRELOAD=true`` the new workers are forked from
+          the already loaded app, so code changes need USR2 (below) or a
+          restart; with preloading off, HUP also reloads the code.
+    USR2  start a new master with the new code next to the old one; send
+          the old master WINCH then QUIT once the new one is serving.
+    TERM  graceful shutdown (in-flight requests get ``graceful_timeout``).
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = 'wsgi:app'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Sync workers by default; GUNICORN_THREADS > 1 switches to gthread so a worker
+# can overlap requests that wait on the database or the password executor
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Build the app once in the master and fork workers from it (copy-on-write)
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+# Recycle workers after this many requests (0 = never), with jitter so they do not restart together
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 0))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded and before the first workers are forked
+    if server.cfg.preload_app:
+        from wsgi import app, warm_up
+        warm_up(app)
+        server.log.info('Application warmed up; forking workers')
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from wsgi import app, reinit_after_fork
+        reinit_after_fork(app)
@@ -0,0 +1,88 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+from typing import Any, Union
+from flask import Flask, Response
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is always available
+    orjson = None
+
+def json_default(o: Any) -> Any:
+    """
+    Encode the types the stdlib ``json`` module does not know about.
+
+    Dates and times use ISO 8601, like orjson does natively, so responses are
+    identical whichever encoder is active.
+    """
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    if hasattr(o, 'tolist'):  # NumPy arrays and scalars
+        return o.tolist()
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+class FastJSONProvider(JSONProvider):
+    """
+    JSON provider that encodes with orjson when it is installed and enabled,
+    and with the stdlib ``json`` module otherwise.
+
+    Unlike Flask's default provider, keys are not sorted (set ``sort_keys``
+    to sort them) and dates are ISO 8601 instead of HTTP dates. Output is
+    compact unless ``compact`` is False, or None in debug mode.
+    """
+
+    sort_keys = False
+    compact = None
+    mimetype = 'application/json'
+
+    def __init__(self, app: Flask):
+        super().__init__(app)
+        self.use_orjson = orjson is not None and app.config.get('FAST_JSON_ENABLED', True)
+
+    def _orjson_options(self, indent: bool = False) -> int:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize ``obj`` to a JSON string (extra kwargs force the stdlib encoder)."""
+        if self.use_orjson and not kwargs:
+            return orjson.dumps(obj, default=json_default, option=self._orjson_options()).decode('utf-8')
+        kwargs.setdefault('default', json_default)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        kwargs.setdefault('ensure_ascii', False)
+        kwargs.setdefault('separators', (',', ':'))
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize JSON from a string or bytes."""
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Encode the arguments (as ``jsonify`` does) straight into a response body."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+
+        if self.use_orjson:
+            body = orjson.dumps(obj, default=json_default, option=self._orjson_options(indent)) + b'\n'
+        else:
+            body = json.dumps(
+                obj, default=json_default, sort_keys=self.sort_keys, ensure_ascii=False,
+                indent=2 if indent else None, separators=None if indent else (',', ':')
+            ) + '\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
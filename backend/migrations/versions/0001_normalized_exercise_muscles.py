@@ -0,0 +1,66 @@
+"""Add lowercased, GIN-indexed muscle columns to exercises
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The exercises table predates migrations, and db.create_all() may already
+    # have added these columns, so every statement is idempotent.
+    op.execute("ALTER TABLE exercises ADD COLUMN IF NOT EXISTS primary_muscles_lower TEXT[]")
+    op.execute("ALTER TABLE exercises ADD COLUMN IF NOT EXISTS secondary_muscles_lower TEXT[]")
+
+    # Keep the lowercased columns in sync for writes that bypass the ORM
+    # (raw SQL, COPY-based catalog loads)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION exercises_normalize_muscles() RETURNS trigger AS $$
+        BEGIN
+            NEW.primary_muscles_lower := ARRAY(SELECT lower(m) FROM unnest(NEW.primary_muscles) AS m);
+            NEW.secondary_muscles_lower := ARRAY(SELECT lower(m) FROM unnest(NEW.secondary_muscles) AS m);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS exercises_normalize_muscles ON exercises")
+    op.execute("""
+        CREATE TRIGGER exercises_normalize_muscles
+        BEFORE INSERT OR UPDATE OF primary_muscles, secondary_muscles ON exercises
+        FOR EACH ROW EXECUTE PROCEDURE exercises_normalize_muscles()
+    """)
+
+    # Backfill existing rows
+    op.execute("""
+        UPDATE exercises SET
+            primary_muscles_lower = ARRAY(SELECT lower(m) FROM unnest(primary_muscles) AS m),
+            secondary_muscles_lower = ARRAY(SELECT lower(m) FROM unnest(secondary_muscles) AS m)
+    """)
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_exercises_primary_muscles_lower "
+        "ON exercises USING gin (primary_muscles_lower)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_exercises_secondary_muscles_lower "
+        "ON exercises USING gin (secondary_muscles_lower)"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_exercises_secondary_muscles_lower")
+    op.execute("DROP INDEX IF EXISTS ix_exercises_primary_muscles_lower")
+    op.execute("DROP TRIGGER IF EXISTS exercises_normalize_muscles ON exercises")
+    op.execute("DROP FUNCTION IF EXISTS exercises_normalize_muscles()")
+    op.drop_column('exercises', 'secondary_muscles_lower')
+    op.drop_column('exercises', 'primary_muscles_lower')
@@ -0,0 +1,37 @@
+"""Add the revoked_tokens JWT denylist
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created the table, so every statement is idempotent
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS revoked_tokens (
+            id BIGSERIAL PRIMARY KEY,
+            jti VARCHAR(36) NOT NULL,
+            token_type VARCHAR(10) NOT NULL,
+            user_id VARCHAR(36),
+            revoked_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            expires_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_revoked_tokens_jti ON revoked_tokens (jti)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_revoked_tokens_user_id ON revoked_tokens (user_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at)")
+
+
+def downgrade():
+    op.drop_table('revoked_tokens')
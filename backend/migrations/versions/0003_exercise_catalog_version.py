@@ -0,0 +1,37 @@
+"""Add the exercise_catalog_version stamp table
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created the table, so every statement is idempotent
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS exercise_catalog_version (
+            id INTEGER PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    # CatalogVersion.bump() locks row 1, so it has to exist before concurrent imports
+    op.execute("""
+        INSERT INTO exercise_catalog_version (id, version, updated_at)
+        VALUES (1, 0, now() AT TIME ZONE 'utc')
+        ON CONFLICT (id) DO NOTHING
+    """)
+
+
+def downgrade():
+    op.drop_table('exercise_catalog_version')
@@ -1,11 +1,29 @@
+from datetime import datetime
+from typing import List, Optional, Sequence
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import ARRAY
 from models.user import db
 
+# Public exercise fields, in serialization order
+EXERCISE_FIELDS = (
+    'id', 'name', 'equipment', 'instructions', 'images', 'primary_muscles', 'secondary_muscles'
+)
+
+def normalize_muscles(muscles: Optional[List[str]]) -> List[str]:
+    """Lowercase a muscle list for the indexed *_muscles_lower columns."""
+    return [muscle.lower() for muscle in muscles or []]
+
 class Exercise(db.Model):
     """Exercise model for workout exercises."""
     
     __tablename__ = 'exercises'
     
+    __table_args__ = (
+        db.Index('ix_exercises_primary_muscles_lower', 'primary_muscles_lower', postgresql_using='gin'),
+        db.Index('ix_exercises_secondary_muscles_lower', 'secondary_muscles_lower', postgresql_using='gin'),
+    )
+    
     id = db.Column(db.Text, primary_key=True)
     name = db.Column(db.Text)
     equipment = db.Column(db.Text)
@@ -14,8 +32,21 @@ class Exercise(db.Model):
     primary_muscles = db.Column(db.ARRAY(db.Text))
     secondary_muscles = db.Column(db.ARRAY(db.Text))
     
-    def to_dict(self) -> dict:
-        """Convert exercise object to dictionary."""
+    # Lowercased copies of the muscle arrays, GIN-indexed for muscle filters.
+    # Kept in sync by the ORM listeners below and by a database trigger
+    # (see migrations/versions/0001_normalized_exercise_muscles.py).
+    primary_muscles_lower = db.Column(ARRAY(db.Text))
+    secondary_muscles_lower = db.Column(ARRAY(db.Text))
+    
+    def to_dict(self, fields: Optional[Sequence[str]] = None) -> dict:
+        """
+        Convert exercise object to dictionary.
+        
+        Args:
+            fields: Only include these fields (see EXERCISE_FIELDS); all when None
+        """
+        if fields is not None:
+            return {field: getattr(self, field) for field in fields}
         return {
             'id': self.id,
             'name': self.name,
@@ -27,4 +58,51 @@ class Exercise(db.Model):
         }
     
     def __repr__(self):
-        return f'<Exercise {self.name}>' 
\ No newline at end of file
+        return f'<Exercise {self.name}>'
+
+@event.listens_for(Exercise, 'before_insert')
+@event.listens_for(Exercise, 'before_update')
+def _normalize_exercise_muscles(mapper, connection, target):
+    """Keep the lowercased muscle columns in sync on ORM writes."""
+    target.primary_muscles_lower = normalize_muscles(target.primary_muscles)
+    target.secondary_muscles_lower = normalize_muscles(target.secondary_muscles)
+
+class CatalogVersion(db.Model):
+    """Single-row version stamp for the exercises catalog.
+    
+    Anything that modifies the exercises table should call ``bump()`` so
+    in-process catalog snapshots know to reload.
+    """
+    
+    __tablename__ = 'exercise_catalog_version'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @classmethod
+    def current(cls) -> int:
+        """Return the current catalog version (0 if it was never bumped)."""
+        version = db.session.query(cls.version).filter(cls.id == 1).scalar()
+        return version or 0
+    
+    @classmethod
+    def bump(cls) -> int:
+        """
+        Increment the catalog version in the current transaction.
+        
+        The caller is responsible for committing.
+        
+        Returns:
+            The new catalog version
+        """
+        row = db.session.get(cls, 1, with_for_update=True)
+        if row is None:
+            row = cls(id=1, version=0)
+            db.session.add(row)
+        row.version = (row.version or 0) + 1
+        db.session.flush()
+        return row.version
+    
+    def __repr__(self):
+        return f'<CatalogVersion {self.version}>'
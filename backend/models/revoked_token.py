@@ -0,0 +1,24 @@
+from datetime import datetime
+from models.user import db
+
+class RevokedToken(db.Model):
+    """Denylisted JWT, by ``jti``.
+    
+    Rows are append-only. Processes mirror the list incrementally by reading
+    rows past the last ``id`` they saw, plus rows recently ``revoked_at``,
+    since ids are allocated before commit and can become visible out of order.
+    Rows whose ``expires_at`` has passed can be pruned, since an expired
+    token is rejected anyway.
+    """
+    
+    __tablename__ = 'revoked_tokens'
+    
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True, autoincrement=True)
+    jti = db.Column(db.String(36), nullable=False, unique=True, index=True)
+    token_type = db.Column(db.String(10), nullable=False)  # 'access' or 'refresh'
+    user_id = db.Column(db.String(36), nullable=True, index=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    expires_at = db.Column(db.DateTime, nullable=True, index=True)
+    
+    def __repr__(self):
+        return f'<RevokedToken {self.jti}>'
@@ -2,7 +2,8 @@ from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-import bcrypt
+from services.password_executor import get_password_executor
+from services.password_hasher import get_password_hasher
 
 db = SQLAlchemy()
 
@@ -35,25 +36,47 @@ class User(db.Model):
         self.gender = gender
     
     def _hash_password(self, password: str) -> str:
-        """Hash password using bcrypt."""
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        """
+        Hash password with the configured scheme (bcrypt or argon2) on the password executor.
+        
+        Raises:
+            PasswordExecutorBusy: If password hashing is saturated
+        """
+        return get_password_executor().run('hash', get_password_hasher().hash, password)
     
     def check_password(self, password: str) -> bool:
-        """Verify password against hash."""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        """
+        Verify password against hash on the password executor.
+        
+        Raises:
+            PasswordExecutorBusy: If password hashing is saturated
+        """
+        return get_password_executor().run('verify', get_password_hasher().verify, password, self.password_hash)
+    
+    def password_needs_rehash(self) -> bool:
+        """Whether the stored hash differs from the configured scheme or cost."""
+        return get_password_hasher().needs_rehash(self.password_hash)
+    
+    def set_password(self, password: str) -> None:
+        """Replace the stored hash with a fresh one for ``password``."""
+        self.password_hash = self._hash_password(password)
     
     def to_dict(self) -> dict:
-        """Convert user object to dictionary."""
+        """
+        Convert user object to dictionary.
+        
+        Dates are left as date/datetime objects; the app's JSON provider
+        encodes them as ISO 8601.
+        """
         return {
             'id': str(self.id),
             'email': self.email,
             'first_name': self.first_name,
             'last_name': self.last_name,
-            'date_of_birth': self.date_of_birth.isoformat() if self.date_of_birth else None,
+            'date_of_birth': self.date_of_birth,
             'gender': self.gender,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
             'is_active': self.is_active
         }
     
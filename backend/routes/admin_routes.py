@@ -0,0 +1,83 @@
+import hmac
+from functools import wraps
+from typing import Optional, Tuple
+from flask import Blueprint, request, jsonify, current_app
+from routes.responses import service_response
+from services.user_provisioning import UserProvisioningService
+
+admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
+
+def admin_token_error() -> Optional[Tuple[dict, int]]:
+    """
+    Check the ``X-Admin-Token`` header against ``ADMIN_API_TOKEN``.
+    
+    Returns:
+        None when the token matches, otherwise (response_data, status_code)
+    """
+    expected = current_app.config.get('ADMIN_API_TOKEN')
+    if not expected:
+        return {'error': 'Admin API is disabled', 'message': 'Set ADMIN_API_TOKEN to enable it'}, 403
+    provided = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(provided.encode('utf-8'), expected.encode('utf-8')):
+        return {'error': 'Admin access required', 'message': 'Provide a valid X-Admin-Token header'}, 403
+    return None
+
+def admin_token_required(view):
+    """Reject requests without a valid ``X-Admin-Token`` header."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        error = admin_token_error()
+        if error is not None:
+            response_data, status_code = error
+            return jsonify(response_data), status_code
+        return view(*args, **kwargs)
+    return wrapper
+
+@admin_bp.route('/users/bulk', methods=['POST'])
+@admin_token_required
+def bulk_register_users():
+    """
+    Register many users at once (e.g. onboarding a whole gym).
+    
+    **Headers:**
+    - X-Admin-Token: <ADMIN_API_TOKEN>
+    
+    Expected JSON payload:
+    {
+        "users": [
+            {
+                "email": "user@example.com",
+                "password": "password123",
+                "first_name": "John",
+                "last_name": "Doe",
+                "date_of_birth": "1990-01-01",
+                "gender": "male"
+            }
+        ]
+    }
+    
+    Each user gets an outcome: created, exists, duplicate or invalid. Passwords
+    are hashed on the shared password executor; when it is saturated the whole
+    batch gets 503 with Retry-After and nothing is inserted.
+    """
+    try:
+        # Check if request has JSON content
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type must be application/json'}), 400
+        
+        # Parse JSON with error handling
+        try:
+            data = request.get_json()
+        except Exception as json_error:
+            return jsonify({'error': 'Invalid JSON format'}), 400
+        
+        if not data or not isinstance(data, dict):
+            return jsonify({'error': 'No data provided'}), 400
+        
+        response_data, status_code = UserProvisioningService.bulk_register(
+            data.get('users'), max_batch=current_app.config['USER_PROVISION_MAX_BATCH']
+        )
+        return service_response(response_data, status_code)
+        
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from services.auth_service import AuthService
+from routes.responses import service_response
 from models.user import User
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
@@ -35,7 +36,7 @@ def register():
             return jsonify({'error': 'No data provided'}), 400
         
         response_data, status_code = AuthService.register_user(data)
-        return jsonify(response_data), status_code
+        return service_response(response_data, status_code)
         
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
@@ -65,8 +66,8 @@ def login():
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        response_data, status_code = AuthService.login_user(data)
-        return jsonify(response_data), status_code
+        response_data, status_code = AuthService.login_user(data, client_ip=request.remote_addr)
+        return service_response(response_data, status_code)
         
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
@@ -80,15 +81,8 @@ def get_profile():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = AuthService.get_user_by_id(current_user_id)
-        
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-        
-        return jsonify({
-            'message': 'Profile retrieved successfully',
-            'user': user.to_dict()
-        }), 200
+        response_data, status_code = AuthService.get_profile(current_user_id, get_jwt().get('uv'))
+        return jsonify(response_data), status_code
         
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
@@ -101,14 +95,28 @@ def refresh():
     Requires valid refresh token in Authorization header.
     """
     try:
-        from flask_jwt_extended import create_access_token
         current_user_id = get_jwt_identity()
-        new_access_token = create_access_token(identity=current_user_id)
+        response_data, status_code = AuthService.refresh_access_token(current_user_id)
+        return jsonify(response_data), status_code
         
-        return jsonify({
-            'message': 'Token refreshed successfully',
-            'access_token': new_access_token
-        }), 200
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500 
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required(verify_type=False)
+def logout():
+    """
+    Revoke the token in the Authorization header (access or refresh).
+    
+    Optional JSON payload, to end the whole session in one call:
+    {
+        "refresh_token": "jwt_refresh_token"
+    }
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        response_data, status_code = AuthService.logout(get_jwt(), data.get('refresh_token'))
+        return jsonify(response_data), status_code
         
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500 
\ No newline at end of file
+        return jsonify({'error': 'Internal server error'}), 500
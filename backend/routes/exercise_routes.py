@@ -1,11 +1,26 @@
-from flask import Blueprint, request, jsonify
+import itertools
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services.exercise_service import ExerciseService
+from services.pagination import InvalidPageRequest, parse_offset_args, parse_page_args
+from services.projection import InvalidFieldsRequest, parse_fields
+from services.response_cache import cached_catalog_response
 
 exercise_bp = Blueprint('exercise', __name__, url_prefix='/api/exercises')
 
+def _page_args():
+    """Parse ``limit``/``cursor`` from the query string."""
+    return parse_page_args(request.args, current_app.config.get('EXERCISE_PAGE_MAX_LIMIT', 500))
+
+def _invalid_page_response(error: InvalidPageRequest):
+    return jsonify({'error': 'Invalid pagination parameters', 'message': str(error)}), 400
+
+def _invalid_fields_response(error: InvalidFieldsRequest):
+    return jsonify({'error': 'Invalid fields parameter', 'message': str(error)}), 400
+
 @exercise_bp.route('/grouped', methods=['GET'])
 @jwt_required()
+@cached_catalog_response('limit', 'cursor', 'fields', 'stream')
 def get_exercises_grouped():
     """
     Get all exercises grouped by primary muscles.
@@ -17,18 +32,43 @@ def get_exercises_grouped():
     **Headers:**
     - Authorization: Bearer <access_token>
     
+    **Query Parameters (optional):**
+    - limit: Page size; omit to get the whole catalog in one response
+    - cursor: `next_cursor` from the previous page
+    - stream: `true` to stream the whole catalog incrementally (cannot be combined with limit).
+      Errors before the first exercise is read return 500. Errors later in the stream abort
+      the transfer, so the body is incomplete and has no `total_exercises` member.
+    - fields: Comma-separated exercise fields to return (e.g. `id,name,primary_muscles`)
+    
     **Returns:**
     - Dictionary with muscle groups as keys and lists of exercises as values
+    - `next_cursor` when paginating (null on the last page)
     """
     try:
-        response_data, status_code = ExerciseService.get_exercises_grouped_by_primary_muscles()
+        limit, after_id = _page_args()
+        fields = parse_fields(request.args.get('fields'))
+        
+        if request.args.get('stream', '').lower() in ('1', 'true'):
+            if limit is not None:
+                return jsonify({'error': 'stream cannot be combined with limit or cursor'}), 400
+            chunks = stream_with_context(ExerciseService.stream_exercises_grouped_by_primary_muscles(fields))
+            # Pull the first chunk (snapshot or first batch loaded) while a 500 can still be sent
+            first_chunk = next(chunks)
+            return Response(itertools.chain([first_chunk], chunks), mimetype='application/json')
+        
+        response_data, status_code = ExerciseService.get_exercises_grouped_by_primary_muscles(limit, after_id, fields)
         return jsonify(response_data), status_code
         
+    except InvalidPageRequest as e:
+        return _invalid_page_response(e)
+    except InvalidFieldsRequest as e:
+        return _invalid_fields_response(e)
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
 @exercise_bp.route('/muscle-groups', methods=['GET'])
 @jwt_required()
+@cached_catalog_response()
 def get_muscle_groups():
     """
     Get all available muscle groups.
@@ -51,6 +91,7 @@ def get_muscle_groups():
 
 @exercise_bp.route('/muscle-group/<muscle_group>', methods=['GET'])
 @jwt_required()
+@cached_catalog_response('limit', 'cursor', 'fields')
 def get_exercises_by_muscle_group(muscle_group):
     """
     Get exercises for a specific muscle group.
@@ -64,12 +105,238 @@ def get_exercises_by_muscle_group(muscle_group):
     **Parameters:**
     - muscle_group: The muscle group to filter by (e.g., 'chest', 'legs')
     
+    **Query Parameters (optional):**
+    - limit: Page size; omit to get every matching exercise
+    - cursor: `next_cursor` from the previous page
+    - fields: Comma-separated exercise fields to return (e.g. `id,name,primary_muscles`)
+    
     **Returns:**
     - List of exercises for the specified muscle group
+    - `next_cursor` when paginating (null on the last page)
+    """
+    try:
+        limit, after_id = _page_args()
+        fields = parse_fields(request.args.get('fields'))
+        response_data, status_code = ExerciseService.get_exercises_by_muscle_group(
+            muscle_group, limit, after_id, fields
+        )
+        return jsonify(response_data), status_code
+        
+    except InvalidPageRequest as e:
+        return _invalid_page_response(e)
+    except InvalidFieldsRequest as e:
+        return _invalid_fields_response(e)
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500 
+
+@exercise_bp.route('/search', methods=['GET'])
+@jwt_required()
+@cached_catalog_response('q', 'limit', 'offset', 'fields')
+def search_exercises():
+    """
+    Search exercises by name, equipment and instructions.
+    
+    Results are ranked (name matches weigh most), tolerate typos, and treat the
+    last word of the query as a prefix so the endpoint can back autocomplete.
+    Only authenticated users can access this endpoint.
+    
+    **Headers:**
+    - Authorization: Bearer <access_token>
+    
+    **Query Parameters:**
+    - q: Search text (required)
+    - limit: Page size (default 20)
+    - offset: Number of ranked results to skip (default 0)
+    - fields: Comma-separated exercise fields to return (e.g. `id,name,primary_muscles`)
+    
+    **Returns:**
+    - Ranked list of exercises, total match count and `next_offset`
+    """
+    try:
+        limit, offset = parse_offset_args(
+            request.args, 20, current_app.config.get('EXERCISE_PAGE_MAX_LIMIT', 500)
+        )
+        fields = parse_fields(request.args.get('fields'))
+        response_data, status_code = ExerciseService.search_exercises(
+            request.args.get('q', ''), limit, offset, fields
+        )
+        return jsonify(response_data), status_code
+        
+    except InvalidPageRequest as e:
+        return _invalid_page_response(e)
+    except InvalidFieldsRequest as e:
+        return _invalid_fields_response(e)
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@exercise_bp.route('/filter', methods=['GET'])
+@jwt_required()
+@cached_catalog_response('primary', 'secondary', 'equipment', 'mode', 'limit', 'cursor', 'fields')
+def filter_exercises():
+    """
+    Filter exercises by muscles and equipment.
+    
+    Only authenticated users can access this endpoint.
+    
+    **Headers:**
+    - Authorization: Bearer <access_token>
+    
+    **Query Parameters (at least one of primary, secondary, equipment):**
+    - primary: Comma-separated primary muscles (e.g. `chest,triceps`)
+    - secondary: Comma-separated secondary muscles (e.g. `shoulders`)
+    - equipment: Comma-separated accepted equipment types (e.g. `dumbbell,cable`)
+    - mode: `all` (default) requires every listed muscle, `any` at least one
+    - limit: Page size; omit to get every matching exercise
+    - cursor: `next_cursor` from the previous page
+    - fields: Comma-separated exercise fields to return (e.g. `id,name,primary_muscles`)
+    
+    **Returns:**
+    - Matching exercises ordered by id, with the total match count
+    - `next_cursor` when paginating (null on the last page)
+    """
+    try:
+        limit, after_id = _page_args()
+        fields = parse_fields(request.args.get('fields'))
+        response_data, status_code = ExerciseService.filter_exercises(
+            request.args.get('primary'), request.args.get('secondary'),
+            request.args.get('equipment'), request.args.get('mode', 'all'),
+            limit, after_id, fields
+        )
+        return jsonify(response_data), status_code
+        
+    except InvalidPageRequest as e:
+        return _invalid_page_response(e)
+    except InvalidFieldsRequest as e:
+        return _invalid_fields_response(e)
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@exercise_bp.route('/facets', methods=['GET'])
+@jwt_required()
+@cached_catalog_response('primary', 'secondary', 'equipment', 'mode')
+def get_exercise_facets():
+    """
+    Get exercise counts per primary muscle, secondary muscle and equipment type.
+    
+    Only authenticated users can access this endpoint.
+    
+    **Headers:**
+    - Authorization: Bearer <access_token>
+    
+    **Query Parameters (optional, same as /filter):**
+    - primary: Comma-separated primary muscles
+    - secondary: Comma-separated secondary muscles
+    - equipment: Comma-separated accepted equipment types
+    - mode: `all` (default) or `any`
+    
+    **Returns:**
+    - Counts per facet value, within the filtered exercises when filters are given
+    """
+    try:
+        response_data, status_code = ExerciseService.get_exercise_facets(
+            request.args.get('primary'), request.args.get('secondary'),
+            request.args.get('equipment'), request.args.get('mode', 'all')
+        )
+        return jsonify(response_data), status_code
+        
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@exercise_bp.route('/<exercise_id>/similar', methods=['GET'])
+@jwt_required()
+@cached_catalog_response('limit', 'offset', 'equipment', 'fields')
+def get_similar_exercises(exercise_id):
+    """
+    Get substitutes for an exercise.
+    
+    Exercises are ranked by cosine similarity of their primary muscles,
+    secondary muscles and equipment. Only authenticated users can access
+    this endpoint.
+    
+    **Headers:**
+    - Authorization: Bearer <access_token>
+    
+    **Query Parameters:**
+    - equipment: Comma-separated equipment types to restrict results to (e.g. `dumbbell,cable`)
+    - limit: Page size (default 10)
+    - offset: Number of ranked results to skip (default 0)
+    - fields: Comma-separated exercise fields to return (e.g. `id,name,primary_muscles`)
+    
+    **Returns:**
+    - Similar exercises, most similar first, each with a `similarity` score
     """
     try:
-        response_data, status_code = ExerciseService.get_exercises_by_muscle_group(muscle_group)
+        limit, offset = parse_offset_args(
+            request.args, 10, current_app.config.get('EXERCISE_PAGE_MAX_LIMIT', 500)
+        )
+        fields = parse_fields(request.args.get('fields'))
+        response_data, status_code = ExerciseService.get_similar_exercises(
+            exercise_id, limit, offset, request.args.get('equipment'), fields
+        )
         return jsonify(response_data), status_code
         
+    except InvalidPageRequest as e:
+        return _invalid_page_response(e)
+    except InvalidFieldsRequest as e:
+        return _invalid_fields_response(e)
     except Exception as e:
-        return jsonify({'error': 'Internal server error'}), 500 
\ No newline at end of file
+        return jsonify({'error': 'Internal server error'}), 500
+
+@exercise_bp.route('/batch', methods=['GET', 'POST'])
+@jwt_required()
+def get_exercises_batch():
+    """
+    Get many exercises by id in one call.
+    
+    Exercises are returned in the requested order; ids that do not exist
+    are listed in `missing`. Only authenticated users can access this endpoint.
+    
+    **Headers:**
+    - Authorization: Bearer <access_token>
+    
+    **GET Query Parameters:**
+    - ids: Comma-separated exercise ids
+    - fields: Comma-separated exercise fields to return (optional)
+    
+    **POST JSON payload:**
+    {
+        "ids": ["Barbell_Curl", "Push-Up"],
+        "fields": ["name", "primary_muscles"]
+    }
+    
+    **Returns:**
+    - List of exercises in the requested order
+    - List of missing ids
+    """
+    try:
+        if request.method == 'POST':
+            if not request.is_json:
+                return jsonify({'error': 'Content-Type must be application/json'}), 400
+            
+            try:
+                data = request.get_json()
+            except Exception as json_error:
+                return jsonify({'error': 'Invalid JSON format'}), 400
+            
+            if not isinstance(data, dict):
+                return jsonify({'error': 'No data provided'}), 400
+            
+            exercise_ids = data.get('ids')
+            raw_fields = data.get('fields')
+            if isinstance(raw_fields, list):
+                raw_fields = ','.join(str(field) for field in raw_fields)
+            elif raw_fields is not None and not isinstance(raw_fields, str):
+                raise InvalidFieldsRequest('fields must be a list or a comma-separated string')
+        else:
+            raw_ids = request.args.get('ids', '')
+            exercise_ids = [exercise_id for exercise_id in raw_ids.split(',') if exercise_id]
+            raw_fields = request.args.get('fields')
+        
+        fields = parse_fields(raw_fields)
+        response_data, status_code = ExerciseService.get_exercises_by_ids(exercise_ids, fields)
+        return jsonify(response_data), status_code
+        
+    except InvalidFieldsRequest as e:
+        return _invalid_fields_response(e)
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
@@ -0,0 +1,46 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from services.plan_service import PlanService
+
+plan_bp = Blueprint('plans', __name__, url_prefix='/api/plans')
+
+@plan_bp.route('/generate', methods=['POST'])
+@jwt_required()
+def generate_plan():
+    """
+    Generate a weekly workout plan.
+    
+    Exercises are picked from the catalog for coverage of the target muscles,
+    recovery spacing between sessions and fit with the available equipment.
+    Only authenticated users can access this endpoint.
+    
+    **Headers:**
+    - Authorization: Bearer <access_token>
+    
+    Expected JSON payload:
+    {
+        "target_muscles": ["chest", "lats", "quadriceps"],
+        "equipment": ["dumbbell", "cable"],
+        "sessions_per_week": 3,
+        "session_minutes": 60
+    }
+    """
+    try:
+        # Check if request has JSON content
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type must be application/json'}), 400
+        
+        # Parse JSON with error handling
+        try:
+            data = request.get_json()
+        except Exception as json_error:
+            return jsonify({'error': 'Invalid JSON format'}), 400
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        response_data, status_code = PlanService.generate_plan(data)
+        return jsonify(response_data), status_code
+        
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
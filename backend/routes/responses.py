@@ -0,0 +1,21 @@
+from typing import Dict
+from flask import Response, jsonify
+
+def retry_after_headers(response_data: dict) -> Dict[str, str]:
+    """``Retry-After`` header for service results that carry ``retry_after`` (seconds)."""
+    retry_after = response_data.get('retry_after') if isinstance(response_data, dict) else None
+    if retry_after is None:
+        return {}
+    return {'Retry-After': str(int(retry_after))}
+
+def service_response(response_data: dict, status_code: int) -> Response:
+    """
+    JSON response for a service ``(response_data, status_code)`` result.
+    
+    Overload and throttling results (503/429) include ``retry_after``, which
+    is also sent as a ``Retry-After`` header so clients back off.
+    """
+    response = jsonify(response_data)
+    response.status_code = status_code
+    response.headers.extend(retry_after_headers(response_data))
+    return response
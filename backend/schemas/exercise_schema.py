@@ -0,0 +1,33 @@
+from marshmallow import Schema, fields, validate, pre_load, EXCLUDE
+
+class ExerciseImportSchema(Schema):
+    """Schema for one row of an exercise catalog import."""
+    
+    class Meta:
+        # Datasets carry extra attributes (level, force, category, ...) we do not store
+        unknown = EXCLUDE
+    
+    id = fields.Str(required=True, validate=validate.Length(min=1, max=200))
+    name = fields.Str(required=True, validate=validate.Length(min=1, max=200))
+    equipment = fields.Str(load_default=None, allow_none=True, validate=validate.Length(max=100))
+    instructions = fields.Str(load_default=None, allow_none=True)
+    images = fields.List(fields.Str(validate=validate.Length(min=1)), load_default=list)
+    primary_muscles = fields.List(fields.Str(validate=validate.Length(min=1, max=50)), load_default=list)
+    secondary_muscles = fields.List(fields.Str(validate=validate.Length(min=1, max=50)), load_default=list)
+    
+    @pre_load
+    def normalize_row(self, data, **kwargs):
+        """Accept instructions as a list of steps and treat empty values as missing."""
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+        if isinstance(data.get('instructions'), list):
+            data['instructions'] = '\n'.join(str(step) for step in data['instructions'])
+        for key in ('equipment', 'instructions'):
+            if data.get(key) == '':
+                data[key] = None
+        for key in ('images', 'primary_muscles', 'secondary_muscles'):
+            if data.get(key) is None:
+                data.pop(key, None)
+        return data
+
@@ -0,0 +1,17 @@
+from marshmallow import Schema, fields, validate
+
+class PlanRequestSchema(Schema):
+    """Schema for workout plan generation requests."""
+
+    target_muscles = fields.List(
+        fields.Str(validate=validate.Length(min=1, max=50)),
+        required=True,
+        validate=validate.Length(min=1, max=20)
+    )
+    equipment = fields.List(
+        fields.Str(validate=validate.Length(min=1, max=50)),
+        load_default=None,
+        validate=validate.Length(max=20)
+    )
+    sessions_per_week = fields.Int(load_default=3, validate=validate.Range(min=1, max=7))
+    session_minutes = fields.Int(load_default=60, validate=validate.Range(min=15, max=180))
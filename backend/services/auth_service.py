@@ -1,9 +1,16 @@
+from datetime import datetime
 from typing import Optional, Tuple
 from flask import current_app
-from flask_jwt_extended import create_access_token, create_refresh_token
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
 from models.user import User, db
+from services.login_throttle import get_login_throttle
+from services.password_executor import PasswordExecutorBusy
+from services.token_revocation import RevocationList
+from services.user_cache import get_user_cache, user_version
 from schemas.user_schema import UserRegistrationSchema, UserLoginSchema
 from marshmallow import ValidationError
+from jwt.exceptions import PyJWTError
+from flask_jwt_extended.exceptions import JWTExtendedException
 
 class AuthService:
     """Service class for authentication operations."""
@@ -43,30 +50,37 @@ class AuthService:
             db.session.commit()
             
             # Generate tokens
-            access_token = create_access_token(identity=str(user.id))
+            access_token = AuthService._create_access_token(user)
             refresh_token = create_refresh_token(identity=str(user.id))
             
             return {
                 'message': 'User registered successfully',
-                'user': user.to_dict(),
+                'user': AuthService._cache_user(user),
                 'access_token': access_token,
                 'refresh_token': refresh_token
             }, 201
             
         except ValidationError as e:
             return {'error': 'Validation error', 'details': e.messages}, 400
+        except PasswordExecutorBusy as e:
+            db.session.rollback()
+            return AuthService._busy_response(e)
         except Exception as e:
             db.session.rollback()
             current_app.logger.error(f"Registration error: {str(e)}")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
-    def login_user(login_data: dict) -> Tuple[dict, int]:
+    def login_user(login_data: dict, client_ip: Optional[str] = None) -> Tuple[dict, int]:
         """
         Authenticate user and generate tokens.
         
+        Attempts are throttled per client IP and per email before the user
+        lookup, so refused attempts never reach the password hash.
+        
         Args:
             login_data: Dictionary containing login credentials
+            client_ip: Remote address of the request, for the per-IP throttle
             
         Returns:
             Tuple of (response_data, status_code)
@@ -76,6 +90,17 @@ class AuthService:
             schema = UserLoginSchema()
             validated_data = schema.load(login_data)
             
+            # Throttle before any lookup or password work
+            throttle = get_login_throttle()
+            if throttle is not None:
+                retry_after = throttle.check(client_ip, validated_data['email'])
+                if retry_after is not None:
+                    return {
+                        'error': 'Too many login attempts',
+                        'message': 'Please wait before trying again',
+                        'retry_after': retry_after
+                    }, 429
+            
             # Find user by email
             user = User.query.filter_by(email=validated_data['email']).first()
             if not user:
@@ -89,23 +114,198 @@ class AuthService:
             if not user.check_password(validated_data['password']):
                 return {'error': 'Invalid email or password'}, 401
             
+            # Upgrade the stored hash if the configured scheme or cost changed
+            if user.password_needs_rehash():
+                AuthService._rehash_password(user, validated_data['password'])
+            
             # Generate tokens
-            access_token = create_access_token(identity=str(user.id))
+            access_token = AuthService._create_access_token(user)
             refresh_token = create_refresh_token(identity=str(user.id))
             
             return {
                 'message': 'Login successful',
-                'user': user.to_dict(),
+                'user': AuthService._cache_user(user),
                 'access_token': access_token,
                 'refresh_token': refresh_token
             }, 200
             
         except ValidationError as e:
             return {'error': 'Validation error', 'details': e.messages}, 400
+        except PasswordExecutorBusy as e:
+            return AuthService._busy_response(e)
         except Exception as e:
             current_app.logger.error(f"Login error: {str(e)}")
             return {'error': 'Internal server error'}, 500
     
+    @staticmethod
+    def _rehash_password(user: User, password: str) -> None:
+        """
+        Re-hash a verified password with the current settings.
+        
+        Best effort: if hashing is saturated or the update fails, the old
+        hash stays valid and the upgrade is retried on a later login.
+        """
+        try:
+            user.set_password(password)
+            db.session.commit()
+        except PasswordExecutorBusy:
+            db.session.rollback()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.warning(f"Password rehash failed for user {user.id}: {str(e)}")
+    
+    @staticmethod
+    def _busy_response(error: PasswordExecutorBusy) -> Tuple[dict, int]:
+        """503 response for when password hashing is saturated; routes turn ``retry_after`` into a header."""
+        current_app.logger.warning('Password executor saturated, refusing auth request')
+        return {
+            'error': 'Service temporarily unavailable',
+            'message': 'Too many authentication requests in progress, please retry shortly',
+            'retry_after': error.retry_after
+        }, 503
+    
+    @staticmethod
+    def _create_access_token(user: User) -> str:
+        """
+        Access token carrying the user's version stamp (``uv``) and, when
+        ``USER_TOKEN_PROFILE_CLAIMS`` is on, stable profile claims.
+        """
+        claims = {'uv': user_version(user)}
+        if current_app.config.get('USER_TOKEN_PROFILE_CLAIMS'):
+            claims['profile'] = {
+                'email': user.email,
+                'first_name': user.first_name,
+                'last_name': user.last_name
+            }
+        return create_access_token(identity=str(user.id), additional_claims=claims)
+    
+    @staticmethod
+    def _cache_user(user: User) -> dict:
+        """User dict for a response, also stored in the user cache (when enabled)."""
+        cache = get_user_cache()
+        return cache.put(user) if cache is not None else user.to_dict()
+    
+    @staticmethod
+    def get_user_dict(user_id: str, min_version: Optional[int] = None) -> Optional[dict]:
+        """
+        User dict by ID, from the per-process user cache when possible.
+        
+        Args:
+            user_id: User ID as string
+            min_version: Version stamp from the caller's token (``uv`` claim);
+                cached copies older than it are reloaded
+            
+        Returns:
+            Dict shaped like ``User.to_dict()``, or None if the user does not exist
+        """
+        cache = get_user_cache()
+        if cache is not None:
+            user_dict = cache.get(user_id, min_version)
+            if user_dict is not None:
+                return user_dict
+        
+        user = AuthService.get_user_by_id(user_id)
+        if user is None:
+            return None
+        return cache.put(user) if cache is not None else user.to_dict()
+    
+    @staticmethod
+    def get_profile(user_id: str, token_version: Optional[int] = None) -> Tuple[dict, int]:
+        """
+        Profile of the authenticated user, served from memory on the hot path.
+        
+        Deactivated accounts are refused; a deactivation is seen within
+        ``USER_CACHE_TTL`` seconds in every worker (at once in the worker
+        that made the change).
+        
+        Args:
+            user_id: Identity from the access token
+            token_version: The token's ``uv`` claim, if any
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            user_dict = AuthService.get_user_dict(user_id, token_version)
+            if user_dict is None:
+                return {'error': 'User not found'}, 404
+            if not user_dict['is_active']:
+                return {'error': 'Account is deactivated'}, 401
+            
+            return {
+                'message': 'Profile retrieved successfully',
+                'user': user_dict
+            }, 200
+            
+        except Exception as e:
+            current_app.logger.error(f"Profile error: {str(e)}")
+            return {'error': 'Internal server error'}, 500
+    
+    @staticmethod
+    def refresh_access_token(user_id: str) -> Tuple[dict, int]:
+        """
+        Issue a new access token for the identity of a refresh token.
+        
+        Args:
+            user_id: Identity from the refresh token
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            user = AuthService.get_user_by_id(user_id)
+            if user is None:
+                return {'error': 'User not found'}, 404
+            if not user.is_active:
+                return {'error': 'Account is deactivated'}, 401
+            
+            return {
+                'message': 'Token refreshed successfully',
+                'access_token': AuthService._create_access_token(user)
+            }, 200
+            
+        except Exception as e:
+            current_app.logger.error(f"Token refresh error: {str(e)}")
+            return {'error': 'Internal server error'}, 500
+    
+    @staticmethod
+    def logout(jwt_payload: dict, refresh_token: Optional[str] = None) -> Tuple[dict, int]:
+        """
+        Revoke the presented token and, optionally, the session's refresh token.
+        
+        Args:
+            jwt_payload: Claims of the token the request was authenticated with
+            refresh_token: Encoded refresh token to revoke as well
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            tokens = [jwt_payload]
+            if refresh_token:
+                try:
+                    refresh_payload = decode_token(refresh_token)
+                except (PyJWTError, JWTExtendedException):
+                    return {'error': 'Invalid refresh token'}, 400
+                if refresh_payload.get('type') != 'refresh' or refresh_payload.get('sub') != jwt_payload.get('sub'):
+                    return {'error': 'Invalid refresh token'}, 400
+                tokens.append(refresh_payload)
+            
+            for payload in tokens:
+                expires_at = datetime.utcfromtimestamp(payload['exp']) if payload.get('exp') else None
+                RevocationList.revoke(payload['jti'], payload.get('type', 'access'),
+                                      user_id=payload.get('sub'), expires_at=expires_at)
+            
+            return {
+                'message': 'Logged out successfully',
+                'revoked': len(tokens)
+            }, 200
+            
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Logout error: {str(e)}")
+            return {'error': 'Internal server error'}, 500
+    
     @staticmethod
     def get_user_by_id(user_id: str) -> Optional[User]:
         """
@@ -0,0 +1,311 @@
+import csv
+import io
+import json
+import re
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterator, List, Optional
+from marshmallow import ValidationError
+from sqlalchemy import text
+from models.exercise import CatalogVersion, db
+from schemas.exercise_schema import ExerciseImportSchema
+from services.exercise_catalog import ExerciseCatalog
+
+# Supported input formats, by file extension
+IMPORT_FORMATS = {'.json': 'json', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.csv': 'csv'}
+
+# Columns of the staging table, in COPY order
+_STAGING_COLUMNS = (
+    'seq', 'id', 'name', 'equipment', 'instructions', 'images', 'primary_muscles', 'secondary_muscles'
+)
+
+# Invalid rows reported in detail; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+_READ_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+class CatalogImportError(ValueError):
+    """Raised when an import file cannot be read or is rejected."""
+
+@dataclass
+class ImportResult:
+    """Outcome of a catalog import."""
+
+    rows: int = 0
+    invalid: int = 0
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    version: Optional[int] = None
+    errors: List[str] = field(default_factory=list)
+
+def detect_format(filename: str) -> str:
+    """
+    Guess the import format from a file name.
+
+    Raises:
+        CatalogImportError: If the extension is not supported
+    """
+    for extension, import_format in IMPORT_FORMATS.items():
+        if filename.lower().endswith(extension):
+            return import_format
+    raise CatalogImportError(f'Cannot detect the format of {filename}; pass --format')
+
+def _iter_json_array(stream: IO[str]) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array without reading it all into memory."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    # Read position in ``buffer``; the consumed prefix is dropped on each refill
+    position = 0
+    eof = False
+    started = False
+
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if started:
+            if buffer.startswith(',', position):
+                position = _WHITESPACE.match(buffer, position + 1).end()
+            if buffer.startswith(']', position):
+                return
+        elif position < len(buffer):
+            if not buffer.startswith('[', position):
+                raise CatalogImportError('JSON input must be an array of exercises')
+            position += 1
+            started = True
+            continue
+
+        if position < len(buffer):
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise CatalogImportError('Malformed or truncated JSON input')
+            else:
+                yield item
+                continue
+        elif eof:
+            raise CatalogImportError('Malformed or truncated JSON input')
+
+        chunk = stream.read(_READ_CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+def _iter_ndjson(stream: IO[str]) -> Iterator[Any]:
+    for line_number, line in enumerate(stream, start=1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise CatalogImportError(f'Invalid JSON on line {line_number}: {e.msg}')
+
+def _split_list(value: Optional[str]) -> List[str]:
+    """CSV list cells hold either a JSON array or ``;``-separated values."""
+    value = (value or '').strip()
+    if value.startswith('['):
+        return json.loads(value)
+    return [item.strip() for item in value.split(';') if item.strip()]
+
+def _iter_csv(stream: IO[str]) -> Iterator[Any]:
+    for row in csv.DictReader(stream):
+        for key in ('images', 'primary_muscles', 'secondary_muscles'):
+            if key in row:
+                try:
+                    row[key] = _split_list(row[key])
+                except json.JSONDecodeError:
+                    row[key] = None
+        yield row
+
+_READERS = {'json': _iter_json_array, 'ndjson': _iter_ndjson, 'csv': _iter_csv}
+
+def iter_valid_rows(stream: IO[str], import_format: str, result: ImportResult) -> Iterator[Dict]:
+    """
+    Parse and validate an import stream one row at a time.
+
+    Invalid rows are counted (and the first few described) in ``result``
+    instead of being yielded.
+    """
+    schema = ExerciseImportSchema()
+    for row_number, row in enumerate(_READERS[import_format](stream), start=1):
+        result.rows += 1
+        try:
+            yield schema.load(row)
+        except ValidationError as e:
+            result.invalid += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                result.errors.append(f'row {row_number}: {e.messages}')
+
+class _CopyStream(io.RawIOBase):
+    """
+    File-like object that encodes rows as COPY CSV lazily, as COPY reads it.
+
+    An error raised while reading the rows ends the stream early and is kept
+    in ``error``, so the caller can re-raise it instead of the driver's
+    generic "COPY failed" error.
+    """
+
+    def __init__(self, rows: Iterator[Dict]):
+        self._rows = enumerate(rows)
+        self._buffer = b''
+        self.error: Optional[Exception] = None
+        self._text = io.StringIO()
+        self._writer = csv.writer(self._text, lineterminator='\n')
+
+    def readable(self) -> bool:
+        return True
+
+    def _encode(self, seq: int, row: Dict) -> bytes:
+        self._text.seek(0)
+        self._text.truncate()
+        self._writer.writerow((
+            seq, row['id'], row['name'], row['equipment'], row['instructions'],
+            json.dumps(row['images']), json.dumps(row['primary_muscles']),
+            json.dumps(row['secondary_muscles'])
+        ))
+        return self._text.getvalue().encode('utf-8')
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            try:
+                seq, row = next(self._rows)
+            except StopIteration:
+                break
+            except Exception as e:
+                self.error = e
+                break
+            encoded = self._encode(seq, row)
+            chunks.append(encoded)
+            length += len(encoded)
+        data = b''.join(chunks)
+        if size < 0:
+            self._buffer = b''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+_CREATE_STAGING = """
+    CREATE TEMP TABLE exercises_import (
+        seq bigint NOT NULL,
+        id text NOT NULL,
+        name text,
+        equipment text,
+        instructions text,
+        images jsonb,
+        primary_muscles jsonb,
+        secondary_muscles jsonb
+    ) ON COMMIT DROP
+"""
+
+# Later rows win over earlier rows with the same id; unchanged rows are not rewritten
+_UPSERT = """
+    WITH latest AS (
+        SELECT DISTINCT ON (id) *
+        FROM exercises_import
+        ORDER BY id, seq DESC
+    ), upserted AS (
+        INSERT INTO exercises AS e (
+            id, name, equipment, instructions, images, primary_muscles, secondary_muscles,
+            primary_muscles_lower, secondary_muscles_lower
+        )
+        SELECT
+            id, name, equipment, instructions,
+            ARRAY(SELECT jsonb_array_elements_text(images)),
+            ARRAY(SELECT jsonb_array_elements_text(primary_muscles)),
+            ARRAY(SELECT jsonb_array_elements_text(secondary_muscles)),
+            ARRAY(SELECT lower(m) FROM jsonb_array_elements_text(primary_muscles) AS m),
+            ARRAY(SELECT lower(m) FROM jsonb_array_elements_text(secondary_muscles) AS m)
+        FROM latest
+        ON CONFLICT (id) DO UPDATE SET
+            name = EXCLUDED.name,
+            equipment = EXCLUDED.equipment,
+            instructions = EXCLUDED.instructions,
+            images = EXCLUDED.images,
+            primary_muscles = EXCLUDED.primary_muscles,
+            secondary_muscles = EXCLUDED.secondary_muscles,
+            primary_muscles_lower = EXCLUDED.primary_muscles_lower,
+            secondary_muscles_lower = EXCLUDED.secondary_muscles_lower
+        WHERE (e.name, e.equipment, e.instructions, e.images, e.primary_muscles, e.secondary_muscles)
+            IS DISTINCT FROM
+            (EXCLUDED.name, EXCLUDED.equipment, EXCLUDED.instructions, EXCLUDED.images,
+             EXCLUDED.primary_muscles, EXCLUDED.secondary_muscles)
+        RETURNING (xmax = 0) AS inserted
+    )
+    SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+    FROM upserted
+"""
+
+_DELETE_MISSING = """
+    DELETE FROM exercises e
+    WHERE NOT EXISTS (SELECT 1 FROM exercises_import s WHERE s.id = e.id)
+"""
+
+def import_catalog(stream: IO[str], import_format: str, delete_missing: bool = False,
+                   strict: bool = False, dry_run: bool = False) -> ImportResult:
+    """
+    Bulk-load an exercise dataset into the exercises table.
+
+    Rows are validated while they are streamed into a temporary staging table
+    with ``COPY``, then upserted into ``exercises`` with a single statement.
+    Everything, including the catalog version bump, happens in one
+    transaction. Must be called inside an application context.
+
+    Args:
+        stream: Text stream with the dataset
+        import_format: One of 'json' (array), 'ndjson' or 'csv'
+        delete_missing: Delete exercises that are not in the dataset
+        strict: Abort without changes if any row is invalid
+        dry_run: Validate and stage, then roll back
+
+    Returns:
+        ImportResult
+
+    Raises:
+        CatalogImportError: If the input cannot be parsed, or is rejected
+    """
+    if import_format not in _READERS:
+        raise CatalogImportError(f'Unsupported format: {import_format}')
+
+    result = ImportResult()
+    try:
+        connection = db.session.connection()
+        connection.execute(text(_CREATE_STAGING))
+
+        copy_stream = _CopyStream(iter_valid_rows(stream, import_format, result))
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY exercises_import ({', '.join(_STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                copy_stream
+            )
+        finally:
+            cursor.close()
+        if copy_stream.error is not None:
+            raise copy_stream.error
+
+        if strict and result.invalid:
+            raise CatalogImportError(f'{result.invalid} invalid row(s); nothing was imported')
+        if delete_missing and result.invalid:
+            raise CatalogImportError(
+                f'{result.invalid} invalid row(s); refusing to delete exercises missing from the file'
+            )
+
+        result.inserted, result.updated = connection.execute(text(_UPSERT)).one()
+        if delete_missing:
+            result.deleted = connection.execute(text(_DELETE_MISSING)).rowcount
+
+        if dry_run:
+            db.session.rollback()
+            return result
+
+        if result.inserted or result.updated or result.deleted:
+            result.version = CatalogVersion.bump()
+        db.session.commit()
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+    ExerciseCatalog.invalidate()
+    return result
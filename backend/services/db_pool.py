@@ -0,0 +1,54 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import ConnectionPoolEntry, QueuePool
+from services.metrics import metrics
+
+checked_out = metrics.gauge('db_pool_checked_out', 'Database connections currently checked out of the pool')
+checkout_wait = metrics.histogram('db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled database connection')
+overflow_opened = metrics.counter('db_pool_overflow_total', 'Connections opened beyond pool_size (max_overflow in use)')
+checkout_timeouts = metrics.counter('db_pool_timeouts_total', 'Checkouts that gave up after pool_timeout')
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    ``QueuePool`` that reports its use to the metrics registry.
+
+    Every checkout records how long it waited for a connection (near zero
+    while idle connections are available, up to ``pool_timeout`` once the
+    pool and its overflow are exhausted), connections opened beyond
+    ``pool_size`` are counted as overflow, and checkouts that time out are
+    counted before the ``TimeoutError`` propagates. The checked-out gauge is
+    summed over every pool in the process.
+    """
+
+    _retrying = threading.local()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        # QueuePool._do_get calls itself again after losing a race; count the checkout once
+        if getattr(self._retrying, 'active', False):
+            return super()._do_get()
+
+        started = time.perf_counter()
+        self._retrying.active = True
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            checkout_timeouts.inc()
+            raise
+        finally:
+            self._retrying.active = False
+            checkout_wait.observe(time.perf_counter() - started)
+
+        checked_out.inc()
+        return record
+
+    def _inc_overflow(self) -> bool:
+        # _overflow starts at -pool_size, so a positive value is a connection beyond pool_size
+        opened = super()._inc_overflow()
+        if opened and self._overflow > 0:
+            overflow_opened.inc()
+        return opened
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        checked_out.dec()
+        super()._do_return_conn(record)
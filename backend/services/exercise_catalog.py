@@ -0,0 +1,227 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+from models.exercise import CatalogVersion, db
+from services.exercise_rows import fetch_exercise_dicts, select_exercises
+
+T = TypeVar('T')
+
+# Group used for exercises that have no primary muscles
+OTHER_GROUP = 'other'
+
+def exercise_group(primary_muscles: Optional[List[str]]) -> str:
+    """Grouping key for an exercise: its first primary muscle, lowercased."""
+    return primary_muscles[0].lower() if primary_muscles else OTHER_GROUP
+
+def catalog_disabled_error() -> Optional[Tuple[dict, int]]:
+    """
+    Check that the in-process catalog is enabled, for features that only work
+    from the snapshot (search, filter, facets, similar, plans).
+
+    Returns:
+        None when ``EXERCISE_CATALOG_ENABLED`` is on, otherwise (response_data, status_code)
+    """
+    if current_app.config.get('EXERCISE_CATALOG_ENABLED', True):
+        return None
+    return {
+        'error': 'Exercise catalog disabled',
+        'message': 'This endpoint is served from the in-process exercise catalog; set EXERCISE_CATALOG_ENABLED=true'
+    }, 503
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Immutable, versioned view of the exercises table with prebuilt indexes.
+
+    Snapshots are shared by every request in the worker, so neither the
+    snapshot nor any of the dicts/lists it holds may be mutated. They are
+    handed to ``jsonify`` as-is.
+    """
+
+    version: int
+    # Exercise id -> exercise dict (same shape as Exercise.to_dict())
+    exercises: Dict[str, dict]
+    # All exercise ids, sorted
+    ids: Tuple[str, ...]
+    # First primary muscle (lowercased) -> sorted exercise ids
+    by_group: Dict[str, Tuple[str, ...]]
+    # Any primary muscle (lowercased) -> sorted exercise ids
+    by_primary_muscle: Dict[str, Tuple[str, ...]]
+    # Any primary or secondary muscle (lowercased) -> sorted exercise ids
+    by_muscle: Dict[str, Tuple[str, ...]]
+    # Sorted distinct primary muscles (lowercased)
+    muscle_groups: Tuple[str, ...]
+    # Group -> exercise dicts, groups sorted alphabetically
+    grouped: Dict[str, List[dict]]
+    # Lazily built structures derived from this snapshot (see ``derived``)
+    _derived: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _derived_lock: Any = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    @classmethod
+    def build(cls, version: int, exercises: Iterable[dict]) -> 'CatalogSnapshot':
+        """
+        Build a snapshot and all of its indexes from exercise dicts.
+
+        Args:
+            version: Catalog version the exercises were read at
+            exercises: Exercise dicts, in any order
+
+        Returns:
+            CatalogSnapshot
+        """
+        by_id = {exercise['id']: exercise for exercise in exercises}
+        ids = tuple(sorted(by_id))
+
+        by_group: Dict[str, List[str]] = {}
+        by_primary_muscle: Dict[str, List[str]] = {}
+        by_muscle: Dict[str, List[str]] = {}
+
+        # ids are visited in sorted order, so every posting list comes out sorted
+        for exercise_id in ids:
+            exercise = by_id[exercise_id]
+            primary = [muscle.lower() for muscle in exercise.get('primary_muscles') or []]
+            secondary = [muscle.lower() for muscle in exercise.get('secondary_muscles') or []]
+
+            by_group.setdefault(exercise_group(primary), []).append(exercise_id)
+
+            for muscle in dict.fromkeys(primary):
+                by_primary_muscle.setdefault(muscle, []).append(exercise_id)
+            for muscle in dict.fromkeys(primary + secondary):
+                by_muscle.setdefault(muscle, []).append(exercise_id)
+
+        grouped = {
+            group: [by_id[exercise_id] for exercise_id in by_group[group]]
+            for group in sorted(by_group)
+        }
+
+        return cls(
+            version=version,
+            exercises=by_id,
+            ids=ids,
+            by_group={group: tuple(group_ids) for group, group_ids in by_group.items()},
+            by_primary_muscle={muscle: tuple(muscle_ids) for muscle, muscle_ids in by_primary_muscle.items()},
+            by_muscle={muscle: tuple(muscle_ids) for muscle, muscle_ids in by_muscle.items()},
+            muscle_groups=tuple(sorted(by_primary_muscle)),
+            grouped=grouped
+        )
+
+    def get_many(self, exercise_ids: Iterable[str]) -> List[dict]:
+        """Return the exercise dicts for the given ids, skipping unknown ids."""
+        exercises = self.exercises
+        return [exercises[exercise_id] for exercise_id in exercise_ids if exercise_id in exercises]
+
+    def derived(self, name: str, build: Callable[['CatalogSnapshot'], T]) -> T:
+        """
+        Return a structure derived from this snapshot, building it on first use.
+
+        Derived structures (search indexes, feature matrices, ...) live and die
+        with the snapshot, so they are rebuilt automatically when the catalog
+        version changes.
+
+        Args:
+            name: Key identifying the derived structure
+            build: Called with the snapshot to build the structure
+
+        Returns:
+            The derived structure
+        """
+        value = self._derived.get(name)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = build(self)
+                    self._derived[name] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+class ExerciseCatalog:
+    """
+    Per-process holder of the current exercises catalog snapshot.
+
+    The catalog version (see ``CatalogVersion``) is checked at most once every
+    ``EXERCISE_CATALOG_CHECK_INTERVAL`` seconds; in between, every read is
+    served from memory. When the version changes a new snapshot is built and
+    swapped in with a single reference assignment, so readers always see
+    either the old or the new snapshot, never a mix.
+    """
+
+    _snapshot: Optional[CatalogSnapshot] = None
+    _checked_at: float = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> CatalogSnapshot:
+        """
+        Return the current snapshot, loading or refreshing it if needed.
+
+        Must be called inside an application context.
+
+        Returns:
+            CatalogSnapshot
+        """
+        snapshot = cls._snapshot
+        if snapshot is not None and not cls._check_due():
+            return snapshot
+
+        # Another thread is already refreshing: keep serving the old snapshot
+        if snapshot is not None and not cls._lock.acquire(blocking=False):
+            return snapshot
+        if snapshot is None:
+            cls._lock.acquire()
+
+        try:
+            snapshot = cls._snapshot
+            if snapshot is not None and not cls._check_due():
+                return snapshot
+
+            # Read the version before the rows: if the catalog changes in between,
+            # the snapshot is labelled with the older version and reloaded next time
+            version = cls._current_version(snapshot)
+            if snapshot is None or snapshot.version != version:
+                snapshot = cls._load(version)
+                cls._snapshot = snapshot
+            cls._checked_at = time.monotonic()
+            return snapshot
+        finally:
+            cls._lock.release()
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Force a version check on the next ``get()`` call."""
+        cls._checked_at = 0.0
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop the current snapshot; the next ``get()`` reloads from the database."""
+        with cls._lock:
+            cls._snapshot = None
+            cls._checked_at = 0.0
+
+    @classmethod
+    def _check_due(cls) -> bool:
+        interval = current_app.config.get('EXERCISE_CATALOG_CHECK_INTERVAL', 30)
+        return time.monotonic() - cls._checked_at >= interval
+
+    @staticmethod
+    def _current_version(snapshot: Optional[CatalogSnapshot]) -> int:
+        try:
+            return CatalogVersion.current()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            current_app.logger.warning(f"Could not read exercise catalog version: {str(e)}")
+            return snapshot.version if snapshot is not None else 0
+
+    @staticmethod
+    def _load(version: int) -> CatalogSnapshot:
+        exercises = fetch_exercise_dicts(select_exercises())
+        snapshot = CatalogSnapshot.build(version, exercises)
+        current_app.logger.info(
+            f"Loaded exercise catalog version {version} ({len(snapshot)} exercises)"
+        )
+        return snapshot
@@ -0,0 +1,150 @@
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from services.exercise_catalog import CatalogSnapshot
+from services.exercise_similarity import normalize_equipment
+from services.pagination import encode_cursor
+
+# How muscle criteria are combined
+FILTER_MODES = ('all', 'any')
+
+# Facet name -> bitset attribute of ExerciseFilterIndex
+FACETS = (('primary_muscles', 'primary'), ('secondary_muscles', 'secondary'), ('equipment', 'equipment'))
+
+class ExerciseFilterIndex:
+    """
+    Bitset index over exercise muscles and equipment, built from a catalog
+    snapshot.
+
+    Every primary muscle, secondary muscle and equipment type has a NumPy
+    bool array with one entry per exercise (by position in ``snapshot.ids``),
+    so any combination of criteria resolves with a handful of vectorised
+    bitwise operations.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.size = len(snapshot.ids)
+        self.primary: Dict[str, np.ndarray] = {}
+        self.secondary: Dict[str, np.ndarray] = {}
+        self.equipment: Dict[str, np.ndarray] = {}
+
+        for position, exercise_id in enumerate(snapshot.ids):
+            exercise = snapshot.exercises[exercise_id]
+            for muscle in exercise.get('primary_muscles') or []:
+                self._bitset(self.primary, muscle.lower())[position] = True
+            for muscle in exercise.get('secondary_muscles') or []:
+                self._bitset(self.secondary, muscle.lower())[position] = True
+            equipment = normalize_equipment(exercise.get('equipment'))
+            if equipment is not None:
+                self._bitset(self.equipment, equipment)[position] = True
+
+        self._none = np.zeros(self.size, dtype=bool)
+
+        # Facet name -> (values, exercise x value bool matrix) for counting in one pass
+        self._facet_matrices = {}
+        for facet, attribute in FACETS:
+            bitsets = getattr(self, attribute)
+            values = sorted(bitsets)
+            matrix = np.column_stack([bitsets[value] for value in values]) if values \
+                else np.zeros((self.size, 0), dtype=bool)
+            self._facet_matrices[facet] = (values, matrix)
+        self._catalog_facets = self._count_facets(None)
+
+    def _bitset(self, bitsets: Dict[str, np.ndarray], key: str) -> np.ndarray:
+        bitset = bitsets.get(key)
+        if bitset is None:
+            bitset = bitsets[key] = np.zeros(self.size, dtype=bool)
+        return bitset
+
+    @classmethod
+    def for_snapshot(cls, snapshot: CatalogSnapshot) -> 'ExerciseFilterIndex':
+        """Return the filter index of ``snapshot``, building it on first use."""
+        return snapshot.derived('filter_index', cls)
+
+    def match(self, primary: Iterable[str] = (), secondary: Iterable[str] = (),
+              equipment: Iterable[str] = (), mode: str = 'all') -> np.ndarray:
+        """
+        Evaluate a filter to a bool mask over the snapshot's exercises.
+
+        Muscle criteria are ANDed (``mode='all'``) or ORed (``mode='any'``).
+        An exercise has a single equipment type, so equipment values are
+        always ORed, then ANDed with the muscle criteria.
+
+        Args:
+            primary: Muscles that must be primary muscles
+            secondary: Muscles that must be secondary muscles
+            equipment: Accepted equipment types
+            mode: 'all' or 'any'
+
+        Returns:
+            Bool array, True for matching exercises
+        """
+        muscle_bitsets = [self.primary.get(muscle, self._none) for muscle in primary]
+        muscle_bitsets += [self.secondary.get(muscle, self._none) for muscle in secondary]
+
+        mask = np.ones(self.size, dtype=bool)
+        if muscle_bitsets:
+            combine = np.logical_and if mode == 'all' else np.logical_or
+            mask = combine.reduce(muscle_bitsets)
+
+        equipment_bitsets = [self.equipment.get(name, self._none) for name in equipment]
+        if equipment_bitsets:
+            mask &= np.logical_or.reduce(equipment_bitsets)
+        return mask
+
+    def facets(self, mask: Optional[np.ndarray] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Count exercises per primary muscle, secondary muscle and equipment type.
+
+        Args:
+            mask: Result of ``match`` to count within; the whole catalog when None
+
+        Returns:
+            Facet name -> value -> count (values with no exercises are left out)
+        """
+        if mask is None:
+            return self._catalog_facets
+        return self._count_facets(mask)
+
+    def _count_facets(self, mask: Optional[np.ndarray]) -> Dict[str, Dict[str, int]]:
+        facets = {}
+        for facet, (values, matrix) in self._facet_matrices.items():
+            counts = np.count_nonzero(matrix if mask is None else matrix[mask], axis=0)
+            facets[facet] = {value: int(count) for value, count in zip(values, counts) if count}
+        return facets
+
+    def page(self, mask: np.ndarray, limit: Optional[int] = None,
+             after_id: Optional[str] = None) -> Tuple[List[str], int, Optional[str]]:
+        """
+        Keyset-page the exercises selected by ``mask``.
+
+        Args:
+            mask: Result of ``match``
+            limit: Page size, or None for every match
+            after_id: Exercise id the page starts after (exclusive)
+
+        Returns:
+            Tuple of (exercise ids ordered by id, total matches, next cursor or None)
+        """
+        positions = np.flatnonzero(mask)
+        total = len(positions)
+        if after_id is not None:
+            start = bisect_right(self.snapshot.ids, after_id)
+            positions = positions[np.searchsorted(positions, start):]
+
+        next_cursor = None
+        if limit is not None:
+            if len(positions) > limit:
+                positions = positions[:limit]
+                next_cursor = encode_cursor(self.snapshot.ids[positions[-1]])
+
+        ids = self.snapshot.ids
+        return [ids[position] for position in positions], total, next_cursor
+
+def parse_filter_values(raw: Optional[str], normalize=str.lower) -> List[str]:
+    """Split a comma-separated filter parameter into normalised, distinct values."""
+    if not raw:
+        return []
+    values = (normalize(value.strip()) for value in raw.split(','))
+    return list(dict.fromkeys(value for value in values if value))
@@ -0,0 +1,35 @@
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import Column, select
+from sqlalchemy.sql import Select
+from models.exercise import Exercise, EXERCISE_FIELDS, db
+
+# Core table behind the Exercise model; statements built on it skip the ORM
+exercises_table = Exercise.__table__
+
+def exercise_columns(fields: Optional[Sequence[str]] = None) -> List[Column]:
+    """Table columns for the given exercise field names (all public fields when None)."""
+    return [exercises_table.c[field] for field in fields or EXERCISE_FIELDS]
+
+def select_exercises(fields: Optional[Sequence[str]] = None) -> Select:
+    """Core ``SELECT`` of the given exercise fields, to be refined with ``where``/``order_by``."""
+    return select(*exercise_columns(fields))
+
+def fetch_exercise_dicts(statement: Select, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+    """
+    Run a ``select_exercises`` statement and return one dict per row.
+
+    The statement is executed on the session's connection as plain Core, so
+    no ORM objects are hydrated, nothing enters the identity map, and each
+    row tuple is turned into its response dict exactly once (instead of
+    instance -> ``to_dict()``).
+
+    Args:
+        statement: Statement built from ``select_exercises(fields)``
+        fields: The same field names the statement selects; all when None
+
+    Returns:
+        Exercise dicts shaped like ``Exercise.to_dict(fields)``
+    """
+    keys = tuple(fields or EXERCISE_FIELDS)
+    result = db.session.connection().execute(statement)
+    return [dict(zip(keys, row)) for row in result]
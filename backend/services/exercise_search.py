@@ -0,0 +1,208 @@
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from services.exercise_catalog import CatalogSnapshot
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Very common instruction words that only add noise to the ranking
+_STOPWORDS = frozenset((
+    'a', 'an', 'and', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is',
+    'it', 'of', 'on', 'or', 'so', 'that', 'the', 'then', 'this', 'to', 'up',
+    'with', 'you', 'your'
+))
+
+# Searched fields and how much a match in each contributes to the score
+FIELD_WEIGHTS = (('name', 3.0), ('equipment', 1.5), ('instructions', 1.0))
+
+# Typo tolerance: minimum trigram similarity and number of alternatives per term
+FUZZY_MIN_SIMILARITY = 0.3
+FUZZY_MAX_EXPANSIONS = 5
+# Autocomplete: number of vocabulary terms a trailing prefix may expand to
+PREFIX_MAX_EXPANSIONS = 50
+# Prefix expansions score slightly below an exact term match
+PREFIX_WEIGHT = 0.8
+# Bonus for exercises whose name starts with the whole query
+NAME_PREFIX_BONUS = 2.0
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase ``text`` and split it into alphanumeric tokens."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+def _trigrams(term: str) -> List[str]:
+    # Padded like pg_trgm so short terms and word boundaries still produce trigrams
+    padded = f'  {term} '
+    return list({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+class ExerciseSearchIndex:
+    """
+    Ranked, typo-tolerant full-text index over exercise name, equipment and
+    instructions, built from a catalog snapshot.
+
+    Documents are addressed by their position in ``snapshot.ids``. Each field
+    has an inverted index of term -> positions (numpy arrays), so scoring a
+    query term is a single vectorised add into a score array. Typos are
+    handled by expanding query terms to similar vocabulary terms through a
+    trigram index over the vocabulary (not the documents), and the trailing
+    query term is also expanded as a prefix for autocomplete.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.size = len(snapshot.ids)
+        exercises = [snapshot.exercises[exercise_id] for exercise_id in snapshot.ids]
+
+        # Normalised names, sorted, for the name-prefix bonus (bisect on the query)
+        names = [' '.join(tokenize(exercise.get('name'))) for exercise in exercises]
+        self._name_order = np.array(sorted(range(self.size), key=names.__getitem__), dtype=np.int64)
+        self._sorted_names = [names[position] for position in self._name_order]
+
+        term_ids: Dict[str, int] = {}
+        postings_by_field = []
+        for field_name, _ in FIELD_WEIGHTS:
+            # Flat (term id, position) pairs; compact until they are grouped below
+            terms, positions = array('i'), array('i')
+            for position, exercise in enumerate(exercises):
+                for token in set(tokenize(exercise.get(field_name))):
+                    if token in _STOPWORDS:
+                        continue
+                    terms.append(term_ids.setdefault(token, len(term_ids)))
+                    positions.append(position)
+            postings_by_field.append((terms, positions))
+
+        self.vocabulary = sorted(term_ids)
+        self._term_ids = term_ids
+
+        # Group each field's pairs by term id into one sorted positions array per term
+        self._postings: List[Dict[int, np.ndarray]] = []
+        document_frequency = np.zeros(len(term_ids), dtype=np.int64)
+        for terms, positions in postings_by_field:
+            terms = np.frombuffer(terms, dtype=np.int32) if len(terms) else np.zeros(0, dtype=np.int32)
+            positions = np.frombuffer(positions, dtype=np.int32) if len(positions) else np.zeros(0, dtype=np.int32)
+            order = np.argsort(terms, kind='stable')
+            terms, positions = terms[order], positions[order]
+            boundaries = np.flatnonzero(np.diff(terms)) + 1
+            field_postings = {}
+            for chunk_terms, chunk_positions in zip(np.split(terms, boundaries), np.split(positions, boundaries)):
+                if len(chunk_terms):
+                    field_postings[int(chunk_terms[0])] = chunk_positions
+                    document_frequency[chunk_terms[0]] += len(chunk_positions)
+            self._postings.append(field_postings)
+
+        # Inverse document frequency per term id, shared by all fields
+        self._idf = np.log1p(self.size / np.maximum(document_frequency, 1)).astype(np.float32)
+
+        # Trigram -> term ids, over the vocabulary only
+        trigram_terms: Dict[str, List[int]] = {}
+        self._trigram_counts = np.zeros(len(term_ids), dtype=np.int32)
+        for term, term_id in term_ids.items():
+            term_trigrams = _trigrams(term)
+            self._trigram_counts[term_id] = len(term_trigrams)
+            for trigram in term_trigrams:
+                trigram_terms.setdefault(trigram, []).append(term_id)
+        self._trigram_terms = {
+            trigram: np.array(ids, dtype=np.int32) for trigram, ids in trigram_terms.items()
+        }
+
+    @classmethod
+    def for_snapshot(cls, snapshot: CatalogSnapshot) -> 'ExerciseSearchIndex':
+        """Return the search index of ``snapshot``, building it on first use."""
+        return snapshot.derived('search_index', cls)
+
+    def _similar_terms(self, term: str) -> List[Tuple[int, float]]:
+        """Vocabulary terms within trigram similarity of ``term`` (exact match first)."""
+        matches = []
+        exact_id = self._term_ids.get(term)
+        if exact_id is not None:
+            matches.append((exact_id, 1.0))
+        if len(term) < 3 or not self._trigram_terms:
+            return matches
+
+        query_trigrams = _trigrams(term)
+        candidate_lists = [self._trigram_terms[t] for t in query_trigrams if t in self._trigram_terms]
+        if not candidate_lists:
+            return matches
+
+        overlap = np.bincount(np.concatenate(candidate_lists), minlength=len(self._trigram_counts))
+        candidates = np.flatnonzero(overlap)
+        shared = overlap[candidates]
+        similarity = shared / (len(query_trigrams) + self._trigram_counts[candidates] - shared)
+
+        keep = similarity >= FUZZY_MIN_SIMILARITY
+        candidates, similarity = candidates[keep], similarity[keep]
+        best = np.argsort(-similarity, kind='stable')[:FUZZY_MAX_EXPANSIONS + 1]
+        matches.extend(
+            (int(candidates[i]), float(similarity[i]))
+            for i in best if candidates[i] != exact_id
+        )
+        return matches[:FUZZY_MAX_EXPANSIONS + 1]
+
+    def _prefix_terms(self, prefix: str) -> List[int]:
+        """Term ids of vocabulary terms starting with ``prefix``."""
+        start = bisect_left(self.vocabulary, prefix)
+        term_ids = []
+        for term in self.vocabulary[start:start + PREFIX_MAX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            term_ids.append(self._term_ids[term])
+        return term_ids
+
+    def search(self, query: str, limit: int = 20, offset: int = 0,
+               prefix: bool = True) -> Tuple[List[str], int]:
+        """
+        Rank exercises against a free-text query.
+
+        Args:
+            query: Free-text query; typos are tolerated
+            limit: Number of results to return
+            offset: Number of ranked results to skip
+            prefix: Treat the last query term as an autocomplete prefix
+
+        Returns:
+            Tuple of (exercise ids in rank order, total number of matches)
+        """
+        terms = [term for term in tokenize(query) if term not in _STOPWORDS]
+        if not terms or not self.size:
+            return [], 0
+
+        # Query term id -> weight; the best expansion of each term wins
+        weights: Dict[int, float] = {}
+        for index, term in enumerate(terms):
+            expansions = self._similar_terms(term)
+            if prefix and index == len(terms) - 1:
+                expansions += [(term_id, PREFIX_WEIGHT) for term_id in self._prefix_terms(term)]
+            for term_id, weight in expansions:
+                if weight > weights.get(term_id, 0.0):
+                    weights[term_id] = weight
+
+        scores = np.zeros(self.size, dtype=np.float32)
+        for (_, field_weight), field_postings in zip(FIELD_WEIGHTS, self._postings):
+            for term_id, weight in weights.items():
+                positions = field_postings.get(term_id)
+                if positions is not None:
+                    scores[positions] += field_weight * weight * self._idf[term_id]
+
+        matches = np.flatnonzero(scores)
+        total = len(matches)
+        if not total or offset >= total:
+            return [], total
+
+        # Boost names that start with the query, for autocomplete-style ranking
+        normalized_query = ' '.join(tokenize(query))
+        start = bisect_left(self._sorted_names, normalized_query)
+        end = bisect_left(self._sorted_names, normalized_query + '\uffff', start)
+        scores[self._name_order[start:end]] += NAME_PREFIX_BONUS
+
+        # Only the requested window needs to be fully sorted
+        window = min(offset + limit, total)
+        match_scores = scores[matches]
+        if window < total:
+            top = np.argpartition(-match_scores, window - 1)[:window]
+        else:
+            top = np.arange(total)
+        # Highest score first, ties broken by exercise id (position) for stable pages
+        ranked = top[np.lexsort((matches[top], -match_scores[top]))]
+        ids = self.snapshot.ids
+        return [ids[matches[i]] for i in ranked[offset:window]], total
@@ -1,59 +1,97 @@
-from typing import Dict, List, Tuple
+import itertools
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from flask import current_app
-from models.exercise import Exercise, db
+from sqlalchemy import Text, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from models.exercise import Exercise, EXERCISE_FIELDS, db
+from services.exercise_catalog import ExerciseCatalog, OTHER_GROUP, catalog_disabled_error, exercise_group
+from services.exercise_filter import FILTER_MODES, ExerciseFilterIndex, parse_filter_values
+from services.exercise_rows import exercise_columns, exercises_table, fetch_exercise_dicts, select_exercises
+from services.exercise_search import ExerciseSearchIndex
+from services.exercise_similarity import ExerciseSimilarityIndex, normalize_equipment
+from services.pagination import encode_cursor, keyset_page
+from services.projection import project, with_field
+
+def _catalog_enabled() -> bool:
+    """Whether catalog reads are served from the in-process snapshot."""
+    return current_app.config.get('EXERCISE_CATALOG_ENABLED', True)
 
 class ExerciseService:
     """Service class for exercise operations."""
     
     @staticmethod
-    def get_exercises_grouped_by_primary_muscles() -> Tuple[Dict, int]:
+    def get_exercises_grouped_by_primary_muscles(limit: Optional[int] = None,
+                                                 after_id: Optional[str] = None,
+                                                 fields: Optional[Tuple[str, ...]] = None) -> Tuple[Dict, int]:
         """
         Fetch all exercises and group them by primary muscles.
         
         Groups exercises by the first muscle in the primary_muscles array.
         Returns a dictionary where keys are muscle groups and values are lists of exercises.
         
+        When ``limit`` is given, only one page of exercises (ordered by id) is
+        grouped and returned together with a ``next_cursor``; the totals then
+        describe the page.
+        
+        Args:
+            limit: Page size, or None for the full catalog
+            after_id: Exercise id the page starts after (exclusive)
+            fields: Exercise fields to return (see EXERCISE_FIELDS); all when None
+            
         Returns:
             Tuple of (response_data, status_code)
         """
         try:
-            # Fetch all exercises from the database
-            exercises = Exercise.query.all()
+            if limit is not None:
+                if _catalog_enabled():
+                    snapshot = ExerciseCatalog.get()
+                    page_ids, next_cursor = keyset_page(snapshot.ids, limit, after_id)
+                    exercises = snapshot.get_many(page_ids)
+                else:
+                    # primary_muscles is needed for grouping even if it isn't returned
+                    exercises, next_cursor = ExerciseService._fetch_page(
+                        [], limit, after_id, with_field(fields, 'primary_muscles')
+                    )
+                
+                grouped_exercises = {}
+                for exercise in exercises:
+                    grouped_exercises.setdefault(exercise_group(exercise['primary_muscles']), []).append(exercise)
+                grouped_exercises = {
+                    muscle_group: project(group_exercises, fields)
+                    for muscle_group, group_exercises in sorted(grouped_exercises.items())
+                }
+                
+                return {
+                    'message': 'Exercises retrieved successfully',
+                    'exercises': grouped_exercises,
+                    'total_muscle_groups': len(grouped_exercises),
+                    'total_exercises': len(exercises),
+                    'limit': limit,
+                    'next_cursor': next_cursor
+                }, 200
             
-            if not exercises:
+            if _catalog_enabled():
+                snapshot = ExerciseCatalog.get()
+                grouped_exercises, total_exercises = snapshot.grouped, len(snapshot.ids)
+                if fields is not None:
+                    grouped_exercises = {
+                        muscle_group: project(group_exercises, fields)
+                        for muscle_group, group_exercises in grouped_exercises.items()
+                    }
+            else:
+                grouped_exercises, total_exercises = ExerciseService._group_exercises_in_db(fields)
+            
+            if not total_exercises:
                 return {
                     'message': 'No exercises found',
                     'exercises': {}
                 }, 200
             
-            # Group exercises by primary muscle (first muscle in primary_muscles array)
-            grouped_exercises = {}
-            
-            for exercise in exercises:
-                # Get the first muscle from primary_muscles array as the grouping key
-                if exercise.primary_muscles and len(exercise.primary_muscles) > 0:
-                    primary_muscle = exercise.primary_muscles[0].lower()
-                    
-                    # Initialize the muscle group if it doesn't exist
-                    if primary_muscle not in grouped_exercises:
-                        grouped_exercises[primary_muscle] = []
-                    
-                    # Add the exercise to the appropriate muscle group
-                    grouped_exercises[primary_muscle].append(exercise.to_dict())
-                else:
-                    # Handle exercises without primary muscles
-                    if 'other' not in grouped_exercises:
-                        grouped_exercises['other'] = []
-                    grouped_exercises['other'].append(exercise.to_dict())
-            
-            # Sort muscle groups alphabetically
-            sorted_grouped_exercises = dict(sorted(grouped_exercises.items()))
-            
             return {
                 'message': 'Exercises retrieved successfully',
-                'exercises': sorted_grouped_exercises,
-                'total_muscle_groups': len(sorted_grouped_exercises),
-                'total_exercises': len(exercises)
+                'exercises': grouped_exercises,
+                'total_muscle_groups': len(grouped_exercises),
+                'total_exercises': total_exercises
             }, 200
             
         except Exception as e:
@@ -64,36 +102,131 @@ class ExerciseService:
             }, 500
     
     @staticmethod
-    def get_exercises_by_muscle_group(muscle_group: str) -> Tuple[Dict, int]:
+    def stream_exercises_grouped_by_primary_muscles(fields: Optional[Tuple[str, ...]] = None) -> Iterator[str]:
+        """
+        Stream the grouped catalog as a JSON document, one exercise at a time.
+        
+        Produces the same document as ``get_exercises_grouped_by_primary_muscles``
+        (keys may appear in a different order) without ever materialising the
+        grouped dict or the encoded body. On the database path rows are read
+        through a server-side cursor ordered by group, so peak memory is bounded
+        by ``EXERCISE_STREAM_BATCH_SIZE`` rather than the catalog size.
+        
+        Must be consumed inside an application context (e.g. via
+        ``stream_with_context``). The snapshot or the first database batch is
+        loaded before the first chunk is yielded, so callers that pull the first
+        chunk before sending the status still turn load failures into a 500.
+        Errors after that are logged and re-raised, which makes the server abort
+        the response: the client sees an incomplete transfer, and the document
+        lacks its closing ``total_exercises`` member.
+        
+        Args:
+            fields: Exercise fields to return (see EXERCISE_FIELDS); all when None
+        
+        Yields:
+            Chunks of the encoded JSON document
+        """
+        dumps = current_app.json.dumps
+        total_exercises = 0
+        total_muscle_groups = 0
+        current_group = None
+        
+        try:
+            if _catalog_enabled():
+                snapshot = ExerciseCatalog.get()
+                rows = (
+                    (muscle_group, exercise)
+                    for muscle_group, exercises in snapshot.grouped.items()
+                    for exercise in exercises
+                )
+            else:
+                rows = ExerciseService._iter_grouped_rows_in_db(fields)
+            rows = iter(rows)
+            first_row = next(rows, None)
+            
+            yield '{"exercises": {'
+            for muscle_group, exercise in itertools.chain([first_row] if first_row is not None else [], rows):
+                if muscle_group != current_group:
+                    prefix = '], ' if current_group is not None else ''
+                    yield f'{prefix}{dumps(muscle_group)}: ['
+                    current_group = muscle_group
+                    total_muscle_groups += 1
+                elif total_exercises:
+                    yield ', '
+                if fields is not None:
+                    exercise = {field: exercise[field] for field in fields}
+                yield dumps(exercise)
+                total_exercises += 1
+            if current_group is not None:
+                yield ']'
+            
+            message = 'Exercises retrieved successfully' if total_exercises else 'No exercises found'
+            yield (
+                f'}}, "message": {dumps(message)}, '
+                f'"total_muscle_groups": {total_muscle_groups}, '
+                f'"total_exercises": {total_exercises}}}'
+            )
+            
+        except Exception as e:
+            # Once headers are sent, aborting the transfer is the only signal left
+            current_app.logger.error(f"Error streaming exercises: {str(e)}")
+            raise
+    
+    @staticmethod
+    def get_exercises_by_muscle_group(muscle_group: str, limit: Optional[int] = None,
+                                      after_id: Optional[str] = None,
+                                      fields: Optional[Tuple[str, ...]] = None) -> Tuple[Dict, int]:
         """
         Fetch exercises for a specific muscle group.
         
+        When ``limit`` is given, one page of exercises (ordered by id) is
+        returned together with a ``next_cursor``.
+        
         Args:
             muscle_group: The muscle group to filter by
+            limit: Page size, or None for every matching exercise
+            after_id: Exercise id the page starts after (exclusive)
+            fields: Exercise fields to return (see EXERCISE_FIELDS); all when None
             
         Returns:
             Tuple of (response_data, status_code)
         """
         try:
-            # Fetch exercises where the first primary muscle matches the requested group
-            exercises = Exercise.query.filter(
-                Exercise.primary_muscles.any(muscle_group.lower())
-            ).all()
+            next_cursor = None
             
-            if not exercises:
-                return {
+            if _catalog_enabled():
+                snapshot = ExerciseCatalog.get()
+                muscle_ids = snapshot.by_primary_muscle.get(muscle_group.lower(), ())
+                if limit is not None:
+                    muscle_ids, next_cursor = keyset_page(muscle_ids, limit, after_id)
+                exercise_list = project(snapshot.get_many(muscle_ids), fields)
+            else:
+                # Fetch exercises where any primary muscle matches the requested group
+                # (@> on the GIN-indexed lowercased column, so this is an index scan)
+                criteria = [exercises_table.c.primary_muscles_lower.contains([muscle_group.lower()])]
+                if limit is not None:
+                    exercise_list, next_cursor = ExerciseService._fetch_page(criteria, limit, after_id, fields)
+                else:
+                    exercise_list = fetch_exercise_dicts(select_exercises(fields).where(*criteria), fields)
+            
+            if not exercise_list:
+                response_data = {
                     'message': f'No exercises found for muscle group: {muscle_group}',
                     'exercises': []
-                }, 200
+                }
+            else:
+                response_data = {
+                    'message': f'Exercises for {muscle_group} retrieved successfully',
+                    'muscle_group': muscle_group,
+                    'exercises': exercise_list,
+                    'count': len(exercise_list)
+                }
             
-            exercise_list = [exercise.to_dict() for exercise in exercises]
+            if limit is not None:
+                response_data['limit'] = limit
+                response_data['next_cursor'] = next_cursor
             
-            return {
-                'message': f'Exercises for {muscle_group} retrieved successfully',
-                'muscle_group': muscle_group,
-                'exercises': exercise_list,
-                'count': len(exercise_list)
-            }, 200
+            return response_data, 200
             
         except Exception as e:
             current_app.logger.error(f"Error fetching exercises for muscle group {muscle_group}: {str(e)}")
@@ -111,17 +244,13 @@ class ExerciseService:
             Tuple of (response_data, status_code)
         """
         try:
-            # Get all unique primary muscles from the database
-            exercises = Exercise.query.all()
-            
-            muscle_groups = set()
-            
-            for exercise in exercises:
-                if exercise.primary_muscles:
-                    for muscle in exercise.primary_muscles:
-                        muscle_groups.add(muscle.lower())
-            
-            sorted_muscle_groups = sorted(list(muscle_groups))
+            if _catalog_enabled():
+                sorted_muscle_groups = list(ExerciseCatalog.get().muscle_groups)
+            else:
+                # Let Postgres unnest and de-duplicate the muscles; only the names cross the wire
+                muscle = func.unnest(Exercise.primary_muscles_lower)
+                rows = db.session.query(muscle).distinct().all()
+                sorted_muscle_groups = sorted(row[0] for row in rows if row[0] is not None)
             
             return {
                 'message': 'Muscle groups retrieved successfully',
@@ -134,4 +263,416 @@ class ExerciseService:
             return {
                 'error': 'Internal server error',
                 'message': 'Failed to fetch muscle groups'
-            }, 500 
\ No newline at end of file
+            }, 500 
+    
+    @staticmethod
+    def search_exercises(query: str, limit: int = 20, offset: int = 0,
+                         fields: Optional[Tuple[str, ...]] = None) -> Tuple[Dict, int]:
+        """
+        Ranked, typo-tolerant search over exercise name, equipment and instructions.
+        
+        The last query term is also matched as a prefix, so partial input works
+        for autocomplete. Always served from the in-process catalog snapshot.
+        
+        Args:
+            query: Free-text query
+            limit: Number of results to return
+            offset: Number of ranked results to skip
+            fields: Exercise fields to return (see EXERCISE_FIELDS); all when None
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            error = catalog_disabled_error()
+            if error is not None:
+                return error
+            
+            if not query or not query.strip():
+                return {
+                    'error': 'Validation error',
+                    'message': 'Query parameter q is required'
+                }, 400
+            
+            snapshot = ExerciseCatalog.get()
+            exercise_ids, total = ExerciseSearchIndex.for_snapshot(snapshot).search(query, limit, offset)
+            exercise_list = project(snapshot.get_many(exercise_ids), fields)
+            
+            end = offset + len(exercise_list)
+            return {
+                'message': 'Search completed successfully',
+                'query': query,
+                'exercises': exercise_list,
+                'count': len(exercise_list),
+                'total': total,
+                'limit': limit,
+                'offset': offset,
+                'next_offset': end if end < total else None
+            }, 200
+            
+        except Exception as e:
+            current_app.logger.error(f"Error searching exercises for '{query}': {str(e)}")
+            return {
+                'error': 'Internal server error',
+                'message': 'Failed to search exercises'
+            }, 500
+    
+    @staticmethod
+    def filter_exercises(primary: Optional[str] = None, secondary: Optional[str] = None,
+                         equipment: Optional[str] = None, mode: str = 'all',
+                         limit: Optional[int] = None, after_id: Optional[str] = None,
+                         fields: Optional[Tuple[str, ...]] = None) -> Tuple[Dict, int]:
+        """
+        Filter exercises by any combination of muscles and equipment.
+        
+        Evaluated on the bitset index of the in-process catalog snapshot.
+        
+        Args:
+            primary: Comma-separated muscles that must be primary muscles
+            secondary: Comma-separated muscles that must be secondary muscles
+            equipment: Comma-separated accepted equipment types
+            mode: 'all' to require every muscle, 'any' to require at least one
+            limit: Page size, or None for every matching exercise
+            after_id: Exercise id the page starts after (exclusive)
+            fields: Exercise fields to return (see EXERCISE_FIELDS); all when None
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            error = catalog_disabled_error()
+            if error is not None:
+                return error
+            
+            if mode not in FILTER_MODES:
+                return {
+                    'error': 'Validation error',
+                    'message': f"mode must be one of: {', '.join(FILTER_MODES)}"
+                }, 400
+            
+            filters = ExerciseService._parse_filters(primary, secondary, equipment)
+            if not any(filters.values()):
+                return {
+                    'error': 'Validation error',
+                    'message': 'At least one of primary, secondary or equipment is required'
+                }, 400
+            
+            snapshot = ExerciseCatalog.get()
+            index = ExerciseFilterIndex.for_snapshot(snapshot)
+            exercise_ids, total, next_cursor = index.page(
+                index.match(mode=mode, **filters), limit, after_id
+            )
+            exercise_list = project(snapshot.get_many(exercise_ids), fields)
+            
+            response_data = {
+                'message': 'Exercises filtered successfully',
+                'filters': dict(filters, mode=mode),
+                'exercises': exercise_list,
+                'count': len(exercise_list),
+                'total': total
+            }
+            
+            if limit is not None:
+                response_data['limit'] = limit
+                response_data['next_cursor'] = next_cursor
+            
+            return response_data, 200
+            
+        except Exception as e:
+            current_app.logger.error(f"Error filtering exercises: {str(e)}")
+            return {
+                'error': 'Internal server error',
+                'message': 'Failed to filter exercises'
+            }, 500
+    
+    @staticmethod
+    def get_exercise_facets(primary: Optional[str] = None, secondary: Optional[str] = None,
+                            equipment: Optional[str] = None, mode: str = 'all') -> Tuple[Dict, int]:
+        """
+        Count exercises per primary muscle, secondary muscle and equipment type.
+        
+        With filters (same parameters as ``filter_exercises``) the counts are
+        restricted to the matching exercises; without, they cover the whole catalog.
+        
+        Args:
+            primary: Comma-separated muscles that must be primary muscles
+            secondary: Comma-separated muscles that must be secondary muscles
+            equipment: Comma-separated accepted equipment types
+            mode: 'all' to require every muscle, 'any' to require at least one
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            error = catalog_disabled_error()
+            if error is not None:
+                return error
+            
+            if mode not in FILTER_MODES:
+                return {
+                    'error': 'Validation error',
+                    'message': f"mode must be one of: {', '.join(FILTER_MODES)}"
+                }, 400
+            
+            filters = ExerciseService._parse_filters(primary, secondary, equipment)
+            index = ExerciseFilterIndex.for_snapshot(ExerciseCatalog.get())
+            
+            if any(filters.values()):
+                mask = index.match(mode=mode, **filters)
+                total = int(mask.sum())
+                facets = index.facets(mask)
+            else:
+                total = index.size
+                facets = index.facets()
+            
+            response_data = {
+                'message': 'Exercise facets retrieved successfully',
+                'total': total,
+                'facets': facets
+            }
+            if any(filters.values()):
+                response_data['filters'] = dict(filters, mode=mode)
+            
+            return response_data, 200
+            
+        except Exception as e:
+            current_app.logger.error(f"Error counting exercise facets: {str(e)}")
+            return {
+                'error': 'Internal server error',
+                'message': 'Failed to count exercise facets'
+            }, 500
+    
+    @staticmethod
+    def get_similar_exercises(exercise_id: str, limit: int = 10, offset: int = 0,
+                              equipment: Optional[str] = None,
+                              fields: Optional[Tuple[str, ...]] = None) -> Tuple[Dict, int]:
+        """
+        Find substitutes for an exercise, ranked by muscle and equipment similarity.
+        
+        Always served from the in-process catalog snapshot.
+        
+        Args:
+            exercise_id: Exercise to find substitutes for
+            limit: Number of results to return
+            offset: Number of ranked results to skip
+            equipment: Comma-separated equipment types to restrict results to
+            fields: Exercise fields to return (see EXERCISE_FIELDS); all when None
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            error = catalog_disabled_error()
+            if error is not None:
+                return error
+            
+            snapshot = ExerciseCatalog.get()
+            index = ExerciseSimilarityIndex.for_snapshot(snapshot)
+            if exercise_id not in index:
+                return {
+                    'error': 'Exercise not found',
+                    'message': f"No exercise with id '{exercise_id}'"
+                }, 404
+            
+            allowed_equipment = None
+            if equipment:
+                allowed_equipment = frozenset(
+                    name for name in map(normalize_equipment, equipment.split(',')) if name
+                ) or None
+            
+            # One extra result tells whether there is a next page
+            ranked = index.similar(exercise_id, limit + 1, offset, allowed_equipment)
+            has_more = len(ranked) > limit
+            ranked = ranked[:limit]
+            
+            exercise_list = [
+                dict(exercise, similarity=round(score, 4))
+                for exercise, (_, score) in zip(
+                    project(snapshot.get_many(similar_id for similar_id, _ in ranked), fields), ranked
+                )
+            ]
+            
+            return {
+                'message': 'Similar exercises retrieved successfully',
+                'exercise_id': exercise_id,
+                'exercises': exercise_list,
+                'count': len(exercise_list),
+                'limit': limit,
+                'offset': offset,
+                'next_offset': offset + limit if has_more else None
+            }, 200
+            
+        except Exception as e:
+            current_app.logger.error(f"Error finding exercises similar to {exercise_id}: {str(e)}")
+            return {
+                'error': 'Internal server error',
+                'message': 'Failed to find similar exercises'
+            }, 500
+    
+    @staticmethod
+    def get_exercises_by_ids(exercise_ids: Any, fields: Optional[Tuple[str, ...]] = None) -> Tuple[Dict, int]:
+        """
+        Look up many exercises by id in a single round trip.
+        
+        Results come back in the requested order (duplicates collapsed to their
+        first occurrence) and ids that do not exist are listed in ``missing``.
+        
+        Args:
+            exercise_ids: List of exercise ids (at most EXERCISE_BATCH_MAX_IDS)
+            fields: Exercise fields to return (see EXERCISE_FIELDS); all when None
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            max_ids = current_app.config.get('EXERCISE_BATCH_MAX_IDS', 2000)
+            if not isinstance(exercise_ids, list) or not exercise_ids \
+                    or not all(isinstance(exercise_id, str) for exercise_id in exercise_ids):
+                return {
+                    'error': 'Validation error',
+                    'message': 'ids must be a non-empty list of exercise ids'
+                }, 400
+            if len(exercise_ids) > max_ids:
+                return {
+                    'error': 'Validation error',
+                    'message': f'At most {max_ids} ids can be requested at once'
+                }, 400
+            
+            requested_ids = list(dict.fromkeys(exercise_ids))
+            
+            if _catalog_enabled():
+                found = ExerciseCatalog.get().exercises
+            else:
+                # One round trip: WHERE id = ANY(:ids)
+                statement = select_exercises(fields).where(
+                    exercises_table.c.id == any_(bindparam('ids', requested_ids, type_=ARRAY(Text)))
+                )
+                found = {exercise['id']: exercise for exercise in fetch_exercise_dicts(statement, fields)}
+            
+            exercise_list = project(
+                (found[exercise_id] for exercise_id in requested_ids if exercise_id in found),
+                fields if _catalog_enabled() else None
+            )
+            missing = [exercise_id for exercise_id in requested_ids if exercise_id not in found]
+            
+            return {
+                'message': 'Exercises retrieved successfully',
+                'exercises': exercise_list,
+                'count': len(exercise_list),
+                'missing': missing
+            }, 200
+            
+        except Exception as e:
+            current_app.logger.error(f"Error fetching exercises by id: {str(e)}")
+            return {
+                'error': 'Internal server error',
+                'message': 'Failed to fetch exercises'
+            }, 500
+    
+    @staticmethod
+    def _parse_filters(primary: Optional[str], secondary: Optional[str],
+                       equipment: Optional[str]) -> Dict[str, List[str]]:
+        """Normalise the comma-separated filter parameters."""
+        return {
+            'primary': parse_filter_values(primary),
+            'secondary': parse_filter_values(secondary),
+            'equipment': parse_filter_values(equipment, normalize_equipment)
+        }
+    
+    @staticmethod
+    def _group_exercises_in_db(fields: Optional[Tuple[str, ...]] = None) -> Tuple[Dict[str, List[dict]], int]:
+        """
+        Group exercises by their first primary muscle inside Postgres.
+        
+        Each group comes back as a single JSON array built by ``json_agg``, so
+        grouping happens in one set-based query instead of a Python loop over
+        hydrated ORM objects. Only the requested columns are read and sent.
+        
+        Args:
+            fields: Exercise fields to return; all when None
+            
+        Returns:
+            Tuple of (groups sorted alphabetically, total exercise count)
+        """
+        fields = fields or EXERCISE_FIELDS
+        
+        # Group key computed once in a subquery so GROUP BY can refer to it by column
+        keyed = db.session.query(
+            *exercise_columns(fields),
+            func.coalesce(Exercise.primary_muscles_lower[1], OTHER_GROUP).label('muscle_group')
+        ).subquery()
+        
+        json_args = []
+        for field in fields:
+            json_args.extend((field, keyed.c[field]))
+        exercise_json = func.json_build_object(*json_args)
+        
+        rows = db.session.query(
+            keyed.c.muscle_group,
+            func.count(),
+            func.json_agg(aggregate_order_by(exercise_json, keyed.c.id))
+        ).group_by(keyed.c.muscle_group).all()
+        
+        grouped_exercises = {
+            muscle_group: exercises
+            for muscle_group, _, exercises in sorted(rows, key=lambda row: row[0])
+        }
+        total_exercises = sum(count for _, count, _ in rows)
+        
+        return grouped_exercises, total_exercises
+    
+    @staticmethod
+    def _fetch_page(criteria: list, limit: int, after_id: Optional[str],
+                    fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[dict], Optional[str]]:
+        """
+        Fetch one keyset page of exercises ordered by id.
+        
+        One extra row is requested so the last page can be detected without a
+        separate COUNT query. Rows are read through the Core row path (see
+        ``services.exercise_rows``), without ORM hydration.
+        
+        Args:
+            criteria: WHERE clauses on ``exercises_table``
+            limit: Page size
+            after_id: Exercise id the page starts after (exclusive)
+            fields: Exercise fields to load and return; all when None
+            
+        Returns:
+            Tuple of (exercise dicts, next cursor or None on the last page)
+        """
+        if after_id is not None:
+            criteria = [*criteria, exercises_table.c.id > after_id]
+        statement = select_exercises(fields).where(*criteria) \
+            .order_by(exercises_table.c.id).limit(limit + 1)
+        
+        exercises = fetch_exercise_dicts(statement, fields)
+        has_more = len(exercises) > limit
+        exercises = exercises[:limit]
+        
+        next_cursor = encode_cursor(exercises[-1]['id']) if has_more else None
+        return exercises, next_cursor
+    
+    @staticmethod
+    def _iter_grouped_rows_in_db(fields: Optional[Tuple[str, ...]] = None) -> Iterator[Tuple[str, dict]]:
+        """
+        Yield (muscle group, exercise dict) pairs ordered by group, then id.
+        
+        Uses a server-side cursor so only one batch of rows is held in memory.
+        
+        Args:
+            fields: Exercise fields to read; all when None
+        """
+        fields = fields or EXERCISE_FIELDS
+        group_key = func.coalesce(Exercise.primary_muscles_lower[1], OTHER_GROUP).label('muscle_group')
+        stmt = select(
+            group_key,
+            *exercise_columns(fields)
+        ).order_by(group_key, Exercise.id).execution_options(stream_results=True)
+        
+        batch_size = current_app.config.get('EXERCISE_STREAM_BATCH_SIZE', 500)
+        result = db.session.execute(stmt).yield_per(batch_size)
+        try:
+            for row in result:
+                yield row.muscle_group, {field: value for field, value in zip(fields, row[1:])}
+        finally:
+            result.close()
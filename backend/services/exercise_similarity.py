@@ -0,0 +1,132 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+import numpy as np
+from services.exercise_catalog import CatalogSnapshot
+
+# Feature weights: primary and secondary muscles share the muscle columns
+PRIMARY_MUSCLE_WEIGHT = 1.0
+SECONDARY_MUSCLE_WEIGHT = 0.5
+EQUIPMENT_WEIGHT = 0.75
+
+# Ranked neighbour lists kept per snapshot for frequently requested exercises
+NEIGHBOUR_CACHE_SIZE = 1024
+
+def normalize_equipment(equipment: Optional[str]) -> Optional[str]:
+    """Lowercase and trim an equipment name; empty values become None."""
+    if not equipment or not equipment.strip():
+        return None
+    return equipment.strip().lower()
+
+class ExerciseSimilarityIndex:
+    """
+    Nearest-neighbour index over exercise muscles and equipment, built from a
+    catalog snapshot.
+
+    Each exercise is a row of a dense float32 feature matrix: one column per
+    muscle (primary or secondary, weighted) and one per equipment type. Rows
+    are L2-normalised, so the cosine similarity of one exercise against the
+    whole catalog is a single matrix-vector product. Rows are addressed by
+    their position in ``snapshot.ids``.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.size = len(snapshot.ids)
+        self._positions = {exercise_id: position for position, exercise_id in enumerate(snapshot.ids)}
+
+        exercises = [snapshot.exercises[exercise_id] for exercise_id in snapshot.ids]
+        primary = [[muscle.lower() for muscle in exercise.get('primary_muscles') or []] for exercise in exercises]
+        secondary = [[muscle.lower() for muscle in exercise.get('secondary_muscles') or []] for exercise in exercises]
+        equipment = [normalize_equipment(exercise.get('equipment')) for exercise in exercises]
+
+        muscles = sorted({muscle for row in primary + secondary for muscle in row})
+        muscle_columns = {muscle: column for column, muscle in enumerate(muscles)}
+        self.equipment_types = sorted({name for name in equipment if name is not None})
+        self._equipment_codes: Dict[str, int] = {name: code for code, name in enumerate(self.equipment_types)}
+
+        features = np.zeros((self.size, len(muscles) + len(self.equipment_types)), dtype=np.float32)
+        # Exercise position -> equipment code, -1 when the exercise has none
+        self._equipment = np.full(self.size, -1, dtype=np.int32)
+        for position in range(self.size):
+            for muscle in secondary[position]:
+                features[position, muscle_columns[muscle]] = SECONDARY_MUSCLE_WEIGHT
+            # Primary wins when a muscle is listed as both
+            for muscle in primary[position]:
+                features[position, muscle_columns[muscle]] = PRIMARY_MUSCLE_WEIGHT
+            if equipment[position] is not None:
+                code = self._equipment_codes[equipment[position]]
+                self._equipment[position] = code
+                features[position, len(muscles) + code] = EQUIPMENT_WEIGHT
+
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        self._features = features / np.maximum(norms, np.float32(1e-12))
+
+        self._cache: 'OrderedDict[Tuple[str, FrozenSet[str], int], List[Tuple[str, float]]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def for_snapshot(cls, snapshot: CatalogSnapshot) -> 'ExerciseSimilarityIndex':
+        """Return the similarity index of ``snapshot``, building it on first use."""
+        return snapshot.derived('similarity_index', cls)
+
+    def __contains__(self, exercise_id: str) -> bool:
+        return exercise_id in self._positions
+
+    def similar(self, exercise_id: str, limit: int = 10, offset: int = 0,
+                equipment: Optional[FrozenSet[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Rank the exercises most similar to ``exercise_id``.
+
+        Args:
+            exercise_id: Exercise to find substitutes for
+            limit: Number of results to return
+            offset: Number of ranked results to skip
+            equipment: Only return exercises using one of these (normalised)
+                equipment types; any equipment when None
+
+        Returns:
+            List of (exercise id, cosine similarity) pairs, most similar first;
+            empty when the exercise is unknown
+        """
+        position = self._positions.get(exercise_id)
+        if position is None:
+            return []
+
+        window = offset + limit
+        key = (exercise_id, equipment or frozenset(), window)
+        with self._cache_lock:
+            ranked = self._cache.get(key)
+            if ranked is not None:
+                self._cache.move_to_end(key)
+        if ranked is None:
+            ranked = self._rank(position, window, equipment)
+            with self._cache_lock:
+                self._cache[key] = ranked
+                while len(self._cache) > NEIGHBOUR_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return ranked[offset:window]
+
+    def _rank(self, position: int, window: int,
+              equipment: Optional[FrozenSet[str]]) -> List[Tuple[str, float]]:
+        scores = self._features @ self._features[position]
+        scores[position] = 0.0
+
+        if equipment:
+            codes = [self._equipment_codes[name] for name in equipment if name in self._equipment_codes]
+            scores[~np.isin(self._equipment, codes)] = 0.0
+
+        candidates = np.flatnonzero(scores > 0)
+        if not len(candidates) or not window:
+            return []
+
+        candidate_scores = scores[candidates]
+        window = min(window, len(candidates))
+        if window < len(candidates):
+            top = np.argpartition(-candidate_scores, window - 1)[:window]
+        else:
+            top = np.arange(len(candidates))
+        # Most similar first, ties broken by exercise id (position) for stable pages
+        top = top[np.lexsort((candidates[top], -candidate_scores[top]))]
+        ids = self.snapshot.ids
+        return [(ids[candidates[i]], float(candidate_scores[i])) for i in top]
@@ -0,0 +1,169 @@
+import math
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from flask import current_app, has_app_context
+from werkzeug.utils import import_string
+from config import Config
+from services.metrics import metrics
+
+throttled = metrics.counter('login_throttled_total', 'Login attempts refused by the throttle before any password check')
+
+class TokenBucketStore(ABC):
+    """
+    Storage for token buckets, keyed by string.
+
+    Subclass this to share buckets between worker processes (e.g. on Redis,
+    where ``consume`` would be one atomic script) and point
+    ``LOGIN_THROTTLE_STORE`` at the subclass; it is created with no arguments.
+    """
+
+    @abstractmethod
+    def consume(self, key: str, capacity: float, refill_per_second: float) -> Tuple[bool, float]:
+        """
+        Take one token from the bucket ``key``, creating it full if unknown.
+
+        Args:
+            key: Bucket key
+            capacity: Bucket size (the allowed burst)
+            refill_per_second: Tokens added back per second
+
+        Returns:
+            Tuple of (allowed, seconds until a token is available when refused)
+        """
+
+class MemoryTokenBucketStore(TokenBucketStore):
+    """
+    In-process token buckets: ``key -> (tokens, updated_at, expires_at)`` in
+    an ordered dict kept in last-use order.
+
+    A bucket left alone long enough to refill completely is identical to a
+    new one, so it is dropped (TTL = ``capacity / refill_per_second``).
+    Expired buckets are evicted from the old end on every call, and past
+    ``max_keys`` the least recently used bucket goes regardless, so memory
+    stays bounded even when attempts come from many addresses.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: 'OrderedDict[str, Tuple[float, float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: float, refill_per_second: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+
+            bucket = self._buckets.pop(key, None)
+            if bucket is None:
+                tokens = capacity
+            else:
+                tokens, updated_at, _ = bucket
+                tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            expires_at = now + (capacity - tokens) / refill_per_second
+            self._buckets[key] = (tokens, now, expires_at)
+
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        if allowed:
+            return True, 0.0
+        return False, (1 - tokens) / refill_per_second
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        while buckets:
+            key, (_, _, expires_at) = next(iter(buckets.items()))
+            if expires_at > now:
+                break
+            del buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+class LoginThrottle:
+    """
+    Per-IP and per-email token buckets checked before any login work.
+
+    Each attempt takes a token from the client IP's bucket and then from the
+    email's bucket; an empty bucket refuses the attempt in microseconds,
+    before the user lookup and the password hash.
+
+    Bursts must be at least 1 and rates positive: a bucket that never refills
+    would lock an address or account out for good.
+    """
+
+    def __init__(self, store: TokenBucketStore, ip_burst: int, ip_per_minute: float,
+                 email_burst: int, email_per_minute: float):
+        if not isinstance(store, TokenBucketStore):
+            raise TypeError(f'LOGIN_THROTTLE_STORE must be a TokenBucketStore subclass, got {type(store).__name__}')
+        if ip_burst < 1 or email_burst < 1:
+            raise ValueError('LOGIN_THROTTLE_IP_BURST and LOGIN_THROTTLE_EMAIL_BURST must be at least 1')
+        if ip_per_minute <= 0 or email_per_minute <= 0:
+            raise ValueError('LOGIN_THROTTLE_IP_PER_MINUTE and LOGIN_THROTTLE_EMAIL_PER_MINUTE must be greater than 0')
+        self.store = store
+        self.ip_limit = (ip_burst, ip_per_minute / 60.0)
+        self.email_limit = (email_burst, email_per_minute / 60.0)
+
+    def check(self, client_ip: Optional[str], email: Optional[str]) -> Optional[int]:
+        """
+        Record a login attempt.
+
+        Args:
+            client_ip: Remote address of the request, if known
+            email: Email being logged into, if known
+
+        Returns:
+            None when the attempt may proceed, otherwise whole seconds to wait
+        """
+        if client_ip:
+            allowed, wait = self.store.consume(f'login:ip:{client_ip}', *self.ip_limit)
+            if not allowed:
+                throttled.inc()
+                return max(1, math.ceil(wait))
+        if email:
+            allowed, wait = self.store.consume(f'login:email:{email.strip().lower()}', *self.email_limit)
+            if not allowed:
+                throttled.inc()
+                return max(1, math.ceil(wait))
+        return None
+
+_throttle: Optional[LoginThrottle] = None
+_throttle_lock = threading.Lock()
+
+def get_login_throttle() -> Optional[LoginThrottle]:
+    """
+    Return the process-wide login throttle, creating it on first use from the
+    current app's config; None when ``LOGIN_THROTTLE_ENABLED`` is off.
+    """
+    global _throttle
+    settings = current_app.config if has_app_context() else {}
+    if not settings.get('LOGIN_THROTTLE_ENABLED', Config.LOGIN_THROTTLE_ENABLED):
+        return None
+    if _throttle is None:
+        with _throttle_lock:
+            if _throttle is None:
+                store_path = settings.get('LOGIN_THROTTLE_STORE', Config.LOGIN_THROTTLE_STORE)
+                store = import_string(store_path)() if store_path else MemoryTokenBucketStore(
+                    settings.get('LOGIN_THROTTLE_MAX_KEYS', Config.LOGIN_THROTTLE_MAX_KEYS)
+                )
+                _throttle = LoginThrottle(
+                    store,
+                    ip_burst=settings.get('LOGIN_THROTTLE_IP_BURST', Config.LOGIN_THROTTLE_IP_BURST),
+                    ip_per_minute=settings.get('LOGIN_THROTTLE_IP_PER_MINUTE', Config.LOGIN_THROTTLE_IP_PER_MINUTE),
+                    email_burst=settings.get('LOGIN_THROTTLE_EMAIL_BURST', Config.LOGIN_THROTTLE_EMAIL_BURST),
+                    email_per_minute=settings.get('LOGIN_THROTTLE_EMAIL_PER_MINUTE', Config.LOGIN_THROTTLE_EMAIL_PER_MINUTE)
+                )
+    return _throttle
+
+def reset_login_throttle() -> None:
+    """Drop the process-wide throttle (and its buckets) so the next call builds a fresh one."""
+    global _throttle
+    with _throttle_lock:
+        _throttle = None
@@ -0,0 +1,141 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, Sequence, Tuple
+
+# Upper bounds (seconds) of the default histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Counter:
+    """Monotonically increasing, thread-safe count."""
+
+    def __init__(self, description: str = ''):
+        self.description = description
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def snapshot(self) -> dict:
+        return {'type': 'counter', 'description': self.description, 'value': self._value}
+
+class Gauge:
+    """Thread-safe value that goes up and down (e.g. work currently queued)."""
+
+    def __init__(self, description: str = ''):
+        self.description = description
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: int) -> None:
+        with self._lock:
+            self._value = value
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def snapshot(self) -> dict:
+        return {'type': 'gauge', 'description': self.description, 'value': self._value}
+
+class Histogram:
+    """
+    Thread-safe histogram of observed durations (seconds) with fixed,
+    cumulative buckets, in the style of a Prometheus histogram.
+    """
+
+    def __init__(self, description: str = '', buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.description = description
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+            if value > self._max:
+                self._max = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, count, maximum = self._sum, self._count, self._max
+
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        buckets['+Inf'] = count
+
+        return {
+            'type': 'histogram',
+            'description': self.description,
+            'count': count,
+            'sum': round(total, 6),
+            'mean': round(total / count, 6) if count else 0.0,
+            'max': round(maximum, 6),
+            'buckets': buckets
+        }
+
+class MetricsRegistry:
+    """
+    Process-wide collection of named metrics.
+
+    Metrics are created on first use, so modules register what they record
+    without any setup step; asking for an existing name returns the same
+    metric.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name: str, kind: type, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = kind(**kwargs)
+        if not isinstance(metric, kind):
+            raise TypeError(f"Metric '{name}' is a {type(metric).__name__}, not a {kind.__name__}")
+        return metric
+
+    def counter(self, name: str, description: str = '') -> Counter:
+        return self._get_or_create(name, Counter, description=description)
+
+    def gauge(self, name: str, description: str = '') -> Gauge:
+        return self._get_or_create(name, Gauge, description=description)
+
+    def histogram(self, name: str, description: str = '',
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(name, Histogram, description=description, buckets=buckets)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Current value of every metric, keyed by name."""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return {name: metric.snapshot() for name, metric in metrics}
+
+# Shared registry for the whole process (each worker process has its own)
+metrics = MetricsRegistry()
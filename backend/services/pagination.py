@@ -0,0 +1,112 @@
+import base64
+import binascii
+from bisect import bisect_right
+from typing import Mapping, Optional, Sequence, Tuple
+
+class InvalidPageRequest(ValueError):
+    """Raised when pagination query parameters cannot be parsed."""
+
+def encode_cursor(last_id: str) -> str:
+    """Encode the last exercise id of a page as an opaque, URL-safe cursor."""
+    return base64.urlsafe_b64encode(last_id.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Opaque cursor string from a previous response
+
+    Returns:
+        The exercise id the next page starts after
+
+    Raises:
+        InvalidPageRequest: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidPageRequest('Invalid cursor')
+
+def parse_page_args(args: Mapping[str, str], max_limit: int) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Parse ``limit`` and ``cursor`` query parameters.
+
+    A missing ``limit`` means the caller wants the unpaged response. Limits
+    above ``max_limit`` are clamped rather than rejected.
+
+    Args:
+        args: Query parameters (e.g. ``request.args``)
+        max_limit: Largest page size served
+
+    Returns:
+        Tuple of (limit or None, id to start after or None)
+
+    Raises:
+        InvalidPageRequest: If either parameter is malformed
+    """
+    raw_limit = args.get('limit')
+    raw_cursor = args.get('cursor')
+
+    if raw_limit is None:
+        if raw_cursor is not None:
+            raise InvalidPageRequest('cursor requires limit')
+        return None, None
+
+    try:
+        limit = int(raw_limit)
+    except ValueError:
+        raise InvalidPageRequest('limit must be an integer')
+    if limit < 1:
+        raise InvalidPageRequest('limit must be at least 1')
+
+    after_id = decode_cursor(raw_cursor) if raw_cursor else None
+    return min(limit, max_limit), after_id
+
+def keyset_page(sorted_ids: Sequence[str], limit: int,
+                after_id: Optional[str] = None) -> Tuple[Sequence[str], Optional[str]]:
+    """
+    Slice one page out of an already sorted sequence of ids.
+
+    Args:
+        sorted_ids: Ids in ascending order
+        limit: Page size
+        after_id: Id the page starts after (exclusive)
+
+    Returns:
+        Tuple of (page ids, next cursor or None on the last page)
+    """
+    start = bisect_right(sorted_ids, after_id) if after_id is not None else 0
+    page = sorted_ids[start:start + limit]
+    has_more = start + limit < len(sorted_ids)
+    return page, (encode_cursor(page[-1]) if has_more and page else None)
+
+def parse_offset_args(args: Mapping[str, str], default_limit: int, max_limit: int) -> Tuple[int, int]:
+    """
+    Parse ``limit`` and ``offset`` query parameters for ranked results.
+
+    Ranked results (e.g. search) have no stable key to page on, so they are
+    paged by offset instead of by cursor.
+
+    Args:
+        args: Query parameters (e.g. ``request.args``)
+        default_limit: Page size when ``limit`` is missing
+        max_limit: Largest page size served
+
+    Returns:
+        Tuple of (limit, offset)
+
+    Raises:
+        InvalidPageRequest: If either parameter is malformed
+    """
+    try:
+        limit = int(args.get('limit', default_limit))
+        offset = int(args.get('offset', 0))
+    except ValueError:
+        raise InvalidPageRequest('limit and offset must be integers')
+    if limit < 1:
+        raise InvalidPageRequest('limit must be at least 1')
+    if offset < 0:
+        raise InvalidPageRequest('offset must not be negative')
+    return min(limit, max_limit), offset
@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from flask import current_app, has_app_context
+from config import Config
+from services.metrics import metrics
+
+# Password operations recorded separately in the metrics
+PASSWORD_OPERATIONS = ('hash', 'verify')
+
+queue_depth = metrics.gauge('password_queue_depth', 'Password operations waiting for a hashing thread')
+queue_wait = metrics.histogram('password_queue_wait_seconds', 'Time password operations wait for a hashing thread')
+rejected = metrics.counter('password_rejected_total', 'Password operations refused because the queue was full')
+operation_time = {
+    operation: metrics.histogram(f'password_{operation}_seconds', f'Time spent in password {operation}')
+    for operation in PASSWORD_OPERATIONS
+}
+
+class PasswordExecutorBusy(Exception):
+    """Raised when the password executor's queue is full; retry after ``retry_after`` seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__('Password hashing capacity exhausted')
+        self.retry_after = retry_after
+
+class PasswordExecutor:
+    """
+    Size-bounded thread pool for password hashing work, with admission control.
+
+    bcrypt and argon2 release the GIL, so hashing on a few dedicated threads
+    keeps request threads free for everything else. At most ``workers``
+    operations run at once and at most ``max_queue`` more wait; past that,
+    ``run`` fails immediately with ``PasswordExecutorBusy`` instead of letting a burst
+    of logins pile up behind each other.
+
+    With ``workers=0`` operations run inline on the calling thread (no
+    admission control), which is what the test configuration uses.
+    """
+
+    def __init__(self, workers: int, max_queue: int, retry_after: int = 1):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password') if workers else None
+        self._slots = threading.BoundedSemaphore(workers + max_queue) if workers else None
+
+    def run(self, operation: str, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``function(*args)`` on a hashing thread and wait for its result.
+
+        Args:
+            operation: 'hash' or 'verify' (selects the timing metric)
+            function: The hashing call to make
+            *args: Its arguments
+
+        Returns:
+            Whatever ``function`` returns
+
+        Raises:
+            PasswordExecutorBusy: If every thread is busy and the queue is full
+        """
+        if self._pool is None:
+            return self._timed(operation, function, args)
+
+        if not self._slots.acquire(blocking=False):
+            rejected.inc()
+            raise PasswordExecutorBusy(self.retry_after)
+
+        submitted = time.perf_counter()
+        queue_depth.inc()
+
+        def task():
+            queue_depth.dec()
+            queue_wait.observe(time.perf_counter() - submitted)
+            return self._timed(operation, function, args)
+
+        try:
+            future = self._pool.submit(task)
+        except BaseException:
+            queue_depth.dec()
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    @staticmethod
+    def _timed(operation: str, function: Callable[..., Any], args: tuple) -> Any:
+        started = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            operation_time[operation].observe(time.perf_counter() - started)
+
+    def shutdown(self) -> None:
+        """Stop the hashing threads once queued work has finished."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+_executor: Optional[PasswordExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_password_executor() -> PasswordExecutor:
+    """
+    Return the process-wide password executor, creating it on first use from
+    the current app's config (or the defaults outside an app context).
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                settings = current_app.config if has_app_context() else {}
+                _executor = PasswordExecutor(
+                    workers=settings.get('PASSWORD_HASH_WORKERS', Config.PASSWORD_HASH_WORKERS),
+                    max_queue=settings.get('PASSWORD_HASH_MAX_QUEUE', Config.PASSWORD_HASH_MAX_QUEUE),
+                    retry_after=settings.get('PASSWORD_HASH_RETRY_AFTER', Config.PASSWORD_HASH_RETRY_AFTER)
+                )
+    return _executor
+
+def reset_password_executor() -> None:
+    """
+    Drop the process-wide executor so the next call builds a fresh one.
+
+    Threads do not survive ``fork``, so a process forked from one that
+    already used the executor must call this before hashing.
+    """
+    global _executor
+    with _executor_lock:
+        _executor = None
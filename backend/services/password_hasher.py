@@ -0,0 +1,99 @@
+from functools import lru_cache
+from typing import Mapping, Optional
+import bcrypt
+from flask import current_app, has_app_context
+from config import Config
+
+try:
+    import argon2
+except ImportError:  # argon2-cffi is optional; bcrypt is always available
+    argon2 = None
+
+# Supported password hashing schemes
+PASSWORD_HASH_SCHEMES = ('bcrypt', 'argon2')
+
+# Hash prefixes written by each scheme
+BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+ARGON2_PREFIX = '$argon2'
+
+class PasswordHasher:
+    """
+    Hashes new passwords with the configured scheme and cost, and verifies
+    hashes made with any supported scheme or cost.
+
+    ``needs_rehash`` reports whether a stored hash was made with different
+    parameters than the current target, so hashes migrate to the configured
+    cost (or from bcrypt to argon2) as users log in.
+    """
+
+    def __init__(self, scheme: str = 'bcrypt', bcrypt_rounds: int = 12, argon2_time_cost: int = 3,
+                 argon2_memory_cost: int = 65536, argon2_parallelism: int = 4):
+        if scheme not in PASSWORD_HASH_SCHEMES:
+            raise ValueError(f"Unknown password hash scheme '{scheme}'; expected one of {', '.join(PASSWORD_HASH_SCHEMES)}")
+        if scheme == 'argon2' and argon2 is None:
+            raise ValueError("PASSWORD_HASH_SCHEME is 'argon2' but argon2-cffi is not installed")
+        if not 4 <= bcrypt_rounds <= 31:
+            raise ValueError('BCRYPT_ROUNDS must be between 4 and 31')
+
+        self.scheme = scheme
+        self.bcrypt_rounds = bcrypt_rounds
+        self._argon2 = argon2.PasswordHasher(
+            time_cost=argon2_time_cost, memory_cost=argon2_memory_cost, parallelism=argon2_parallelism
+        ) if argon2 is not None else None
+
+    def hash(self, password: str) -> str:
+        """Hash ``password`` with the target scheme and parameters."""
+        if self.scheme == 'argon2':
+            return self._argon2.hash(password)
+        salt = bcrypt.gensalt(rounds=self.bcrypt_rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """Check ``password`` against a hash made by any supported scheme."""
+        if password_hash.startswith(ARGON2_PREFIX):
+            if self._argon2 is None:
+                raise ValueError('Stored password hash is argon2 but argon2-cffi is not installed')
+            try:
+                return self._argon2.verify(password_hash, password)
+            except (argon2.exceptions.VerificationError, argon2.exceptions.InvalidHash):
+                return False
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True when ``password_hash`` was not made with the target scheme and parameters."""
+        if self.scheme == 'argon2':
+            if not password_hash.startswith(ARGON2_PREFIX):
+                return True
+            try:
+                return self._argon2.check_needs_rehash(password_hash)
+            except argon2.exceptions.InvalidHash:
+                return True
+        return bcrypt_rounds(password_hash) != self.bcrypt_rounds
+
+def bcrypt_rounds(password_hash: str) -> Optional[int]:
+    """Cost factor of a bcrypt hash (``$2b$12$...`` -> 12), or None for other hashes."""
+    if not password_hash.startswith(BCRYPT_PREFIXES):
+        return None
+    try:
+        return int(password_hash[4:6])
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=8)
+def _hasher(scheme: str, bcrypt_rounds: int, argon2_time_cost: int, argon2_memory_cost: int,
+            argon2_parallelism: int) -> PasswordHasher:
+    return PasswordHasher(scheme, bcrypt_rounds, argon2_time_cost, argon2_memory_cost, argon2_parallelism)
+
+def password_hasher_from_config(settings: Mapping) -> PasswordHasher:
+    """Password hasher for the ``PASSWORD_HASH_SCHEME``/``BCRYPT_*``/``ARGON2_*`` settings."""
+    return _hasher(
+        settings.get('PASSWORD_HASH_SCHEME', Config.PASSWORD_HASH_SCHEME),
+        settings.get('BCRYPT_ROUNDS', Config.BCRYPT_ROUNDS),
+        settings.get('ARGON2_TIME_COST', Config.ARGON2_TIME_COST),
+        settings.get('ARGON2_MEMORY_COST', Config.ARGON2_MEMORY_COST),
+        settings.get('ARGON2_PARALLELISM', Config.ARGON2_PARALLELISM)
+    )
+
+def get_password_hasher() -> PasswordHasher:
+    """Password hasher configured by the current app (or the defaults outside an app context)."""
+    return password_hasher_from_config(current_app.config if has_app_context() else {})
@@ -0,0 +1,278 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from flask import current_app
+from marshmallow import ValidationError
+from schemas.plan_schema import PlanRequestSchema
+from services.exercise_catalog import CatalogSnapshot, ExerciseCatalog, catalog_disabled_error
+from services.exercise_similarity import normalize_equipment
+
+# Time and volume assumed for one exercise (sets, reps and rest included)
+MINUTES_PER_EXERCISE = 8
+SETS_PER_EXERCISE = 3
+
+# Equipment that is always available, whatever the user listed
+BODYWEIGHT_EQUIPMENT = frozenset(('body only',))
+
+# Scoring: coverage from secondary muscles counts half
+SECONDARY_COVERAGE_WEIGHT = 0.5
+# Muscles trained as primary less than this many days ago are still recovering
+RECOVERY_DAYS = 2
+RECOVERY_PENALTY = 1.5
+# Repeating a muscle within one session is worth less than in another session
+SESSION_REPEAT_WEIGHT = 2.0
+# Primary muscles outside the targets dilute the session
+OFF_TARGET_PENALTY = 0.1
+# Prefer the equipment the user listed over bodyweight fallbacks
+EQUIPMENT_FIT_BONUS = 0.1
+
+# Exercise fields copied into plans
+PLAN_EXERCISE_FIELDS = ('id', 'name', 'equipment', 'primary_muscles', 'secondary_muscles')
+
+class InvalidPlanRequest(ValueError):
+    """Raised when a plan request cannot be satisfied by the catalog."""
+
+class PlanIndex:
+    """
+    Muscle and equipment matrices over the exercise catalog for plan generation.
+
+    ``primary`` and ``secondary`` are exercise x muscle 0/1 matrices (a muscle
+    listed as both counts as primary only), so every candidate of a plan is
+    scored with matrix-vector products instead of per-exercise Python loops.
+    """
+
+    def __init__(self, exercises: Sequence[dict]):
+        self.exercises = [{field: exercise.get(field) for field in PLAN_EXERCISE_FIELDS} for exercise in exercises]
+        size = len(self.exercises)
+
+        primary = [{muscle.lower() for muscle in exercise['primary_muscles'] or []} for exercise in self.exercises]
+        secondary = [{muscle.lower() for muscle in exercise['secondary_muscles'] or []} for exercise in self.exercises]
+        equipment = [normalize_equipment(exercise['equipment']) for exercise in self.exercises]
+
+        self.muscles = sorted(set().union(*primary, *secondary))
+        self._muscle_columns = {muscle: column for column, muscle in enumerate(self.muscles)}
+        self.equipment_types = sorted({name for name in equipment if name is not None})
+        self._equipment_codes = {name: code for code, name in enumerate(self.equipment_types)}
+
+        self.primary = np.zeros((size, len(self.muscles)), dtype=np.float32)
+        self.secondary = np.zeros((size, len(self.muscles)), dtype=np.float32)
+        # Exercise position -> equipment code, -1 when the exercise has none
+        self.equipment = np.full(size, -1, dtype=np.int32)
+        for position in range(size):
+            self.primary[position, [self._muscle_columns[m] for m in primary[position]]] = 1.0
+            self.secondary[position, [self._muscle_columns[m] for m in secondary[position] - primary[position]]] = 1.0
+            if equipment[position] is not None:
+                self.equipment[position] = self._equipment_codes[equipment[position]]
+
+    @classmethod
+    def for_snapshot(cls, snapshot: CatalogSnapshot) -> 'PlanIndex':
+        """Return the plan index of ``snapshot``, building it on first use."""
+        return snapshot.derived(
+            'plan_index', lambda s: cls([s.exercises[exercise_id] for exercise_id in s.ids])
+        )
+
+    def _equipment_fit(self, equipment: Optional[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Mask of usable exercises and the fit bonus of each exercise."""
+        bonus = np.zeros(len(self.exercises), dtype=np.float32)
+        if equipment is None:
+            return np.ones(len(self.exercises), dtype=bool), bonus
+
+        requested = {name for name in map(normalize_equipment, equipment) if name}
+        requested_codes = [self._equipment_codes[name] for name in requested if name in self._equipment_codes]
+        always_codes = [self._equipment_codes[name] for name in BODYWEIGHT_EQUIPMENT if name in self._equipment_codes]
+
+        requested_mask = np.isin(self.equipment, requested_codes)
+        bonus[requested_mask] = EQUIPMENT_FIT_BONUS
+        usable = requested_mask | np.isin(self.equipment, always_codes) | (self.equipment == -1)
+        return usable, bonus
+
+    def generate(self, target_muscles: List[str], equipment: Optional[List[str]] = None,
+                 sessions_per_week: int = 3, session_minutes: int = 60) -> Dict:
+        """
+        Build a weekly plan by greedy, vectorised selection.
+
+        Each slot takes the exercise with the best score, where the score of
+        every candidate is computed at once from: coverage of target muscles
+        that are still under-trained this week, a penalty for muscles trained
+        less than ``RECOVERY_DAYS`` ago, and equipment fit.
+
+        Args:
+            target_muscles: Muscles the plan should train
+            equipment: Available equipment; any equipment when None
+            sessions_per_week: Number of sessions, spread over the week
+            session_minutes: Time budget of one session
+
+        Returns:
+            Plan dict
+
+        Raises:
+            InvalidPlanRequest: If a target muscle is not in the catalog
+        """
+        targets = list(dict.fromkeys(muscle.strip().lower() for muscle in target_muscles))
+        unknown = [muscle for muscle in targets if muscle not in self._muscle_columns]
+        if unknown:
+            raise InvalidPlanRequest(f"Unknown muscle(s): {', '.join(unknown)}")
+
+        target = np.zeros(len(self.muscles), dtype=np.float32)
+        target[[self._muscle_columns[muscle] for muscle in targets]] = 1.0
+
+        usable, fit_bonus = self._equipment_fit(equipment)
+        # Only exercises that hit a target muscle as primary are worth a slot
+        candidates = np.flatnonzero(usable & (self.primary @ target > 0))
+        primary = self.primary[candidates]
+        # Coverage contributed by each candidate; column-major so that a few
+        # columns can be read cheaply for the incremental updates below
+        contribution = np.asfortranarray(primary + SECONDARY_COVERAGE_WEIGHT * self.secondary[candidates])
+        base_score = fit_bonus[candidates] - OFF_TARGET_PENALTY * (primary @ (1.0 - target))
+
+        slots = max(1, session_minutes // MINUTES_PER_EXERCISE)
+        days = [round(index * 7 / sessions_per_week) for index in range(sessions_per_week)]
+        coverage = np.zeros(len(self.muscles), dtype=np.float32)
+        last_trained = np.full(len(self.muscles), -np.inf, dtype=np.float32)
+        available = np.ones(len(candidates), dtype=bool)
+
+        sessions = []
+        for day in days:
+            recovering = ((day - last_trained) < RECOVERY_DAYS).astype(np.float32)
+            session_hits = np.zeros(len(self.muscles), dtype=np.float32)
+            need = target / (1.0 + coverage)
+            scores = contribution @ need + base_score - RECOVERY_PENALTY * (primary @ recovering)
+            scores[~available] = -np.inf
+            chosen = []
+
+            for _ in range(slots):
+                best = int(np.argmax(scores)) if len(scores) else -1
+                if best < 0 or scores[best] == -np.inf:
+                    break
+                chosen.append(best)
+                available[best] = False
+                coverage += contribution[best]
+                session_hits += primary[best]
+
+                # Only the chosen exercise's muscles changed need: update those columns
+                new_need = target / (1.0 + coverage + SESSION_REPEAT_WEIGHT * session_hits)
+                changed = np.flatnonzero(new_need != need)
+                scores += contribution[:, changed] @ (new_need[changed] - need[changed])
+                scores[best] = -np.inf
+                need = new_need
+
+            trained = session_hits > 0
+            last_trained[trained] = day
+            sessions.append({
+                'day': day + 1,
+                'minutes': len(chosen) * MINUTES_PER_EXERCISE,
+                'muscles': [muscle for muscle, hit in zip(self.muscles, trained) if hit],
+                'exercises': [
+                    dict(self.exercises[candidates[position]], sets=SETS_PER_EXERCISE, minutes=MINUTES_PER_EXERCISE)
+                    for position in chosen
+                ]
+            })
+
+        return {
+            'target_muscles': targets,
+            'equipment': equipment,
+            'sessions_per_week': sessions_per_week,
+            'session_minutes': session_minutes,
+            'sessions': sessions,
+            'coverage': {muscle: round(float(coverage[self._muscle_columns[muscle]]), 2) for muscle in targets}
+        }
+
+# Plan index of a bulk-generation worker process, set by _init_worker
+_worker_index: Optional[PlanIndex] = None
+
+def _init_worker(exercises: List[dict]) -> None:
+    global _worker_index
+    _worker_index = PlanIndex(exercises)
+
+def _generate_in_worker(plan_params: dict) -> Dict:
+    try:
+        return {'plan': _worker_index.generate(**plan_params)}
+    except InvalidPlanRequest as e:
+        return {'error': 'Invalid plan request', 'message': str(e)}
+
+class PlanService:
+    """Service class for workout plan generation."""
+
+    @staticmethod
+    def generate_plan(plan_data: dict) -> Tuple[dict, int]:
+        """
+        Generate a weekly workout plan from the exercise catalog.
+
+        Args:
+            plan_data: Dictionary with target_muscles, equipment,
+                sessions_per_week and session_minutes
+
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            error = catalog_disabled_error()
+            if error is not None:
+                return error
+
+            validated_data = PlanRequestSchema().load(plan_data)
+
+            index = PlanIndex.for_snapshot(ExerciseCatalog.get())
+            plan = index.generate(**validated_data)
+
+            return {
+                'message': 'Plan generated successfully',
+                'plan': plan
+            }, 200
+
+        except ValidationError as e:
+            return {'error': 'Validation error', 'details': e.messages}, 400
+        except InvalidPlanRequest as e:
+            return {'error': 'Invalid plan request', 'message': str(e)}, 400
+        except Exception as e:
+            current_app.logger.error(f"Plan generation error: {str(e)}")
+            return {'error': 'Internal server error'}, 500
+
+    @staticmethod
+    def generate_plans_bulk(plan_requests: List[dict], workers: Optional[int] = None) -> List[Dict]:
+        """
+        Generate many plans at once, e.g. to regenerate every user's plan overnight.
+
+        Plans are generated in a process pool; each worker builds its own plan
+        index once from the current catalog snapshot. Workers are spawned, not
+        forked, since forking a process with threads (a gthread server worker,
+        the password executor) can deadlock the child. Must be called inside an
+        application context; used by ``flask plans regenerate``.
+
+        Args:
+            plan_requests: Plan request dicts (same shape as ``generate_plan``)
+            workers: Number of worker processes; defaults to the CPU count
+
+        Returns:
+            One dict per request, in order: ``{'plan': ...}`` or an error dict
+        """
+        schema = PlanRequestSchema()
+        results: List[Optional[Dict]] = [None] * len(plan_requests)
+        valid = []
+        for position, plan_data in enumerate(plan_requests):
+            try:
+                valid.append((position, schema.load(plan_data)))
+            except ValidationError as e:
+                results[position] = {'error': 'Validation error', 'details': e.messages}
+
+        snapshot = ExerciseCatalog.get()
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(valid) < 2:
+            index = PlanIndex.for_snapshot(snapshot)
+            for position, plan_params in valid:
+                try:
+                    results[position] = {'plan': index.generate(**plan_params)}
+                except InvalidPlanRequest as e:
+                    results[position] = {'error': 'Invalid plan request', 'message': str(e)}
+            return results
+
+        exercises = [snapshot.exercises[exercise_id] for exercise_id in snapshot.ids]
+        chunksize = max(1, len(valid) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(exercises,)) as executor:
+            plans = executor.map(_generate_in_worker, [params for _, params in valid], chunksize=chunksize)
+            for (position, _), result in zip(valid, plans):
+                results[position] = result
+        return results
@@ -0,0 +1,44 @@
+from typing import Iterable, List, Optional, Tuple
+from models.exercise import EXERCISE_FIELDS
+
+class InvalidFieldsRequest(ValueError):
+    """Raised when the ``fields`` query parameter names unknown fields."""
+
+def parse_fields(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a sparse fieldset such as ``fields=id,name,primary_muscles``.
+
+    ``id`` is always included so clients can page and look exercises up.
+    Fields come back in serialization order regardless of how they were listed.
+
+    Args:
+        raw: Comma-separated field names, or None
+
+    Returns:
+        Tuple of field names, or None when every field is wanted
+
+    Raises:
+        InvalidFieldsRequest: If a field name is unknown
+    """
+    if raw is None or not raw.strip():
+        return None
+
+    requested = {name.strip() for name in raw.split(',') if name.strip()}
+    unknown = requested.difference(EXERCISE_FIELDS)
+    if unknown:
+        raise InvalidFieldsRequest(f"Unknown field(s): {', '.join(sorted(unknown))}")
+
+    requested.add('id')
+    return tuple(name for name in EXERCISE_FIELDS if name in requested)
+
+def with_field(fields: Optional[Tuple[str, ...]], name: str) -> Optional[Tuple[str, ...]]:
+    """Return ``fields`` extended with ``name`` (None stays None: all fields)."""
+    if fields is None or name in fields:
+        return fields
+    return tuple(field for field in EXERCISE_FIELDS if field in fields or field == name)
+
+def project(exercises: Iterable[dict], fields: Optional[Tuple[str, ...]]) -> List[dict]:
+    """Restrict exercise dicts to ``fields``; returns them unchanged when fields is None."""
+    if fields is None:
+        return exercises if isinstance(exercises, list) else list(exercises)
+    return [{field: exercise[field] for field in fields} for exercise in exercises]
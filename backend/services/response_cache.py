@@ -0,0 +1,188 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Optional, Tuple
+from urllib.parse import urlencode
+from flask import Response, current_app, request
+from sqlalchemy.exc import SQLAlchemyError
+from models.exercise import CatalogVersion, db
+from services.exercise_catalog import ExerciseCatalog
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+class CachedResponse:
+    """Encoded body of a 200 response plus its precompressed variants."""
+
+    __slots__ = ('body', 'gzip_body', 'br_body', 'etag', 'mimetype', 'size')
+
+    def __init__(self, body: bytes, mimetype: str):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+
+        compress = len(body) >= MIN_COMPRESS_SIZE
+        self.gzip_body = gzip.compress(body, compresslevel=6) if compress else None
+        self.br_body = brotli.compress(body) if compress and brotli is not None else None
+        self.size = len(body) + len(self.gzip_body or b'') + len(self.br_body or b'')
+
+    def variant(self, accept_encodings) -> Tuple[bytes, Optional[str], str]:
+        """
+        Pick the best representation for the request's Accept-Encoding.
+
+        Returns:
+            Tuple of (body, content encoding or None, etag)
+        """
+        if self.br_body is not None and accept_encodings['br']:
+            return self.br_body, 'br', f'{self.etag}-br'
+        if self.gzip_body is not None and accept_encodings['gzip']:
+            return self.gzip_body, 'gzip', f'{self.etag}-gz'
+        return self.body, None, self.etag
+
+class ResponseCache:
+    """
+    LRU of encoded responses keyed by (catalog version, request key), bounded
+    by the total size of the stored bodies (all encodings).
+
+    Entries are only ever valid for the catalog version they were built at;
+    as soon as a newer version is seen, everything older is dropped.
+    """
+
+    def __init__(self):
+        self._entries: 'OrderedDict[Tuple[int, str], CachedResponse]' = OrderedDict()
+        self._version = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, version: int, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get((version, key))
+            if entry is not None:
+                self._entries.move_to_end((version, key))
+            return entry
+
+    def put(self, version: int, key: str, entry: CachedResponse, max_bytes: int) -> None:
+        if entry.size > max_bytes:
+            return
+        with self._lock:
+            if self._version is None or version > self._version:
+                self._entries.clear()
+                self._size = 0
+                self._version = version
+            elif version < self._version:
+                return
+            previous = self._entries.pop((version, key), None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[(version, key)] = entry
+            self._size += entry.size
+            while self._size > max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._version = None
+
+    @property
+    def size(self) -> int:
+        """Bytes held by the cached bodies."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+response_cache = ResponseCache()
+
+def _catalog_version() -> Optional[int]:
+    """
+    Current catalog version, from the snapshot when it is enabled; None when
+    it cannot be read, in which case the response is not cached.
+    """
+    try:
+        if current_app.config.get('EXERCISE_CATALOG_ENABLED', True):
+            return ExerciseCatalog.get().version
+        return CatalogVersion.current()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.warning(f"Could not read exercise catalog version, skipping response cache: {str(e)}")
+        return None
+
+def _request_key(params: Tuple[str, ...]) -> Optional[str]:
+    """
+    Path plus the query string in a canonical (sorted) order, or None when
+    the query string has parameters outside ``params``.
+    """
+    args = sorted(request.args.items(multi=True))
+    if any(name not in params for name, _ in args):
+        return None
+    return f'{request.path}?{urlencode(args)}' if args else request.path
+
+def _build_response(entry: CachedResponse) -> Response:
+    body, encoding, etag = entry.variant(request.accept_encodings)
+
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype=entry.mimetype)
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.private = True
+    response.cache_control.max_age = current_app.config.get('EXERCISE_RESPONSE_MAX_AGE', 60)
+    return response
+
+def cached_catalog_response(*params: str) -> Callable[[Callable], Callable]:
+    """
+    Serve a catalog view from the response cache, with ETag/304 support.
+
+    The view only runs on a cache miss. Its response is cached when it is a
+    complete (non-streamed) 200; anything else is returned as-is. Revalidation
+    requests for a cached entry are answered with 304 without calling the view.
+
+    Args:
+        params: Query parameters the view reads. Requests with any other
+            parameter bypass the cache, so junk parameters cannot fill it
+            with copies of the same response.
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get('EXERCISE_RESPONSE_CACHE_ENABLED', True):
+                return view(*args, **kwargs)
+
+            key = _request_key(params)
+            if key is None:
+                return view(*args, **kwargs)
+            version = _catalog_version()
+            if version is None:
+                return view(*args, **kwargs)
+
+            entry = response_cache.get(version, key)
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+
+                entry = CachedResponse(response.get_data(), response.mimetype)
+                response_cache.put(
+                    version, key, entry,
+                    current_app.config.get('EXERCISE_RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+                )
+
+            return _build_response(entry)
+
+        return wrapper
+
+    return decorator
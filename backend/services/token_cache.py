@@ -0,0 +1,101 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from flask import Flask
+from flask_jwt_extended import JWTManager
+from services.metrics import metrics
+
+hits = metrics.counter('jwt_decode_cache_hits_total', 'Bearer tokens whose verified claims came from the decode cache')
+misses = metrics.counter('jwt_decode_cache_misses_total', 'Bearer tokens decoded and verified in full')
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of verified JWT claims, keyed by the SHA-256 digest of
+    the raw token.
+
+    An entry lives until the token's ``exp`` (or ``ttl`` seconds, whichever
+    comes first), so an expired token is never served from the cache; it is
+    decoded again and rejected as usual.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[bytes, Tuple[float, dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(encoded_token: str) -> bytes:
+        return hashlib.sha256(encoded_token.encode('utf-8')).digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, claims = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    return claims
+                del self._entries[key]
+        return None
+
+    def put(self, key: bytes, claims: dict) -> None:
+        now = time.time()
+        expires_at = now + self.ttl
+        if isinstance(claims.get('exp'), (int, float)):
+            expires_at = min(expires_at, claims['exp'])
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class CachingJWTManager(JWTManager):
+    """
+    ``JWTManager`` that remembers the verified claims of recently seen
+    tokens, so a token sent again skips parsing and signature verification.
+
+    Only the decode step is cached: token type, blocklist (revocation) and
+    custom claim checks still run on every request. Tokens decoded with a
+    CSRF value or with ``allow_expired`` bypass the cache. Enabled with
+    ``JWT_DECODE_CACHE_ENABLED``; sized by ``JWT_DECODE_CACHE_MAX_ENTRIES``
+    and ``JWT_DECODE_CACHE_TTL``.
+    """
+
+    def __init__(self, app: Optional[Flask] = None, add_context_processor: bool = False):
+        self.token_cache: Optional[VerifiedTokenCache] = None
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app: Flask, add_context_processor: bool = False) -> None:
+        super().init_app(app, add_context_processor)
+        if app.config.get('JWT_DECODE_CACHE_ENABLED', True):
+            self.token_cache = VerifiedTokenCache(
+                max_entries=app.config.get('JWT_DECODE_CACHE_MAX_ENTRIES', 10000),
+                ttl=app.config.get('JWT_DECODE_CACHE_TTL', 300)
+            )
+
+    def _decode_jwt_from_config(self, encoded_token: str, csrf_value=None, allow_expired: bool = False) -> dict:
+        if self.token_cache is None or csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        key = self.token_cache.key(encoded_token)
+        claims = self.token_cache.get(key)
+        if claims is not None:
+            hits.inc()
+            return dict(claims)
+
+        misses.inc()
+        claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        self.token_cache.put(key, claims)
+        return dict(claims)
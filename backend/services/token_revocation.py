@@ -0,0 +1,233 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Set
+from flask import current_app
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from models.revoked_token import RevokedToken
+from models.user import db
+from services.metrics import metrics
+
+bloom_negatives = metrics.counter('revocation_bloom_negatives_total', 'Token checks cleared by the Bloom filter alone')
+bloom_positives = metrics.counter('revocation_bloom_positives_total', 'Token checks that hit the Bloom filter and went to the database')
+false_positives = metrics.counter('revocation_bloom_false_positives_total', 'Bloom hits for tokens that were not revoked')
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Sized for ``capacity`` items at a ``error_rate`` false-positive rate.
+    Probe positions come from one BLAKE2b digest by double hashing, so a
+    lookup is one hash plus ``hash_count`` bit tests; there are no false
+    negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        size = self.size
+        return ((first + i * second) % size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        for position in self._positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+class RevocationList:
+    """
+    Per-process mirror of the ``revoked_tokens`` denylist in a Bloom filter.
+
+    Checking a token that was never revoked (the common case) costs a few
+    hash probes and no query; only Bloom hits are confirmed against the
+    database. The filter is topped up with rows added since the last sync at
+    most every ``REVOCATION_SYNC_INTERVAL`` seconds (re-reading the last
+    ``REVOCATION_SYNC_MARGIN`` seconds of revocations, so rows that commit out
+    of id order are not missed), and rebuilt from the
+    unexpired rows every ``REVOCATION_REBUILD_INTERVAL`` seconds (or when it
+    outgrows its capacity). Revocations made in this process are added at
+    once; other processes see them within the sync interval.
+    """
+
+    _bloom: Optional[BloomFilter] = None
+    _last_id: int = 0
+    # Wall-clock (UTC) start of the last sync; the next one re-reads rows revoked since then
+    _synced_from: Optional[datetime] = None
+    _synced_at: float = 0.0
+    _built_at: float = 0.0
+    # jtis confirmed revoked by the database; revocation is permanent, so they never go stale
+    _confirmed: Set[str] = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_revoked(cls, jti: Optional[str]) -> bool:
+        """
+        Whether the token with this ``jti`` has been revoked.
+
+        Must be called inside an application context.
+        """
+        if not jti:
+            return False
+        bloom = cls._current_filter()
+        if jti not in bloom:
+            bloom_negatives.inc()
+            return False
+
+        bloom_positives.inc()
+        if jti in cls._confirmed:
+            return True
+        try:
+            revoked = db.session.query(RevokedToken.id).filter(RevokedToken.jti == jti).first() is not None
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            current_app.logger.warning(f"Could not confirm token revocation, rejecting token: {str(e)}")
+            return True
+
+        if revoked:
+            cls._remember(jti)
+        else:
+            false_positives.inc()
+        return revoked
+
+    @classmethod
+    def revoke(cls, jti: str, token_type: str, user_id: Optional[str] = None,
+               expires_at: Optional[datetime] = None) -> None:
+        """
+        Add a token to the denylist and commit.
+
+        Revoking an already revoked token is a no-op.
+        """
+        if db.session.query(RevokedToken.id).filter(RevokedToken.jti == jti).first() is None:
+            db.session.add(RevokedToken(jti=jti, token_type=token_type, user_id=user_id, expires_at=expires_at))
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # Revoked concurrently
+                db.session.rollback()
+
+        bloom = cls._current_filter()
+        with cls._lock:
+            bloom.add(jti)
+        cls._remember(jti)
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Force a full rebuild on the next check."""
+        cls._built_at = 0.0
+        cls._synced_at = 0.0
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop the filter; the next check rebuilds it from the database."""
+        with cls._lock:
+            cls._bloom = None
+            cls._last_id = 0
+            cls._synced_from = None
+            cls._synced_at = cls._built_at = 0.0
+            cls._confirmed = set()
+
+    @classmethod
+    def _remember(cls, jti: str) -> None:
+        confirmed = cls._confirmed
+        if len(confirmed) >= current_app.config.get('REVOCATION_BLOOM_CAPACITY', 100000):
+            confirmed = cls._confirmed = set()
+        confirmed.add(jti)
+
+    @classmethod
+    def _current_filter(cls) -> BloomFilter:
+        bloom = cls._bloom
+        config = current_app.config
+        now = time.monotonic()
+        if bloom is not None and now - cls._synced_at < config.get('REVOCATION_SYNC_INTERVAL', 5):
+            return bloom
+
+        # Another thread is already syncing: keep using the current filter
+        if bloom is not None and not cls._lock.acquire(blocking=False):
+            return bloom
+        if bloom is None:
+            cls._lock.acquire()
+
+        try:
+            bloom = cls._bloom
+            now = time.monotonic()
+            if bloom is not None and now - cls._synced_at < config.get('REVOCATION_SYNC_INTERVAL', 5):
+                return bloom
+            try:
+                if (bloom is None or bloom.count >= bloom.capacity
+                        or now - cls._built_at >= config.get('REVOCATION_REBUILD_INTERVAL', 3600)):
+                    cls._rebuild()
+                else:
+                    cls._sync()
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                current_app.logger.warning(f"Could not sync token revocation list: {str(e)}")
+                if cls._bloom is None:
+                    raise
+            cls._synced_at = time.monotonic()
+            return cls._bloom
+        finally:
+            cls._lock.release()
+
+    @classmethod
+    def _rebuild(cls) -> None:
+        """Build a new filter from every unexpired revocation and swap it in."""
+        started = datetime.utcnow()
+        last_id = db.session.query(db.func.max(RevokedToken.id)).scalar() or 0
+        rows = db.session.query(RevokedToken.jti).filter(
+            RevokedToken.id <= last_id,
+            db.or_(RevokedToken.expires_at.is_(None), RevokedToken.expires_at > datetime.utcnow())
+        ).all()
+
+        capacity = max(current_app.config.get('REVOCATION_BLOOM_CAPACITY', 100000), 2 * len(rows))
+        bloom = BloomFilter(capacity, current_app.config.get('REVOCATION_BLOOM_ERROR_RATE', 0.001))
+        for (jti,) in rows:
+            bloom.add(jti)
+
+        cls._bloom = bloom
+        cls._last_id = last_id
+        cls._synced_from = started
+        cls._built_at = time.monotonic()
+        current_app.logger.info(f"Built token revocation filter ({len(rows)} revoked tokens)")
+
+    @classmethod
+    def _sync(cls) -> None:
+        """
+        Add revocations committed since the last sync to the current filter.
+
+        Ids are allocated at insert but become visible at commit, so a row can
+        appear after one with a higher id. Besides the rows past the last id
+        seen, every sync re-reads the rows revoked since the previous sync
+        started, less ``REVOCATION_SYNC_MARGIN`` seconds (which covers slow
+        commits and clock skew between hosts). Rows already in the filter are
+        not added twice, so re-reading them does not use up its capacity.
+        """
+        started = datetime.utcnow()
+        margin = timedelta(seconds=current_app.config.get('REVOCATION_SYNC_MARGIN', 60))
+        recent = RevokedToken.revoked_at >= (cls._synced_from or started) - margin
+        rows = db.session.query(RevokedToken.id, RevokedToken.jti).filter(
+            db.or_(RevokedToken.id > cls._last_id, recent)
+        ).order_by(RevokedToken.id).all()
+        bloom = cls._bloom
+        for row_id, jti in rows:
+            if jti not in bloom:
+                bloom.add(jti)
+            cls._last_id = max(cls._last_id, row_id)
+        cls._synced_from = started
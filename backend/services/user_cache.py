@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from config import Config
+from models.user import User
+from services.metrics import metrics
+
+hits = metrics.counter('user_cache_hits_total', 'Profile lookups served from the user cache')
+misses = metrics.counter('user_cache_misses_total', 'Profile lookups that loaded the user from the database')
+
+def user_version(user: User) -> int:
+    """
+    Version stamp of a user row: ``updated_at`` in microseconds since the epoch.
+
+    ``updated_at`` changes on every update (including deactivation), so a
+    cached copy or token claim with an older stamp is stale.
+    """
+    updated_at = user.updated_at or user.created_at or datetime.utcnow()
+    return int(updated_at.replace(tzinfo=timezone.utc).timestamp() * 1000000)
+
+class UserCache:
+    """
+    Per-process TTL/LRU cache of ``User.to_dict()`` results, keyed by user id.
+
+    Entries carry the row's version stamp and expire after ``ttl`` seconds,
+    which bounds how long an update made in another process (e.g. a
+    deactivation) can go unnoticed; updates in this process evict the entry
+    at once. Past ``max_entries`` the least recently used entry is dropped.
+    """
+
+    def __init__(self, ttl: float = 30, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[float, int, Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, min_version: Optional[int] = None) -> Optional[Dict]:
+        """
+        Cached user dict, or None if absent, expired or older than ``min_version``.
+
+        Args:
+            user_id: User ID as string
+            min_version: Version stamp the caller knows of (e.g. the token's ``uv`` claim)
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                expires_at, version, user = entry
+                if expires_at > time.monotonic() and (min_version is None or version >= min_version):
+                    self._entries.move_to_end(user_id)
+                    hits.inc()
+                    return user
+                del self._entries[user_id]
+        misses.inc()
+        return None
+
+    def put(self, user: User) -> Dict:
+        """Cache ``user`` and return its dict."""
+        user_dict = user.to_dict()
+        entry = (time.monotonic() + self.ttl, user_version(user), user_dict)
+        with self._lock:
+            self._entries[user_dict['id']] = entry
+            self._entries.move_to_end(user_dict['id'])
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return user_dict
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+_cache: Optional[UserCache] = None
+_cache_lock = threading.Lock()
+
+def get_user_cache() -> Optional[UserCache]:
+    """
+    Return the process-wide user cache, creating it on first use from the
+    current app's config; None when ``USER_CACHE_ENABLED`` is off.
+    """
+    global _cache
+    settings = current_app.config if has_app_context() else {}
+    if not settings.get('USER_CACHE_ENABLED', Config.USER_CACHE_ENABLED):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = UserCache(
+                    ttl=settings.get('USER_CACHE_TTL', Config.USER_CACHE_TTL),
+                    max_entries=settings.get('USER_CACHE_MAX_ENTRIES', Config.USER_CACHE_MAX_ENTRIES)
+                )
+    return _cache
+
+def reset_user_cache() -> None:
+    """Drop the process-wide cache so the next call builds a fresh, empty one."""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_changed_user(mapper, connection, user: User) -> None:
+    # Evict on flush; other processes notice through the TTL or the token's uv claim
+    if _cache is not None:
+        _cache.invalidate(user.id)
@@ -0,0 +1,209 @@
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from flask import current_app
+from marshmallow import ValidationError
+from sqlalchemy import text
+from models.user import db
+from schemas.user_schema import UserRegistrationSchema
+from services.password_executor import PasswordExecutorBusy, get_password_executor
+from services.password_hasher import PasswordHasher, get_password_hasher
+
+# One statement inserts the whole batch: arrays are unnested into rows, and
+# emails that already exist (or appear concurrently) are skipped by the conflict
+INSERT_USERS_SQL = text("""
+    INSERT INTO users (id, email, password_hash, first_name, last_name, date_of_birth, gender,
+                       created_at, updated_at, is_active)
+    SELECT u.id, u.email, u.password_hash, u.first_name, u.last_name, u.date_of_birth, u.gender,
+           :now, :now, true
+    FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:emails AS text[]), CAST(:password_hashes AS text[]),
+        CAST(:first_names AS text[]), CAST(:last_names AS text[]), CAST(:dates_of_birth AS date[]),
+        CAST(:genders AS text[])
+    ) AS u(id, email, password_hash, first_name, last_name, date_of_birth, gender)
+    ON CONFLICT (email) DO NOTHING
+    RETURNING id, email
+""")
+
+# Emails are stored as given; only duplicate detection ignores case
+EXISTING_EMAILS_SQL = text('SELECT lower(email) FROM users WHERE lower(email) = ANY(CAST(:emails AS text[]))')
+
+# Password hasher of a provisioning worker process, set by _init_worker
+_worker_hasher: Optional[PasswordHasher] = None
+
+def _init_worker(hasher: PasswordHasher) -> None:
+    global _worker_hasher
+    _worker_hasher = hasher
+
+def _hash_in_worker(password: str) -> str:
+    return _worker_hasher.hash(password)
+
+def hash_passwords(passwords: List[str], workers: int, hasher: PasswordHasher) -> List[str]:
+    """
+    Hash many passwords, spread over ``workers`` processes.
+
+    Hashing is CPU-bound, so processes (not threads) are used and throughput
+    grows with the number of cores; ``workers=1`` hashes in this process.
+    Worker processes are spawned, not forked: the caller may be a server
+    worker with threads (gthread, the password executor), and a forked child
+    can deadlock on a lock one of those threads held.
+    """
+    if workers == 1 or len(passwords) < 2:
+        return [hasher.hash(password) for password in passwords]
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_worker, initargs=(hasher,)) as executor:
+        return list(executor.map(_hash_in_worker, passwords, chunksize=chunksize))
+
+def hash_passwords_on_executor(passwords: List[str], hasher: PasswordHasher) -> List[str]:
+    """
+    Hash many passwords on the process-wide password executor.
+
+    This is the HTTP path: the batch shares the bounded hashing threads with
+    logins and registrations instead of starting processes of its own. At
+    most one password per hashing thread is submitted at a time, so other
+    requests keep getting turns. A full executor queue raises
+    ``PasswordExecutorBusy``; passwords not yet submitted are then dropped.
+    """
+    executor = get_password_executor()
+    if executor.workers <= 1 or len(passwords) < 2:
+        return [executor.run('hash', hasher.hash, password) for password in passwords]
+
+    with ThreadPoolExecutor(max_workers=executor.workers, thread_name_prefix='provision') as submitters:
+        futures = [submitters.submit(executor.run, 'hash', hasher.hash, password) for password in passwords]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+class UserProvisioningService:
+    """Service class for registering users in bulk (e.g. onboarding a whole gym)."""
+
+    @staticmethod
+    def bulk_register(users_data: list, workers: Optional[int] = None,
+                      max_batch: Optional[int] = None, in_processes: bool = False) -> Tuple[dict, int]:
+        """
+        Register a batch of users with one validation pass, parallel password
+        hashing and a single insert statement.
+
+        Rows are validated with ``UserRegistrationSchema(many=True)``. Emails
+        are stored as given, as ``/api/auth/register`` does, but compared
+        case-insensitively: a row whose email differs from a registered one (or
+        an earlier row) only in case is reported as exists (or duplicate).
+        Emails already registered are found with one query before hashing, so
+        their passwords are never hashed. The remaining rows are inserted with
+        ``INSERT ... ON CONFLICT (email) DO NOTHING RETURNING``. Each input row
+        gets an outcome: created (with its id), exists, duplicate (repeated
+        in the batch) or invalid (with the validation details).
+
+        Args:
+            users_data: List of registration dicts (same shape as ``/api/auth/register``)
+            workers: Hashing processes with ``in_processes``; defaults to ``USER_PROVISION_WORKERS`` (0 = CPU count)
+            max_batch: Largest accepted batch (``USER_PROVISION_MAX_BATCH`` over HTTP); no limit when None
+            in_processes: Hash in a spawned process pool (the CLI) instead of on the
+                shared password executor (HTTP requests, which get 503 when it is full)
+
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            if not isinstance(users_data, list) or not users_data:
+                return {'error': 'Validation error', 'message': 'users must be a non-empty list'}, 400
+            if max_batch is not None and len(users_data) > max_batch:
+                return {
+                    'error': 'Validation error',
+                    'message': f'At most {max_batch} users per batch; use `flask users provision` for larger imports'
+                }, 400
+
+            results: List[Optional[Dict]] = [None] * len(users_data)
+            try:
+                loaded = UserRegistrationSchema(many=True).load(users_data)
+                errors = {}
+            except ValidationError as e:
+                loaded = e.valid_data if isinstance(e.valid_data, list) else []
+                errors = e.messages if isinstance(e.messages, dict) else {}
+
+            # Keep the first occurrence of each email (by lower case); later ones are duplicates
+            pending: Dict[str, Tuple[int, dict]] = {}
+            for position in range(len(users_data)):
+                if position in errors or position >= len(loaded):
+                    email = users_data[position].get('email') if isinstance(users_data[position], dict) else None
+                    results[position] = {'index': position, 'email': email, 'status': 'invalid',
+                                         'details': errors.get(position, ['Invalid input type.'])}
+                    continue
+                row = loaded[position]
+                key = row['email'].lower()
+                if key in pending:
+                    results[position] = {'index': position, 'email': row['email'], 'status': 'duplicate'}
+                else:
+                    pending[key] = (position, row)
+
+            # Skip hashing for emails that are already registered
+            if pending:
+                existing = db.session.execute(EXISTING_EMAILS_SQL, {'emails': list(pending)}).scalars()
+                for key in existing:
+                    position, row = pending.pop(key)
+                    results[position] = {'index': position, 'email': row['email'], 'status': 'exists'}
+
+            created = 0
+            if pending:
+                rows = list(pending.values())
+                passwords = [row['password'] for _, row in rows]
+                if in_processes:
+                    if workers is None:
+                        workers = current_app.config.get('USER_PROVISION_WORKERS', 0)
+                    password_hashes = hash_passwords(passwords, workers or os.cpu_count() or 1, get_password_hasher())
+                else:
+                    password_hashes = hash_passwords_on_executor(passwords, get_password_hasher())
+
+                inserted = db.session.execute(INSERT_USERS_SQL, {
+                    'now': datetime.utcnow(),
+                    'ids': [str(uuid.uuid4()) for _ in rows],
+                    'emails': [row['email'] for _, row in rows],
+                    'password_hashes': password_hashes,
+                    'first_names': [row['first_name'] for _, row in rows],
+                    'last_names': [row['last_name'] for _, row in rows],
+                    'dates_of_birth': [row['date_of_birth'] for _, row in rows],
+                    'genders': [row['gender'] for _, row in rows]
+                })
+                inserted_ids = {email: str(user_id) for user_id, email in inserted}
+                db.session.commit()
+
+                for position, row in rows:
+                    email = row['email']
+                    if email in inserted_ids:
+                        created += 1
+                        results[position] = {'index': position, 'email': email, 'status': 'created',
+                                             'id': inserted_ids[email]}
+                    else:
+                        # Registered concurrently, after the existence check
+                        results[position] = {'index': position, 'email': email, 'status': 'exists'}
+
+            summary = {'created': 0, 'exists': 0, 'duplicate': 0, 'invalid': 0}
+            for result in results:
+                summary[result['status']] += 1
+
+            return {
+                'message': f'{created} user(s) created',
+                'summary': summary,
+                'results': results
+            }, 200
+
+        except PasswordExecutorBusy as e:
+            db.session.rollback()
+            current_app.logger.warning('Password executor saturated, refusing bulk registration')
+            return {
+                'error': 'Service temporarily unavailable',
+                'message': 'Password hashing is saturated, please retry shortly',
+                'retry_after': e.retry_after
+            }, 503
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Bulk registration error: {str(e)}")
+            return {'error': 'Internal server error'}, 500
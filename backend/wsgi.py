@@ -0,0 +1,72 @@
+"""
+WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is built from ``FLASK_CONFIG`` (default ``production``) and, when the
+server preloads it, warmed once in the master process: the exercise catalog
+snapshot and its search, filter, similarity and plan indexes, the token
+revocation filter and the JWT encode/decode path. Workers forked afterwards
+share those pages copy-on-write instead of each building their own copy.
+"""
+
+import gc
+import os
+from dotenv import load_dotenv
+from flask import Flask
+from flask_jwt_extended import create_access_token, decode_token
+from sqlalchemy.exc import SQLAlchemyError
+from app import create_app
+from models.user import db
+from services.exercise_catalog import ExerciseCatalog
+from services.exercise_filter import ExerciseFilterIndex
+from services.exercise_search import ExerciseSearchIndex
+from services.exercise_similarity import ExerciseSimilarityIndex
+from services.password_executor import reset_password_executor
+from services.plan_service import PlanIndex
+from services.token_revocation import RevocationList
+
+def warm_up(app: Flask) -> None:
+    """
+    Build the per-process caches before workers are forked.
+
+    A database that is unreachable at startup is logged and skipped; each
+    worker then loads the caches on first use, as it would without preloading.
+    Pooled connections are closed afterwards so that no socket is shared with
+    the forked workers, and the surviving objects are moved out of the garbage
+    collector's reach (``gc.freeze``) so collections in the workers do not
+    touch, and copy, the shared pages.
+    """
+    with app.app_context():
+        try:
+            if app.config.get('EXERCISE_CATALOG_ENABLED', True):
+                snapshot = ExerciseCatalog.get()
+                for index in (ExerciseSearchIndex, ExerciseFilterIndex, ExerciseSimilarityIndex, PlanIndex):
+                    index.for_snapshot(snapshot)
+            RevocationList.is_revoked('warm-up')
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            app.logger.warning(f"Skipping cache warm-up, database unavailable: {str(e)}")
+
+        decode_token(create_access_token(identity='warm-up'))
+
+        db.session.remove()
+        db.engine.dispose()
+
+    gc.freeze()
+
+def reinit_after_fork(app: Flask) -> None:
+    """
+    Make a freshly forked worker safe to serve requests.
+
+    Connections and threads do not survive ``fork``: the engine forgets the
+    master's pool without closing its sockets (``dispose(close=False)``), and
+    the password executor is rebuilt on first use.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+    reset_password_executor()
+
+load_dotenv()
+
+app = create_app(os.environ.get('FLASK_CONFIG', 'production'))